@@ -1,6 +1,17 @@
 from .limited_concurrency_client import (
+    TRANSIENT_ERRORS,
     AlephAlphaClientProtocol,
+    AsyncAlephAlphaClientProtocol,
+    AsyncLimitedConcurrencyClient,
     LimitedConcurrencyClient,
+    RetryPolicy,
 )
 
-__all__ = ["AlephAlphaClientProtocol", "LimitedConcurrencyClient"]
+__all__ = [
+    "TRANSIENT_ERRORS",
+    "AlephAlphaClientProtocol",
+    "AsyncAlephAlphaClientProtocol",
+    "AsyncLimitedConcurrencyClient",
+    "LimitedConcurrencyClient",
+    "RetryPolicy",
+]
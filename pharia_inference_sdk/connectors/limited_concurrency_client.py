@@ -1,11 +1,18 @@
+import asyncio
+import random
 import time
-from collections.abc import Callable, Mapping, Sequence
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from dataclasses import dataclass
 from functools import lru_cache
 from os import getenv
-from threading import Semaphore
-from typing import Any, Optional, Protocol, TypeVar
+from threading import Condition
+from types import TracebackType
+from typing import Any, Literal, Optional, Protocol, TypeVar
 
+import aiohttp
+import requests
 from aleph_alpha_client import (
+    AsyncClient,
     BatchSemanticEmbeddingRequest,
     BatchSemanticEmbeddingResponse,
     BusyError,
@@ -95,17 +102,172 @@ class AlephAlphaClientProtocol(Protocol):
         pass
 
 
+TRANSIENT_ERRORS: tuple[type[Exception], ...] = (
+    BusyError,
+    TimeoutError,
+    ConnectionError,
+    # the transport errors of the sync and the async client do not derive from the
+    # builtin ones above
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    aiohttp.ClientConnectionError,
+)
+"""Errors that usually resolve on their own: an overloaded API, timeouts and dropped connections."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Decides whether a failed request is retried and how long to back off before that.
+
+    The back-off grows exponentially from `base_delay` up to `max_delay`. To avoid many
+    clients retrying in lockstep after the API shed load, the delay can be randomized:
+
+    - `"full"`: a random delay between zero and the exponential delay.
+    - `"decorrelated"`: a random delay between `base_delay` and three times the previous delay.
+
+    Attributes:
+        max_retry_time: The deadline in seconds for a single call including all retries.
+            A negative value retries forever.
+        retryable_exceptions: The exception types that cause a retry, e.g. `TRANSIENT_ERRORS`.
+        retry_server_errors: Also retry the `RuntimeError` the client raises for 5xx responses.
+        base_delay: The delay in seconds before the first retry.
+        max_delay: The upper bound for a single delay in seconds.
+        jitter: How the delay is randomized. `None` uses the plain exponential delay.
+    """
+
+    max_retry_time: float = 3 * 60  # three minutes in seconds
+    retryable_exceptions: tuple[type[Exception], ...] = (BusyError,)
+    retry_server_errors: bool = False
+    base_delay: float = 1.0
+    max_delay: float = float("inf")
+    jitter: Optional[Literal["full", "decorrelated"]] = None
+
+    def is_retryable(self, exception: Exception) -> bool:
+        if isinstance(exception, self.retryable_exceptions):
+            return True
+        return (
+            self.retry_server_errors
+            and type(exception) is RuntimeError
+            and bool(exception.args)
+            and isinstance(exception.args[0], int)
+            and exception.args[0] >= 500
+        )
+
+    def delay(self, retries: int, previous_delay: float) -> float:
+        """Returns the time in seconds to wait before the next attempt.
+
+        Args:
+            retries: The number of retries that already happened for the call.
+            previous_delay: The delay returned for the previous retry, 0 for the first one.
+
+        Returns:
+            The delay in seconds.
+        """
+        if self.jitter == "decorrelated":
+            upper_bound = max(self.base_delay, previous_delay * 3)
+            return min(self.max_delay, random.uniform(self.base_delay, upper_bound))
+        exponential_delay = min(self.max_delay, self.base_delay * 2**retries)
+        if self.jitter == "full":
+            return random.uniform(0, exponential_delay)
+        return exponential_delay
+
+    def remaining_time(self, start_time: float) -> float:
+        """Returns the seconds left until the deadline of a call started at `start_time`."""
+        if self.max_retry_time < 0:
+            return float("inf")
+        return self.max_retry_time - (time.monotonic() - start_time)
+
+
+class _ConcurrencyLimit:
+    """Bounds the number of concurrent requests by a window.
+
+    In adaptive mode the window follows an additive-increase/multiplicative-decrease scheme:
+    it grows by one request per window of successful requests and is multiplied by
+    `decrease_factor` when the API signals overload. Only requests started after the last
+    decrease can trigger another one, so a burst of rejected requests shrinks the window once.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        adaptive: bool = False,
+        min_concurrency: int = 1,
+        latency_threshold: Optional[float] = None,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        self._max_concurrency = max_concurrency
+        self._adaptive = adaptive
+        self._min_concurrency = min(min_concurrency, max_concurrency)
+        self._latency_threshold = latency_threshold
+        self._decrease_factor = decrease_factor
+        self._window = float(max_concurrency)
+        self._in_flight = 0
+        self._last_decrease = float("-inf")
+        self._condition = Condition()
+
+    @property
+    def window(self) -> int:
+        return int(self._window)
+
+    def __enter__(self) -> None:
+        with self._condition:
+            self._condition.wait_for(lambda: self._in_flight < self.window)
+            self._in_flight += 1
+
+    def __exit__(self, *_: object) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+    def on_success(self, started_at: float, latency: float) -> None:
+        if not self._adaptive:
+            return
+        if self._latency_threshold is not None and latency > self._latency_threshold:
+            self.on_overload(started_at)
+            return
+        with self._condition:
+            self._window = min(
+                float(self._max_concurrency), self._window + 1 / self._window
+            )
+            self._condition.notify_all()
+
+    def on_overload(self, started_at: float) -> None:
+        if not self._adaptive:
+            return
+        with self._condition:
+            if started_at < self._last_decrease:
+                return
+            self._window = max(
+                float(self._min_concurrency), self._window * self._decrease_factor
+            )
+            self._last_decrease = time.monotonic()
+
+
 class LimitedConcurrencyClient:
     """An Aleph Alpha Client wrapper that limits the number of concurrent requests.
 
     This just delegates each call to the wrapped Aleph Alpha Client and ensures that
     never more than a given number of concurrent calls are executed against the API.
 
+    With `adaptive_concurrency` the limit becomes a window between `min_concurrency` and
+    `max_concurrency`: it is halved whenever the API answers with a `BusyError` (or, if
+    `latency_threshold` is set, responds slower than that) and grows again by one request
+    per window of successful requests. The current window is available as
+    :attr:`concurrency_window`.
+
     Args:
         client: The wrapped `Client`.
         max_concurrency: the maximal number of requests that may run concurrently
             against the API. Defaults to 10.
         max_retry_time: the maximal time in seconds a complete is retried in case a `BusyError` is raised.
+        adaptive_concurrency: Adapt the number of concurrent requests to the load of the API.
+            Defaults to False.
+        min_concurrency: The lower bound of the adaptive window. Defaults to 1.
+        latency_threshold: Optional latency in seconds above which a successful request is
+            treated like a `BusyError` by the adaptive window.
+        retry_policy: Decides which errors are retried and how long to back off in between.
+            Defaults to retrying `BusyError` with exponential back-off for `max_retry_time` seconds.
+            Requests release their concurrency slot while they back off.
 
     """
 
@@ -114,10 +276,28 @@ class LimitedConcurrencyClient:
         client: AlephAlphaClientProtocol,
         max_concurrency: int = 10,
         max_retry_time: int = 3 * 60,  # three minutes in seconds
+        adaptive_concurrency: bool = False,
+        min_concurrency: int = 1,
+        latency_threshold: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
     ) -> None:
         self._client = client
-        self._concurrency_limit_semaphore = Semaphore(max_concurrency)
-        self._max_retry_time = max_retry_time
+        self._concurrency_limit = _ConcurrencyLimit(
+            max_concurrency,
+            adaptive=adaptive_concurrency,
+            min_concurrency=min_concurrency,
+            latency_threshold=latency_threshold,
+        )
+        self._retry_policy = (
+            RetryPolicy(max_retry_time=max_retry_time)
+            if retry_policy is None
+            else retry_policy
+        )
+
+    @property
+    def concurrency_window(self) -> int:
+        """The number of requests that may currently run concurrently against the API."""
+        return self._concurrency_limit.window
 
     @classmethod
     @lru_cache(maxsize=1)
@@ -152,116 +332,359 @@ class LimitedConcurrencyClient:
 
     T = TypeVar("T")
 
-    def _retry_on_busy_error(self, func: Callable[[], T]) -> T:
+    def _call_with_retries(self, func: Callable[[], T]) -> T:
+        start_time = time.monotonic()
         retries = 0
-        start_time = time.time()
-        latest_exception = None
-        current_time = start_time
-        while (
-            current_time - start_time < self._max_retry_time or self._max_retry_time < 0
-        ):
-            try:
-                return func()
-            except BusyError as e:
-                latest_exception = e
-                time.sleep(
-                    min(
-                        2**retries,
-                        self._max_retry_time - (current_time - start_time),
+        delay = 0.0
+        while True:
+            with self._concurrency_limit:
+                attempt_start = time.monotonic()
+                try:
+                    result = func()
+                except Exception as e:
+                    if isinstance(e, BusyError):
+                        self._concurrency_limit.on_overload(attempt_start)
+                    if not self._retry_policy.is_retryable(e):
+                        raise
+                    latest_exception = e
+                else:
+                    self._concurrency_limit.on_success(
+                        attempt_start, time.monotonic() - attempt_start
                     )
-                )
-                retries += 1
-                current_time = time.time()
-                continue
-        assert latest_exception is not None
-        raise latest_exception
+                    return result
+            # back off without occupying a concurrency slot
+            remaining_time = self._retry_policy.remaining_time(start_time)
+            if remaining_time <= 0:
+                raise latest_exception
+            delay = self._retry_policy.delay(retries, delay)
+            time.sleep(min(delay, remaining_time))
+            if self._retry_policy.remaining_time(start_time) <= 0:
+                raise latest_exception
+            retries += 1
 
     def complete(
         self,
         request: CompletionRequest,
         model: str,
     ) -> CompletionResponse:
-        with self._concurrency_limit_semaphore:
-            return self._retry_on_busy_error(
-                lambda: self._client.complete(request, model)
-            )
+        return self._call_with_retries(lambda: self._client.complete(request, model))
 
     def get_version(self) -> str:
-        with self._concurrency_limit_semaphore:
-            return self._retry_on_busy_error(lambda: self._client.get_version())
+        return self._call_with_retries(lambda: self._client.get_version())
 
     def models(self) -> Sequence[Mapping[str, Any]]:
-        with self._concurrency_limit_semaphore:
-            return self._retry_on_busy_error(lambda: self._client.models())
+        return self._call_with_retries(lambda: self._client.models())
 
     def tokenize(
         self,
         request: TokenizationRequest,
         model: str,
     ) -> TokenizationResponse:
-        with self._concurrency_limit_semaphore:
-            return self._retry_on_busy_error(
-                lambda: self._client.tokenize(request, model)
-            )
+        return self._call_with_retries(lambda: self._client.tokenize(request, model))
 
     def detokenize(
         self,
         request: DetokenizationRequest,
         model: str,
     ) -> DetokenizationResponse:
-        with self._concurrency_limit_semaphore:
-            return self._retry_on_busy_error(
-                lambda: self._client.detokenize(request, model)
-            )
+        return self._call_with_retries(lambda: self._client.detokenize(request, model))
 
     def embed(
         self,
         request: EmbeddingRequest,
         model: str,
     ) -> EmbeddingResponse:
-        with self._concurrency_limit_semaphore:
-            return self._retry_on_busy_error(lambda: self._client.embed(request, model))
+        return self._call_with_retries(lambda: self._client.embed(request, model))
 
     def semantic_embed(
         self,
         request: SemanticEmbeddingRequest,
         model: str,
     ) -> SemanticEmbeddingResponse:
-        with self._concurrency_limit_semaphore:
-            return self._retry_on_busy_error(
-                lambda: self._client.semantic_embed(request, model)
-            )
+        return self._call_with_retries(
+            lambda: self._client.semantic_embed(request, model)
+        )
 
     def batch_semantic_embed(
         self,
         request: BatchSemanticEmbeddingRequest,
         model: Optional[str] = None,
     ) -> BatchSemanticEmbeddingResponse:
-        with self._concurrency_limit_semaphore:
-            return self._retry_on_busy_error(
-                lambda: self._client.batch_semantic_embed(request, model)
-            )
+        return self._call_with_retries(
+            lambda: self._client.batch_semantic_embed(request, model)
+        )
 
     def evaluate(
         self,
         request: EvaluationRequest,
         model: str,
     ) -> EvaluationResponse:
-        with self._concurrency_limit_semaphore:
-            return self._retry_on_busy_error(
-                lambda: self._client.evaluate(request, model)
-            )
+        return self._call_with_retries(lambda: self._client.evaluate(request, model))
 
     def explain(
         self,
         request: ExplanationRequest,
         model: str,
     ) -> ExplanationResponse:
-        with self._concurrency_limit_semaphore:
-            return self._retry_on_busy_error(
-                lambda: self._client.explain(request, model)
-            )
+        return self._call_with_retries(lambda: self._client.explain(request, model))
 
     def tokenizer(self, model: str) -> Tokenizer:
-        with self._concurrency_limit_semaphore:
-            return self._retry_on_busy_error(lambda: self._client.tokenizer(model))
+        return self._call_with_retries(lambda: self._client.tokenizer(model))
+
+
+class AsyncAlephAlphaClientProtocol(Protocol):
+    async def complete(
+        self,
+        request: CompletionRequest,
+        model: str,
+    ) -> CompletionResponse:
+        pass
+
+    async def get_version(self) -> str:
+        pass
+
+    async def models(self) -> Sequence[Mapping[str, Any]]:
+        pass
+
+    async def tokenize(
+        self,
+        request: TokenizationRequest,
+        model: str,
+    ) -> TokenizationResponse:
+        pass
+
+    async def detokenize(
+        self,
+        request: DetokenizationRequest,
+        model: str,
+    ) -> DetokenizationResponse:
+        pass
+
+    async def embed(
+        self,
+        request: EmbeddingRequest,
+        model: str,
+    ) -> EmbeddingResponse:
+        pass
+
+    async def semantic_embed(
+        self,
+        request: SemanticEmbeddingRequest,
+        model: str,
+    ) -> SemanticEmbeddingResponse:
+        pass
+
+    async def batch_semantic_embed(
+        self,
+        request: BatchSemanticEmbeddingRequest,
+        model: Optional[str] = None,
+    ) -> BatchSemanticEmbeddingResponse:
+        pass
+
+    async def evaluate(
+        self,
+        request: EvaluationRequest,
+        model: str,
+    ) -> EvaluationResponse:
+        pass
+
+    async def explain(
+        self,
+        request: ExplanationRequest,
+        model: str,
+    ) -> ExplanationResponse:
+        pass
+
+    async def tokenizer(self, model: str) -> Tokenizer:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class AsyncLimitedConcurrencyClient:
+    """An asynchronous Aleph Alpha Client wrapper that limits the number of concurrent requests.
+
+    The `asyncio` counterpart of :class:`LimitedConcurrencyClient`. Each call is delegated to the
+    wrapped async client while an `asyncio.Semaphore` ensures that never more than a given
+    number of requests are in flight. Retries back off with `asyncio.sleep`, so waiting
+    requests neither block the event loop, nor occupy a thread or a concurrency slot.
+
+    Args:
+        client: The wrapped `AsyncClient`.
+        max_concurrency: the maximal number of requests that may run concurrently
+            against the API. Defaults to 10.
+        max_retry_time: the maximal time in seconds a complete is retried in case a `BusyError` is raised.
+        retry_policy: Decides which errors are retried and how long to back off in between.
+            Defaults to retrying `BusyError` with exponential back-off for `max_retry_time` seconds.
+
+    Example:
+        >>> async with AsyncLimitedConcurrencyClient.from_env() as client:
+        ...     response = await client.complete(request, "llama-3.1-8b-instruct")
+    """
+
+    def __init__(
+        self,
+        client: AsyncAlephAlphaClientProtocol,
+        max_concurrency: int = 10,
+        max_retry_time: int = 3 * 60,  # three minutes in seconds
+        retry_policy: Optional[RetryPolicy] = None,
+    ) -> None:
+        self._client = client
+        self._concurrency_limit_semaphore = asyncio.Semaphore(max_concurrency)
+        self._retry_policy = (
+            RetryPolicy(max_retry_time=max_retry_time)
+            if retry_policy is None
+            else retry_policy
+        )
+
+    @classmethod
+    def from_env(
+        cls, token: Optional[str] = None, host: Optional[str] = None
+    ) -> "AsyncLimitedConcurrencyClient":
+        """This is a helper method to construct your client with default settings from a token and host.
+
+        Unlike :meth:`LimitedConcurrencyClient.from_env` the result is not cached, as the
+        underlying `AsyncClient` holds a session that is bound to the event loop it is used in.
+
+        Args:
+            token: An Aleph Alpha token to instantiate the client. If no token is provided,
+                this method tries to fetch it from the environment under the name of "AA_TOKEN".
+            host: The host that is used for requests. If no token is provided,
+                this method tries to fetch it from the environment under the name of "CLIENT_URL".
+                If this is not present, it defaults to the Aleph Alpha Api.
+                If you have an on premise setup, change this to your host URL.
+
+        Returns:
+            An `AsyncLimitedConcurrencyClient`
+        """
+        if token is None:
+            token = getenv("AA_TOKEN")
+            assert token, (
+                "Define environment variable AA_TOKEN with a valid token for the Aleph Alpha API"
+            )
+        if host is None:
+            host = getenv("CLIENT_URL")
+            assert host, (
+                "Define CLIENT_URL with a valid url pointing towards your inference API."
+            )
+
+        return cls(AsyncClient(token, host=host))
+
+    async def __aenter__(self) -> "AsyncLimitedConcurrencyClient":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        _traceback: Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the wrapped client. Needs to be called if not used as a context manager."""
+        await self._client.close()
+
+    T = TypeVar("T")
+
+    async def _call_with_retries(self, func: Callable[[], Awaitable[T]]) -> T:
+        start_time = time.monotonic()
+        retries = 0
+        delay = 0.0
+        while True:
+            async with self._concurrency_limit_semaphore:
+                try:
+                    return await func()
+                except Exception as e:
+                    if not self._retry_policy.is_retryable(e):
+                        raise
+                    latest_exception = e
+            # back off without occupying a concurrency slot
+            remaining_time = self._retry_policy.remaining_time(start_time)
+            if remaining_time <= 0:
+                raise latest_exception
+            delay = self._retry_policy.delay(retries, delay)
+            await asyncio.sleep(min(delay, remaining_time))
+            if self._retry_policy.remaining_time(start_time) <= 0:
+                raise latest_exception
+            retries += 1
+
+    async def complete(
+        self,
+        request: CompletionRequest,
+        model: str,
+    ) -> CompletionResponse:
+        return await self._call_with_retries(
+            lambda: self._client.complete(request, model)
+        )
+
+    async def get_version(self) -> str:
+        return await self._call_with_retries(lambda: self._client.get_version())
+
+    async def models(self) -> Sequence[Mapping[str, Any]]:
+        return await self._call_with_retries(lambda: self._client.models())
+
+    async def tokenize(
+        self,
+        request: TokenizationRequest,
+        model: str,
+    ) -> TokenizationResponse:
+        return await self._call_with_retries(
+            lambda: self._client.tokenize(request, model)
+        )
+
+    async def detokenize(
+        self,
+        request: DetokenizationRequest,
+        model: str,
+    ) -> DetokenizationResponse:
+        return await self._call_with_retries(
+            lambda: self._client.detokenize(request, model)
+        )
+
+    async def embed(
+        self,
+        request: EmbeddingRequest,
+        model: str,
+    ) -> EmbeddingResponse:
+        return await self._call_with_retries(lambda: self._client.embed(request, model))
+
+    async def semantic_embed(
+        self,
+        request: SemanticEmbeddingRequest,
+        model: str,
+    ) -> SemanticEmbeddingResponse:
+        return await self._call_with_retries(
+            lambda: self._client.semantic_embed(request, model)
+        )
+
+    async def batch_semantic_embed(
+        self,
+        request: BatchSemanticEmbeddingRequest,
+        model: Optional[str] = None,
+    ) -> BatchSemanticEmbeddingResponse:
+        return await self._call_with_retries(
+            lambda: self._client.batch_semantic_embed(request, model)
+        )
+
+    async def evaluate(
+        self,
+        request: EvaluationRequest,
+        model: str,
+    ) -> EvaluationResponse:
+        return await self._call_with_retries(
+            lambda: self._client.evaluate(request, model)
+        )
+
+    async def explain(
+        self,
+        request: ExplanationRequest,
+        model: str,
+    ) -> ExplanationResponse:
+        return await self._call_with_retries(
+            lambda: self._client.explain(request, model)
+        )
+
+    async def tokenizer(self, model: str) -> Tokenizer:
+        return await self._call_with_retries(lambda: self._client.tokenizer(model))
@@ -1,85 +1,245 @@
-from .chunk import Chunk as Chunk
-from .chunk import ChunkInput as ChunkInput
-from .chunk import ChunkOutput as ChunkOutput
-from .chunk import ChunkWithIndices as ChunkWithIndices
-from .chunk import ChunkWithIndicesOutput as ChunkWithIndicesOutput
-from .chunk import ChunkWithStartEndIndices as ChunkWithStartEndIndices
-from .chunk import TextChunk as TextChunk
-from .detect_language import DetectLanguage as DetectLanguage
-from .detect_language import DetectLanguageInput as DetectLanguageInput
-from .detect_language import DetectLanguageOutput as DetectLanguageOutput
-from .detect_language import Language as Language
-from .echo import Echo as Echo
-from .echo import EchoInput as EchoInput
-from .echo import EchoOutput as EchoOutput
-from .echo import TokenWithLogProb as TokenWithLogProb
-from .instruct import Instruct as Instruct
-from .instruct import InstructInput as InstructInput
-from .model import AlephAlphaChatModel as AlephAlphaChatModel
-from .model import AlephAlphaModel as AlephAlphaModel
-from .model import ChatModel as ChatModel
-from .model import CompleteInput as CompleteInput
-from .model import CompleteOutput as CompleteOutput
-from .model import ControlModel as ControlModel
-from .model import ExplainInput as ExplainInput
-from .model import ExplainOutput as ExplainOutput
-from .model import FinetuningMessage as FinetuningMessage
-from .model import LanguageModel as LanguageModel
-from .model import Llama2InstructModel as Llama2InstructModel
-from .model import Llama3ChatModel as Llama3ChatModel
-from .model import Llama3InstructModel as Llama3InstructModel
-from .model import LuminousControlModel as LuminousControlModel
-from .model import Message as Message
-from .model import Pharia1ChatModel as Pharia1ChatModel
-from .prompt_template import Cursor as Cursor
-from .prompt_template import PromptItemCursor as PromptItemCursor
-from .prompt_template import PromptRange as PromptRange
-from .prompt_template import PromptTemplate as PromptTemplate
-from .prompt_template import RichPrompt as RichPrompt
-from .prompt_template import TextCursor as TextCursor
-from .task import MAX_CONCURRENCY as MAX_CONCURRENCY
-from .task import Input as Input
-from .task import Output as Output
-from .task import Task as Task
-from .task import Token as Token
-from .text_highlight import ScoredTextHighlight as ScoredTextHighlight
-from .text_highlight import TextHighlight as TextHighlight
-from .text_highlight import TextHighlightInput as TextHighlightInput
-from .text_highlight import TextHighlightOutput as TextHighlightOutput
-from .tracer.composite_tracer import CompositeTracer as CompositeTracer
-from .tracer.file_tracer import FileSpan as FileSpan
-from .tracer.file_tracer import FileTaskSpan as FileTaskSpan
-from .tracer.file_tracer import FileTracer as FileTracer
-from .tracer.in_memory_tracer import InMemorySpan as InMemorySpan
-from .tracer.in_memory_tracer import InMemoryTaskSpan as InMemoryTaskSpan
-from .tracer.in_memory_tracer import InMemoryTracer as InMemoryTracer
-from .tracer.in_memory_tracer import LogEntry as LogEntry
-from .tracer.open_telemetry_tracer import OpenTelemetryTracer as OpenTelemetryTracer
-from .tracer.persistent_tracer import EndSpan as EndSpan
-from .tracer.persistent_tracer import EndTask as EndTask
-from .tracer.persistent_tracer import LogLine as LogLine
-from .tracer.persistent_tracer import PersistentSpan as PersistentSpan
-from .tracer.persistent_tracer import PersistentTaskSpan as PersistentTaskSpan
-from .tracer.persistent_tracer import PersistentTracer as PersistentTracer
-from .tracer.persistent_tracer import PlainEntry as PlainEntry
-from .tracer.persistent_tracer import StartSpan as StartSpan
-from .tracer.persistent_tracer import StartTask as StartTask
-from .tracer.persistent_tracer import TracerLogEntryFailed as TracerLogEntryFailed
-from .tracer.tracer import Context as Context
-from .tracer.tracer import ErrorValue as ErrorValue
-from .tracer.tracer import Event as Event
-from .tracer.tracer import ExportedSpan as ExportedSpan
-from .tracer.tracer import ExportedSpanList as ExportedSpanList
-from .tracer.tracer import JsonSerializer as JsonSerializer
-from .tracer.tracer import NoOpTracer as NoOpTracer
-from .tracer.tracer import PydanticSerializable as PydanticSerializable
-from .tracer.tracer import Span as Span
-from .tracer.tracer import SpanAttributes as SpanAttributes
-from .tracer.tracer import SpanStatus as SpanStatus
-from .tracer.tracer import SpanType as SpanType
-from .tracer.tracer import TaskSpan as TaskSpan
-from .tracer.tracer import TaskSpanAttributes as TaskSpanAttributes
-from .tracer.tracer import Tracer as Tracer
-from .tracer.tracer import utc_now as utc_now
+"""The core of the SDK: tasks, models and tracers.
 
-__all__ = [symbol for symbol in dir()]
+The members are imported lazily on first access (PEP 562), so that importing the package
+does not load heavy optional dependencies like `lingua` or `opentelemetry` that are only
+needed by some of them.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .chunk import Chunk as Chunk
+    from .chunk import ChunkInput as ChunkInput
+    from .chunk import ChunkOutput as ChunkOutput
+    from .chunk import ChunkWithIndices as ChunkWithIndices
+    from .chunk import ChunkWithIndicesOutput as ChunkWithIndicesOutput
+    from .chunk import ChunkWithStartEndIndices as ChunkWithStartEndIndices
+    from .chunk import TextChunk as TextChunk
+    from .detect_language import DetectLanguage as DetectLanguage
+    from .detect_language import DetectLanguageBatch as DetectLanguageBatch
+    from .detect_language import DetectLanguageBatchInput as DetectLanguageBatchInput
+    from .detect_language import (
+        DetectLanguageBatchOutput as DetectLanguageBatchOutput,
+    )
+    from .detect_language import DetectLanguageInput as DetectLanguageInput
+    from .detect_language import DetectLanguageOutput as DetectLanguageOutput
+    from .detect_language import Language as Language
+    from .echo import Echo as Echo
+    from .echo import EchoInput as EchoInput
+    from .echo import EchoOutput as EchoOutput
+    from .echo import TokenWithLogProb as TokenWithLogProb
+    from .instruct import Instruct as Instruct
+    from .instruct import InstructInput as InstructInput
+    from .model import AlephAlphaChatModel as AlephAlphaChatModel
+    from .model import AlephAlphaModel as AlephAlphaModel
+    from .model import ChatModel as ChatModel
+    from .model import CompleteInput as CompleteInput
+    from .model import CompleteOutput as CompleteOutput
+    from .model import ContextOverflowPolicy as ContextOverflowPolicy
+    from .model import ContextWindowExceededError as ContextWindowExceededError
+    from .model import ControlModel as ControlModel
+    from .model import ExplainInput as ExplainInput
+    from .model import ExplainOutput as ExplainOutput
+    from .model import FinetuningMessage as FinetuningMessage
+    from .model import LanguageModel as LanguageModel
+    from .model import Llama2InstructModel as Llama2InstructModel
+    from .model import Llama3ChatModel as Llama3ChatModel
+    from .model import Llama3InstructModel as Llama3InstructModel
+    from .model import LuminousControlModel as LuminousControlModel
+    from .model import Message as Message
+    from .model import Pharia1ChatModel as Pharia1ChatModel
+    from .model_catalogue import ModelCatalogue as ModelCatalogue
+    from .model_catalogue import global_model_catalogue as global_model_catalogue
+    from .prompt_template import Cursor as Cursor
+    from .prompt_template import PromptItemCursor as PromptItemCursor
+    from .prompt_template import PromptRange as PromptRange
+    from .prompt_template import PromptTemplate as PromptTemplate
+    from .prompt_template import RichPrompt as RichPrompt
+    from .prompt_template import TextCursor as TextCursor
+    from .response_cache import InMemoryResponseCache as InMemoryResponseCache
+    from .response_cache import ResponseCache as ResponseCache
+    from .response_cache import ResponseCacheStats as ResponseCacheStats
+    from .response_cache import SqliteResponseCache as SqliteResponseCache
+    from .task import MAX_CONCURRENCY as MAX_CONCURRENCY
+    from .task import ConcurrencyBudget as ConcurrencyBudget
+    from .task import ConcurrencyBudgetMetrics as ConcurrencyBudgetMetrics
+    from .task import Input as Input
+    from .task import Output as Output
+    from .task import Task as Task
+    from .task import TaskResult as TaskResult
+    from .task import Token as Token
+    from .task import global_concurrency_budget as global_concurrency_budget
+    from .text_highlight import ScoredTextHighlight as ScoredTextHighlight
+    from .text_highlight import TextHighlight as TextHighlight
+    from .text_highlight import TextHighlightInput as TextHighlightInput
+    from .text_highlight import TextHighlightOutput as TextHighlightOutput
+    from .tokenizer_registry import TokenizerRegistry as TokenizerRegistry
+    from .tokenizer_registry import TokenizerRegistryMetrics as TokenizerRegistryMetrics
+    from .tokenizer_registry import (
+        global_tokenizer_registry as global_tokenizer_registry,
+    )
+    from .tracer.composite_tracer import CompositeTracer as CompositeTracer
+    from .tracer.file_tracer import FileSpan as FileSpan
+    from .tracer.file_tracer import FileTaskSpan as FileTaskSpan
+    from .tracer.file_tracer import FileTracer as FileTracer
+    from .tracer.file_tracer import LogFileRotation as LogFileRotation
+    from .tracer.in_memory_tracer import InMemorySpan as InMemorySpan
+    from .tracer.in_memory_tracer import InMemoryTaskSpan as InMemoryTaskSpan
+    from .tracer.in_memory_tracer import InMemoryTracer as InMemoryTracer
+    from .tracer.in_memory_tracer import LogEntry as LogEntry
+    from .tracer.open_telemetry_tracer import OpenTelemetryTracer as OpenTelemetryTracer
+    from .tracer.persistent_tracer import EndSpan as EndSpan
+    from .tracer.persistent_tracer import EndTask as EndTask
+    from .tracer.persistent_tracer import LogLine as LogLine
+    from .tracer.persistent_tracer import PersistentSpan as PersistentSpan
+    from .tracer.persistent_tracer import PersistentTaskSpan as PersistentTaskSpan
+    from .tracer.persistent_tracer import PersistentTracer as PersistentTracer
+    from .tracer.persistent_tracer import PlainEntry as PlainEntry
+    from .tracer.persistent_tracer import StartSpan as StartSpan
+    from .tracer.persistent_tracer import StartTask as StartTask
+    from .tracer.persistent_tracer import TracerLogEntryFailed as TracerLogEntryFailed
+    from .tracer.trace_reader import SpanRecord as SpanRecord
+    from .tracer.trace_reader import TaskSpanRecord as TaskSpanRecord
+    from .tracer.trace_reader import TraceFileReader as TraceFileReader
+    from .tracer.trace_reader import TraceRecord as TraceRecord
+    from .tracer.tracer import Context as Context
+    from .tracer.tracer import ErrorValue as ErrorValue
+    from .tracer.tracer import Event as Event
+    from .tracer.tracer import ExportedSpan as ExportedSpan
+    from .tracer.tracer import ExportedSpanList as ExportedSpanList
+    from .tracer.tracer import JsonSerializer as JsonSerializer
+    from .tracer.tracer import NoOpTracer as NoOpTracer
+    from .tracer.tracer import PydanticSerializable as PydanticSerializable
+    from .tracer.tracer import Span as Span
+    from .tracer.tracer import SpanAttributes as SpanAttributes
+    from .tracer.tracer import SpanStatus as SpanStatus
+    from .tracer.tracer import SpanType as SpanType
+    from .tracer.tracer import TaskSpan as TaskSpan
+    from .tracer.tracer import TaskSpanAttributes as TaskSpanAttributes
+    from .tracer.tracer import Tracer as Tracer
+    from .tracer.tracer import utc_now as utc_now
+
+_LAZY_MEMBERS: dict[str, str] = {
+    "Chunk": ".chunk",
+    "ChunkInput": ".chunk",
+    "ChunkOutput": ".chunk",
+    "ChunkWithIndices": ".chunk",
+    "ChunkWithIndicesOutput": ".chunk",
+    "ChunkWithStartEndIndices": ".chunk",
+    "TextChunk": ".chunk",
+    "DetectLanguage": ".detect_language",
+    "DetectLanguageBatch": ".detect_language",
+    "DetectLanguageBatchInput": ".detect_language",
+    "DetectLanguageBatchOutput": ".detect_language",
+    "DetectLanguageInput": ".detect_language",
+    "DetectLanguageOutput": ".detect_language",
+    "Language": ".detect_language",
+    "Echo": ".echo",
+    "EchoInput": ".echo",
+    "EchoOutput": ".echo",
+    "TokenWithLogProb": ".echo",
+    "Instruct": ".instruct",
+    "InstructInput": ".instruct",
+    "AlephAlphaChatModel": ".model",
+    "AlephAlphaModel": ".model",
+    "ChatModel": ".model",
+    "CompleteInput": ".model",
+    "CompleteOutput": ".model",
+    "ContextOverflowPolicy": ".model",
+    "ContextWindowExceededError": ".model",
+    "ControlModel": ".model",
+    "ExplainInput": ".model",
+    "ExplainOutput": ".model",
+    "FinetuningMessage": ".model",
+    "LanguageModel": ".model",
+    "Llama2InstructModel": ".model",
+    "Llama3ChatModel": ".model",
+    "Llama3InstructModel": ".model",
+    "LuminousControlModel": ".model",
+    "Message": ".model",
+    "Pharia1ChatModel": ".model",
+    "ModelCatalogue": ".model_catalogue",
+    "global_model_catalogue": ".model_catalogue",
+    "Cursor": ".prompt_template",
+    "PromptItemCursor": ".prompt_template",
+    "PromptRange": ".prompt_template",
+    "PromptTemplate": ".prompt_template",
+    "RichPrompt": ".prompt_template",
+    "TextCursor": ".prompt_template",
+    "InMemoryResponseCache": ".response_cache",
+    "ResponseCache": ".response_cache",
+    "ResponseCacheStats": ".response_cache",
+    "SqliteResponseCache": ".response_cache",
+    "MAX_CONCURRENCY": ".task",
+    "ConcurrencyBudget": ".task",
+    "ConcurrencyBudgetMetrics": ".task",
+    "Input": ".task",
+    "Output": ".task",
+    "Task": ".task",
+    "TaskResult": ".task",
+    "Token": ".task",
+    "global_concurrency_budget": ".task",
+    "ScoredTextHighlight": ".text_highlight",
+    "TextHighlight": ".text_highlight",
+    "TextHighlightInput": ".text_highlight",
+    "TextHighlightOutput": ".text_highlight",
+    "TokenizerRegistry": ".tokenizer_registry",
+    "TokenizerRegistryMetrics": ".tokenizer_registry",
+    "global_tokenizer_registry": ".tokenizer_registry",
+    "CompositeTracer": ".tracer.composite_tracer",
+    "FileSpan": ".tracer.file_tracer",
+    "FileTaskSpan": ".tracer.file_tracer",
+    "FileTracer": ".tracer.file_tracer",
+    "LogFileRotation": ".tracer.file_tracer",
+    "InMemorySpan": ".tracer.in_memory_tracer",
+    "InMemoryTaskSpan": ".tracer.in_memory_tracer",
+    "InMemoryTracer": ".tracer.in_memory_tracer",
+    "LogEntry": ".tracer.in_memory_tracer",
+    "OpenTelemetryTracer": ".tracer.open_telemetry_tracer",
+    "EndSpan": ".tracer.persistent_tracer",
+    "EndTask": ".tracer.persistent_tracer",
+    "LogLine": ".tracer.persistent_tracer",
+    "PersistentSpan": ".tracer.persistent_tracer",
+    "PersistentTaskSpan": ".tracer.persistent_tracer",
+    "PersistentTracer": ".tracer.persistent_tracer",
+    "PlainEntry": ".tracer.persistent_tracer",
+    "StartSpan": ".tracer.persistent_tracer",
+    "StartTask": ".tracer.persistent_tracer",
+    "TracerLogEntryFailed": ".tracer.persistent_tracer",
+    "SpanRecord": ".tracer.trace_reader",
+    "TaskSpanRecord": ".tracer.trace_reader",
+    "TraceFileReader": ".tracer.trace_reader",
+    "TraceRecord": ".tracer.trace_reader",
+    "Context": ".tracer.tracer",
+    "ErrorValue": ".tracer.tracer",
+    "Event": ".tracer.tracer",
+    "ExportedSpan": ".tracer.tracer",
+    "ExportedSpanList": ".tracer.tracer",
+    "JsonSerializer": ".tracer.tracer",
+    "NoOpTracer": ".tracer.tracer",
+    "PydanticSerializable": ".tracer.tracer",
+    "Span": ".tracer.tracer",
+    "SpanAttributes": ".tracer.tracer",
+    "SpanStatus": ".tracer.tracer",
+    "SpanType": ".tracer.tracer",
+    "TaskSpan": ".tracer.tracer",
+    "TaskSpanAttributes": ".tracer.tracer",
+    "Tracer": ".tracer.tracer",
+    "utc_now": ".tracer.tracer",
+}
+
+__all__ = list(_LAZY_MEMBERS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_MEMBERS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -1,8 +1,15 @@
 from collections.abc import Mapping, Sequence
+from concurrent.futures import Future
 from dataclasses import dataclass
+from threading import Lock
 from typing import ClassVar, Optional, TypeVar
 
-from lingua import ConfidenceValue, IsoCode639_1, LanguageDetectorBuilder
+from lingua import (
+    ConfidenceValue,
+    IsoCode639_1,
+    LanguageDetector,
+    LanguageDetectorBuilder,
+)
 from lingua import Language as LinguaLanguage
 from pycountry import languages
 from pydantic import BaseModel
@@ -71,15 +78,70 @@ class AnnotatedLanguage(BaseModel):
     prob: float
 
 
-class DetectLanguage(Task[DetectLanguageInput, DetectLanguageOutput]):
+class _LanguageDetection:
+    """The configuration and the detector shared by the language detection tasks."""
+
+    AVAILABLE_LANGUAGES: ClassVar[list[LinguaLanguage]] = [
+        LinguaLanguage.CATALAN,
+        LinguaLanguage.ENGLISH,
+        LinguaLanguage.FRENCH,
+        LinguaLanguage.GERMAN,
+        LinguaLanguage.ITALIAN,
+        LinguaLanguage.POLISH,
+        LinguaLanguage.SPANISH,
+    ]
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        preload_language_models: bool = False,
+        low_accuracy: bool = False,
+        restrict_to_possible_languages: bool = False,
+    ):
+        super().__init__()
+        self._threshold = threshold
+        self._preload_language_models = preload_language_models
+        self._low_accuracy = low_accuracy
+        self._restrict_to_possible_languages = restrict_to_possible_languages
+        if preload_language_models:
+            self._detector()
+
+    def _detector(
+        self, possible_languages: Sequence[Language] = ()
+    ) -> LanguageDetector:
+        return _detector_for(
+            self.AVAILABLE_LANGUAGES,
+            possible_languages if self._restrict_to_possible_languages else (),
+            self._preload_language_models,
+            self._low_accuracy,
+        )
+
+
+class DetectLanguage(
+    _LanguageDetection, Task[DetectLanguageInput, DetectLanguageOutput]
+):
     """Task that detects the language of a text.
 
     Analyzes the likelihood that a given text is written in one of the
     `possible_languages`. Returns the best match or `None`.
 
+    The underlying lingua detector is built on first use and shared by all instances
+    with the same configuration in the process.
+
     Args:
         threshold: Minimum probability value for a language to be considered
             the `best_fit`.
+        preload_language_models: Load all language models when the task is created
+            instead of on first use. Increases memory usage, but avoids a slow first
+            detection in latency-critical services.
+        low_accuracy: Use the low accuracy mode of lingua. Needs less memory and is
+            faster, but is only reliable for texts longer than a few words.
+        restrict_to_possible_languages: Only score the `possible_languages` of an input
+            instead of all `AVAILABLE_LANGUAGES`. Faster, but a text written in another
+            language is then attributed to the most similar possible language instead
+            of yielding `None`. A detector for each combination of possible languages is
+            built on its first use. With `preload_language_models` it reuses the
+            preloaded models, so building it takes well below a millisecond.
 
     Example:
         >>> from core import (
@@ -97,24 +159,6 @@ class DetectLanguage(Task[DetectLanguageInput, DetectLanguageOutput]):
         >>> output = task.run(input, InMemoryTracer())
     """
 
-    AVAILABLE_LANGUAGES: ClassVar[list[LinguaLanguage]] = [
-        LinguaLanguage.CATALAN,
-        LinguaLanguage.ENGLISH,
-        LinguaLanguage.FRENCH,
-        LinguaLanguage.GERMAN,
-        LinguaLanguage.ITALIAN,
-        LinguaLanguage.POLISH,
-        LinguaLanguage.SPANISH,
-    ]
-
-    def __init__(self, threshold: float = 0.5):
-        super().__init__()
-        self._threshold = threshold
-
-        self._detector = LanguageDetectorBuilder.from_languages(
-            *self.AVAILABLE_LANGUAGES
-        ).build()
-
     def do_run(
         self, input: DetectLanguageInput, task_span: TaskSpan
     ) -> DetectLanguageOutput:
@@ -126,32 +170,203 @@ class DetectLanguage(Task[DetectLanguageInput, DetectLanguageOutput]):
     def _detect_languages(
         self, input: DetectLanguageInput, task_span: TaskSpan
     ) -> Sequence[AnnotatedLanguage]:
-        determined_languages = self._detector.compute_language_confidence_values(
-            input.text
+        determined_languages = self._detector(
+            input.possible_languages
+        ).compute_language_confidence_values(input.text)
+
+        annotated_languages = _annotate(determined_languages)
+        task_span.log(
+            "Raw language probabilities",
+            [
+                language
+                for language in annotated_languages
+                if language.lang in input.possible_languages
+            ],
         )
-
-        annotated_languages = [
-            AnnotatedLanguage(
-                lang=Language(iso_639_1=self._to_iso_639_1_code(lang)), prob=lang.value
-            )
-            for lang in determined_languages
-        ]
-        task_span.log("Raw language probabilities", annotated_languages)
         return annotated_languages
 
-    def _to_iso_639_1_code(self, lingua_with_confidence: ConfidenceValue) -> str:
-        return str(lingua_with_confidence.language.iso_code_639_1.name).lower()
-
     def _get_best_fit(
         self,
         languages_result: Sequence[AnnotatedLanguage],
         possible_languages: Sequence[Language],
     ) -> Optional[Language]:
-        return (
-            languages_result[0].lang
-            if (
-                languages_result[0].prob >= self._threshold
-                and languages_result[0].lang in possible_languages
-            )
-            else None
+        return _best_fit(languages_result, possible_languages, self._threshold)
+
+
+class DetectLanguageBatchInput(BaseModel):
+    """The input for a `DetectLanguageBatch` task.
+
+    Attributes:
+        texts: The texts to identify the language for.
+        possible_languages: All languages that should be considered during detection,
+            shared by all texts. Languages should be provided with their ISO 639-1 codes.
+    """
+
+    texts: Sequence[str]
+    possible_languages: Sequence[Language]
+
+
+class DetectLanguageBatchOutput(BaseModel):
+    """The output of a `DetectLanguageBatch` task.
+
+    Attributes:
+        best_fits: The prediction for the best matching language of each text, in the
+            order of the input. `None` if no language has a probability above the threshold.
+    """
+
+    best_fits: Sequence[Optional[Language]]
+
+
+class DetectLanguageBatch(
+    _LanguageDetection, Task[DetectLanguageBatchInput, DetectLanguageBatchOutput]
+):
+    """Task that detects the languages of many texts at once.
+
+    Works like :class:`DetectLanguage`, but detects the languages of all texts in parallel
+    on all cores and traces a single span per batch instead of one per text.
+
+    Args:
+        threshold: Minimum probability value for a language to be considered
+            the best fit of a text.
+        preload_language_models: Load all language models when the task is created
+            instead of on first use.
+        low_accuracy: Use the low accuracy mode of lingua.
+        restrict_to_possible_languages: Only score the `possible_languages` of an input,
+            see :class:`DetectLanguage`.
+
+    Example:
+        >>> from core import (
+        ...     DetectLanguageBatch,
+        ...     DetectLanguageBatchInput,
+        ...     InMemoryTracer,
+        ...     Language,
+        ... )
+
+        >>> task = DetectLanguageBatch()
+        >>> input = DetectLanguageBatchInput(
+        ...     texts=["This is an English text.", "Ceci est un texte français."],
+        ...     possible_languages=[Language(l) for l in ("en", "fr")],
+        ... )
+        >>> output = task.run(input, InMemoryTracer())
+    """
+
+    def do_run(
+        self, input: DetectLanguageBatchInput, task_span: TaskSpan
+    ) -> DetectLanguageBatchOutput:
+        determined_languages = self._detector(
+            input.possible_languages
+        ).compute_language_confidence_values_in_parallel(list(input.texts))
+        return DetectLanguageBatchOutput(
+            best_fits=[
+                _best_fit(
+                    _annotate(languages), input.possible_languages, self._threshold
+                )
+                for languages in determined_languages
+            ]
+        )
+
+
+def _detector_for(
+    available_languages: Sequence[LinguaLanguage],
+    possible_languages: Sequence[Language],
+    preload_language_models: bool,
+    low_accuracy: bool,
+) -> LanguageDetector:
+    """Returns the detector for the available languages among the possible ones.
+
+    All available languages are used if no or only one of them is possible, as lingua
+    needs at least two languages to tell them apart.
+    """
+    languages = frozenset(available_languages)
+    restricted_languages = frozenset(
+        language
+        for language in languages
+        if Language(language.iso_code_639_1.name.lower()) in possible_languages
+    )
+    if len(restricted_languages) >= 2:
+        languages = restricted_languages
+    return _language_detector(languages, preload_language_models, low_accuracy)
+
+
+def _annotate(
+    determined_languages: Sequence[ConfidenceValue],
+) -> Sequence[AnnotatedLanguage]:
+    return [
+        AnnotatedLanguage(
+            lang=Language(iso_639_1=str(lang.language.iso_code_639_1.name).lower()),
+            prob=lang.value,
         )
+        for lang in determined_languages
+    ]
+
+
+def _best_fit(
+    languages_result: Sequence[AnnotatedLanguage],
+    possible_languages: Sequence[Language],
+    threshold: float,
+) -> Optional[Language]:
+    return (
+        languages_result[0].lang
+        if (
+            languages_result
+            and languages_result[0].prob >= threshold
+            and languages_result[0].lang in possible_languages
+        )
+        else None
+    )
+
+
+_language_detectors: dict[
+    tuple[frozenset[LinguaLanguage], bool, bool], LanguageDetector
+] = {}
+_language_detector_builds: dict[
+    tuple[frozenset[LinguaLanguage], bool, bool], Future[LanguageDetector]
+] = {}
+_language_detectors_lock = Lock()
+
+
+def _language_detector(
+    languages: frozenset[LinguaLanguage],
+    preload_language_models: bool,
+    low_accuracy: bool,
+) -> LanguageDetector:
+    """Returns the detector for the configuration, building it once per process.
+
+    Built detectors are returned without locking. While a detector is built, only the
+    callers asking for the same configuration wait for it.
+    """
+    key = (languages, preload_language_models, low_accuracy)
+    detector = _language_detectors.get(key)
+    if detector is not None:
+        return detector
+    with _language_detectors_lock:
+        detector = _language_detectors.get(key)
+        if detector is not None:
+            return detector
+        build = _language_detector_builds.get(key)
+        if build is not None:
+            is_builder = False
+        else:
+            build = _language_detector_builds[key] = Future()
+            is_builder = True
+    if not is_builder:
+        return build.result()
+
+    try:
+        builder = LanguageDetectorBuilder.from_languages(*languages)
+        if preload_language_models:
+            builder = builder.with_preloaded_language_models()
+        if low_accuracy:
+            builder = builder.with_low_accuracy_mode()
+        detector = builder.build()
+    except BaseException as e:
+        build.set_exception(e)
+        raise
+    else:
+        with _language_detectors_lock:
+            _language_detectors[key] = detector
+        build.set_result(detector)
+        return detector
+    finally:
+        with _language_detectors_lock:
+            del _language_detector_builds[key]
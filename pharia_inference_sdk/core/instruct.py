@@ -2,7 +2,12 @@ from typing import Optional
 
 from pydantic import BaseModel
 
-from pharia_inference_sdk.core.model import CompleteInput, CompleteOutput, ControlModel
+from pharia_inference_sdk.core.model import (
+    CompleteInput,
+    CompleteOutput,
+    ContextOverflowPolicy,
+    ControlModel,
+)
 from pharia_inference_sdk.core.task import Task
 from pharia_inference_sdk.core.tracer.tracer import TaskSpan
 
@@ -15,16 +20,75 @@ class InstructInput(BaseModel):
 
 
 class Instruct(Task[InstructInput, CompleteOutput]):
-    def __init__(self, model: ControlModel) -> None:
+    """Completes an instruction with a `ControlModel`.
+
+    Args:
+        model: The model used for the completion.
+        context_overflow_policy: If set, the completion is checked locally to fit into the
+            context of the model. With the truncating policies, tokens are dropped from the
+            input of the instruction until the completion fits.
+    """
+
+    def __init__(
+        self,
+        model: ControlModel,
+        context_overflow_policy: Optional[ContextOverflowPolicy] = None,
+    ) -> None:
         super().__init__()
         self._model = model
+        self._context_overflow_policy = context_overflow_policy
 
     def do_run(self, input: InstructInput, task_span: TaskSpan) -> CompleteOutput:
+        complete_input = self._complete_input(input)
+        if self._context_overflow_policy in (
+            ContextOverflowPolicy.TRUNCATE_INPUT_LEFT,
+            ContextOverflowPolicy.TRUNCATE_INPUT_RIGHT,
+        ):
+            complete_input = self._truncate_input(input, complete_input, task_span)
+        if self._context_overflow_policy is not None:
+            complete_input = self._model.fit_to_context(
+                complete_input, self._context_overflow_policy
+            )
+        return self._model.complete(complete_input, task_span)
+
+    def _complete_input(self, input: InstructInput) -> CompleteInput:
         prompt = self._model.to_instruct_prompt(
             instruction=input.instruction,
             input=input.input,
             response_prefix=input.response_prefix,
         )
-        return self._model.complete(
-            CompleteInput(prompt=prompt, maximum_tokens=input.maximum_tokens), task_span
-        )
+        return CompleteInput(prompt=prompt, maximum_tokens=input.maximum_tokens)
+
+    def _truncate_input(
+        self, input: InstructInput, complete_input: CompleteInput, task_span: TaskSpan
+    ) -> CompleteInput:
+        overflow = self._model.context_overflow(complete_input)
+        # tokens at the boundaries of the input may merge differently once it is
+        # rendered into the prompt, so truncate until the prompt actually fits
+        while overflow > 0 and input.input:
+            encoding = self._model.get_tokenizer_no_whitespace_prefix().encode(
+                input.input, add_special_tokens=False
+            )
+            kept_tokens = max(len(encoding.offsets) - overflow, 0)
+            if kept_tokens == 0:
+                truncated = ""
+            elif (
+                self._context_overflow_policy
+                == ContextOverflowPolicy.TRUNCATE_INPUT_LEFT
+            ):
+                truncated = input.input[encoding.offsets[-kept_tokens][0] :]
+            else:
+                truncated = input.input[: encoding.offsets[kept_tokens - 1][1]]
+            if truncated == input.input:
+                break
+            task_span.log(
+                "Truncated input",
+                {
+                    "dropped_tokens": overflow,
+                    "dropped_characters": len(input.input) - len(truncated),
+                },
+            )
+            input = input.model_copy(update={"input": truncated})
+            complete_input = self._complete_input(input)
+            overflow = self._model.context_overflow(complete_input)
+        return complete_input
@@ -1,11 +1,14 @@
-import typing
+import json
 import warnings
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
-from copy import deepcopy
+from array import array
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future
 from dataclasses import replace
+from enum import Enum
 from functools import lru_cache
-from typing import Any, ClassVar, Literal, Optional
+from threading import Lock
+from typing import Any, ClassVar, Generic, Literal, Optional, TypeVar, Union
 
 from aleph_alpha_client import (
     CompletionRequest,
@@ -17,6 +20,12 @@ from aleph_alpha_client import (
     TextControl,
     Tokens,
 )
+from aleph_alpha_client.explanation import (
+    ImagePromptItemExplanation,
+    TargetPromptItemExplanation,
+    TextPromptItemExplanation,
+    TokenPromptItemExplanation,
+)
 from pydantic import BaseModel, ConfigDict
 from tokenizers import Encoding, Tokenizer  # type: ignore
 
@@ -24,12 +33,20 @@ from pharia_inference_sdk.connectors.limited_concurrency_client import (
     AlephAlphaClientProtocol,
     LimitedConcurrencyClient,
 )
+from pharia_inference_sdk.core.model_catalogue import global_model_catalogue
 from pharia_inference_sdk.core.prompt_template import (
     PromptTemplate,
     RichPrompt,
     TextCursor,
 )
+from pharia_inference_sdk.core.response_cache import (
+    ResponseCache,
+    completion_cache_key,
+    explanation_cache_key,
+    is_deterministic,
+)
 from pharia_inference_sdk.core.task import Task, Token
+from pharia_inference_sdk.core.tokenizer_registry import global_tokenizer_registry
 from pharia_inference_sdk.core.tracer.tracer import TaskSpan, Tracer
 
 
@@ -62,6 +79,81 @@ class CompleteOutput(BaseModel, CompletionResponse, frozen=True):
         return self.num_tokens_generated
 
 
+class ContextOverflowPolicy(Enum):
+    """What to do with a completion whose prompt and `maximum_tokens` exceed the context.
+
+    Attributes:
+        RAISE: Raise a :class:`ContextWindowExceededError` before calling the API.
+        SHRINK_MAXIMUM_TOKENS: Reduce `maximum_tokens` to the tokens left in the context.
+        TRUNCATE_INPUT_LEFT: Drop tokens from the start of the input of an instruction.
+        TRUNCATE_INPUT_RIGHT: Drop tokens from the end of the input of an instruction.
+    """
+
+    RAISE = "RAISE"
+    SHRINK_MAXIMUM_TOKENS = "SHRINK_MAXIMUM_TOKENS"
+    TRUNCATE_INPUT_LEFT = "TRUNCATE_INPUT_LEFT"
+    TRUNCATE_INPUT_RIGHT = "TRUNCATE_INPUT_RIGHT"
+
+
+class ContextWindowExceededError(ValueError):
+    """Raised if a prompt and its `maximum_tokens` do not fit into the context of a model.
+
+    Args:
+        prompt_tokens: The number of tokens of the prompt.
+        maximum_tokens: The number of tokens requested to be generated.
+        context_size: The size of the context of the model.
+    """
+
+    def __init__(
+        self, prompt_tokens: int, maximum_tokens: int, context_size: int
+    ) -> None:
+        super().__init__(
+            f"The prompt ({prompt_tokens} tokens) and maximum_tokens ({maximum_tokens}) "
+            f"exceed the context size of {context_size} tokens."
+        )
+        self.prompt_tokens = prompt_tokens
+        self.maximum_tokens = maximum_tokens
+        self.context_size = context_size
+
+
+T = TypeVar("T")
+
+
+class _SingleFlight(Generic[T]):
+    """Shares the result of a call with all callers that ask for the same key meanwhile."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._calls: dict[str, Future[T]] = {}
+
+    def run(self, key: str, function: Callable[[], T]) -> tuple[T, bool]:
+        """Runs `function` unless an identical call is in flight.
+
+        Returns:
+            The result and whether it was shared by a call that was already in flight.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = Future()
+                is_leader = True
+            else:
+                is_leader = False
+        if not is_leader:
+            return call.result(), True
+
+        try:
+            result = function()
+            call.set_result(result)
+            return result, False
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
 class _Complete(Task[CompleteInput, CompleteOutput]):
     """Performs a completion request with access to all possible request parameters.
 
@@ -72,23 +164,70 @@ class _Complete(Task[CompleteInput, CompleteOutput]):
         client: Aleph Alpha client instance for running model related API calls.
         model: The name of a valid model that can access an API using an implementation
             of the AlephAlphaClientProtocol.
+        cache: Optional cache for the responses of deterministic requests.
+        coalesce: Whether identical requests that are in flight at the same time are
+            sent only once. The task span of every caller still records the request.
     """
 
-    def __init__(self, client: AlephAlphaClientProtocol, model: str) -> None:
+    def __init__(
+        self,
+        client: AlephAlphaClientProtocol,
+        model: str,
+        cache: Optional[ResponseCache] = None,
+        coalesce: bool = False,
+    ) -> None:
         super().__init__()
         self._client = client
         self._model = model
+        self._cache = cache
+        self._coalesce = coalesce
 
     def do_run(self, input: CompleteInput, task_span: TaskSpan) -> CompleteOutput:
         task_span.log("Model", self._model)
-        return CompleteOutput.from_completion_response(
-            self._client.complete(
-                request=input.to_completion_request(),
-                model=self._model,
+        request = input.to_completion_request()
+        if not self._coalesce:
+            return self._cached_complete(request, task_span)
+        output, shared = _in_flight_completions.run(
+            f"{id(self._client)}:{completion_cache_key(request, self._model)}",
+            lambda: self._cached_complete(request, task_span),
+        )
+        if shared:
+            task_span.log(
+                "Coalesced request", "shared the response of an identical request"
             )
+        return output
+
+    def _cached_complete(
+        self, request: CompletionRequest, task_span: TaskSpan
+    ) -> CompleteOutput:
+        if self._cache is None:
+            return self._complete(request)
+        if not is_deterministic(request):
+            task_span.log("Completion cache", "bypassed for sampled completion")
+            return self._complete(request)
+
+        key = completion_cache_key(request, self._model)
+        cached = self._cache.get(key)
+        if cached is None:
+            output = self._complete(request)
+            self._cache.put(key, output.model_dump_json())
+        else:
+            output = CompleteOutput.model_validate_json(cached)
+        task_span.log(
+            "Completion cache",
+            {"hit": cached is not None, **self._cache.stats().model_dump()},
+        )
+        return output
+
+    def _complete(self, request: CompletionRequest) -> CompleteOutput:
+        return CompleteOutput.from_completion_response(
+            self._client.complete(request=request, model=self._model)
         )
 
 
+_in_flight_completions: _SingleFlight[CompleteOutput] = _SingleFlight()
+
+
 class ExplainInput(BaseModel, ExplanationRequest, frozen=True):
     """The input for a `Explain` task."""
 
@@ -120,20 +259,101 @@ class _Explain(Task[ExplainInput, ExplainOutput]):
         client: Aleph Alpha client instance for running model related API calls.
         model: The name of a valid model that can access an API using an implementation
             of the AlephAlphaClientProtocol.
+        cache: Optional cache for the responses of explanation requests.
     """
 
-    def __init__(self, client: AlephAlphaClientProtocol, model: str) -> None:
+    def __init__(
+        self,
+        client: AlephAlphaClientProtocol,
+        model: str,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
         super().__init__()
         self._client = client
         self._model = model
+        self._cache = cache
 
     def do_run(self, input: ExplainInput, task_span: TaskSpan) -> ExplainOutput:
         task_span.log("Model", self._model)
-        return ExplainOutput.from_explanation_response(
-            self._client.explain(
-                request=input.to_explanation_request(), model=self._model
+        request = input.to_explanation_request()
+        if self._cache is None:
+            return self._explain(request)
+
+        key = explanation_cache_key(request, self._model)
+        cached = self._cache.get(key)
+        if cached is None:
+            output = self._explain(request)
+            self._cache.put(key, json.dumps(_explanation_response_to_json(output)))
+        else:
+            output = ExplainOutput.from_explanation_response(
+                ExplanationResponse.from_json(json.loads(cached))
             )
+        task_span.log(
+            "Explanation cache",
+            {"hit": cached is not None, **self._cache.stats().model_dump()},
         )
+        return output
+
+    def _explain(self, request: ExplanationRequest) -> ExplainOutput:
+        return ExplainOutput.from_explanation_response(
+            self._client.explain(request=request, model=self._model)
+        )
+
+
+def _explanation_response_to_json(response: ExplanationResponse) -> dict[str, Any]:
+    """Serializes an explanation response in the format returned by the API.
+
+    The inverse of `ExplanationResponse.from_json`, the client does not offer it. Scores
+    with raw texts or pixel coordinates are serialized as their plain counterparts.
+    """
+
+    def item_to_json(
+        item: Union[
+            TextPromptItemExplanation,
+            TargetPromptItemExplanation,
+            TokenPromptItemExplanation,
+            ImagePromptItemExplanation,
+        ],
+    ) -> dict[str, Any]:
+        if isinstance(item, ImagePromptItemExplanation):
+            return {
+                "type": "image",
+                "scores": [
+                    {
+                        "rect": {
+                            "left": score.left,
+                            "top": score.top,
+                            "width": score.width,
+                            "height": score.height,
+                        },
+                        "score": score.score,
+                    }
+                    for score in item.scores
+                ],
+            }
+        if isinstance(item, TokenPromptItemExplanation):
+            return {
+                "type": "token_ids",
+                "scores": [score.score for score in item.scores],
+            }
+        return {
+            "type": "text" if isinstance(item, TextPromptItemExplanation) else "target",
+            "scores": [
+                {"start": score.start, "length": score.length, "score": score.score}
+                for score in item.scores
+            ],
+        }
+
+    return {
+        "model_version": response.model_version,
+        "explanations": [
+            {
+                "target": explanation.target,
+                "items": [item_to_json(item) for item in explanation.items],
+            }
+            for explanation in response.explanations
+        ],
+    }
 
 
 @lru_cache(maxsize=1)
@@ -250,24 +470,41 @@ class AlephAlphaModel(LanguageModel):
             of the AlephAlphaClientProtocol.
         client: Aleph Alpha client instance for running model related API calls.
             Defaults to :class:`LimitedConcurrencyClient`
+        completion_cache: Optional cache for completions. Only completions that do not
+            sample (i.e. with a `temperature` of 0) are cached.
+        explanation_cache: Optional cache for explanations. Can share its storage with
+            `completion_cache` as keys of different request kinds do not collide.
+        context_overflow_policy: If set, completions are checked locally to fit into
+            the context of the model before they are sent, see :meth:`fit_to_context`.
+            Defaults to no check.
     """
 
     def __init__(
-        self, name: str, client: Optional[AlephAlphaClientProtocol] = None
+        self,
+        name: str,
+        client: Optional[AlephAlphaClientProtocol] = None,
+        completion_cache: Optional[ResponseCache] = None,
+        explanation_cache: Optional[ResponseCache] = None,
+        context_overflow_policy: Optional[ContextOverflowPolicy] = None,
     ) -> None:
         super().__init__(name)
         self._client = (
             limited_concurrency_client_from_env() if client is None else client
         )
-        if name not in [model["name"] for model in self._client.models()]:
+        if global_model_catalogue.model_info(self._client, name) is None:
             warnings.warn(
                 "The provided model is not a recommended model for this model class. "
                 "Make sure that the model you have selected is suited to be use for the prompt template used in this model class."
             )
         self._complete: Task[CompleteInput, CompleteOutput] = _Complete(
-            self._client, name
+            self._client, name, completion_cache
+        )
+        # scoring jobs echo the same candidates for the same prompt from many threads
+        self._echo_complete = _Complete(
+            self._client, name, completion_cache, coalesce=True
         )
-        self._explain = _Explain(self._client, name)
+        self._explain = _Explain(self._client, name, explanation_cache)
+        self._context_overflow_policy = context_overflow_policy
 
     def generate(self, prompt: str, tracer: Tracer) -> str:
         complete_input = CompleteInput(prompt=Prompt.from_text(prompt))
@@ -276,17 +513,18 @@ class AlephAlphaModel(LanguageModel):
     def echo(
         self, prompt: str, expected_completion: str, tracer: Tracer
     ) -> Sequence[tuple[Token, Optional[float]]]:
-        expected_completion_encoding: Encoding = self.tokenize(
-            expected_completion, whitespace_prefix=False
-        )
+        tokenizer = self.get_tokenizer_no_whitespace_prefix()
+        expected_completion_encoding: Encoding = tokenizer.encode(expected_completion)
         expected_completion_tokens = [
-            Token(
-                token=self.get_tokenizer_no_whitespace_prefix().decode(
-                    [token_id], skip_special_tokens=False
+            Token(token=token, token_id=token_id)
+            for token, token_id in zip(
+                tokenizer.decode_batch(
+                    [[token_id] for token_id in expected_completion_encoding.ids],
+                    skip_special_tokens=False,
                 ),
-                token_id=token_id,
+                expected_completion_encoding.ids,
+                strict=True,
             )
-            for token_id in expected_completion_encoding.ids
         ]
 
         aa_prompt = Prompt(
@@ -294,16 +532,14 @@ class AlephAlphaModel(LanguageModel):
         )
 
         logprob_index = 0
-        output = self._complete.run(
-            CompleteInput(
-                prompt=aa_prompt,
-                maximum_tokens=0,
-                log_probs=logprob_index,
-                tokens=True,
-                echo=True,
-            ),
-            tracer,
+        complete_input = CompleteInput(
+            prompt=aa_prompt,
+            maximum_tokens=0,
+            log_probs=logprob_index,
+            tokens=True,
+            echo=True,
         )
+        output = self._echo_complete.run(complete_input, tracer)
         assert output.completions[0].log_probs
 
         return [
@@ -320,31 +556,86 @@ class AlephAlphaModel(LanguageModel):
 
     @property
     def context_size(self) -> int:
-        # needed for proper caching without memory leaks
-        if isinstance(self._client, typing.Hashable):
-            return _cached_context_size(self._client, self.name)
-        return _context_size(self._client, self.name)
+        return global_model_catalogue.context_size(self._client, self.name)
 
     def complete_task(self) -> Task[CompleteInput, CompleteOutput]:
         return self._complete
 
     def complete(self, input: CompleteInput, tracer: Tracer) -> CompleteOutput:
+        if self._context_overflow_policy is not None:
+            input = self.fit_to_context(input, self._context_overflow_policy)
         return self._complete.run(input, tracer)
 
+    def count_prompt_tokens(self, prompt: Prompt) -> int:
+        """Counts the tokens of a prompt locally.
+
+        Images are not counted, as their number of tokens is only known to the API.
+        """
+        texts = [item.text for item in prompt.items if isinstance(item, Text)]
+        return sum(self.count_tokens_batch(texts)) + sum(
+            len(item.tokens) for item in prompt.items if isinstance(item, Tokens)
+        )
+
+    def context_overflow(self, input: CompleteInput) -> int:
+        """The number of tokens by which the prompt and `maximum_tokens` exceed the context.
+
+        Zero or negative if the completion fits into the context.
+        """
+        return (
+            self.count_prompt_tokens(input.prompt)
+            + (input.maximum_tokens or 0)
+            - self.context_size
+        )
+
+    def fit_to_context(
+        self,
+        input: CompleteInput,
+        policy: ContextOverflowPolicy = ContextOverflowPolicy.RAISE,
+    ) -> CompleteInput:
+        """Checks locally that a completion fits into the context of the model.
+
+        Rejecting an oversized prompt before it is sent saves a round-trip to the API.
+        Truncating the input of a prompt is only possible before it is rendered, which is
+        done by tasks like `Instruct`. Here the truncating policies behave like `RAISE`.
+
+        Args:
+            input: The completion to check.
+            policy: What to do if the completion does not fit.
+
+        Returns:
+            The completion, with a reduced `maximum_tokens` if required by the policy.
+
+        Raises:
+            ContextWindowExceededError: If the completion does not fit and the policy
+                cannot make it fit.
+        """
+        overflow = self.context_overflow(input)
+        if overflow <= 0:
+            return input
+        maximum_tokens = input.maximum_tokens or 0
+        if (
+            policy == ContextOverflowPolicy.SHRINK_MAXIMUM_TOKENS
+            and overflow < maximum_tokens
+        ):
+            return input.model_copy(
+                update={"maximum_tokens": maximum_tokens - overflow}
+            )
+        raise ContextWindowExceededError(
+            prompt_tokens=overflow + self.context_size - maximum_tokens,
+            maximum_tokens=maximum_tokens,
+            context_size=self.context_size,
+        )
+
     def explain(self, input: ExplainInput, tracer: Tracer) -> ExplainOutput:
         return self._explain.run(input, tracer)
 
     def get_tokenizer(self) -> Tokenizer:
-        # needed for proper caching without memory leaks
-        if isinstance(self._client, typing.Hashable):
-            return _cached_tokenizer(self._client, self.name)
-        return _tokenizer(self._client, self.name)
+        return global_tokenizer_registry.get(self._client, self.name)
 
     def get_tokenizer_no_whitespace_prefix(self) -> Tokenizer:
-        # needed for proper caching without memory leaks
-        if isinstance(self._client, typing.Hashable):
-            return _cached_tokenizer_no_whitespace_prefix(self._client, self.name)
-        return _tokenizer_no_whitespace_prefix(self._client, self.name)
+        return global_tokenizer_registry.get(
+            self._client, self.name, whitespace_prefix=False
+        )
 
     def tokenize(self, text: str, whitespace_prefix: bool = True) -> Encoding:
         tokenizer = (
@@ -354,53 +645,57 @@ class AlephAlphaModel(LanguageModel):
         )
         return tokenizer.encode(text)
 
+    def tokenize_batch(
+        self, texts: Sequence[str], whitespace_prefix: bool = True
+    ) -> list["array[int]"]:
+        """Tokenizes many texts at once, in parallel on all cores.
 
-@lru_cache(maxsize=5)
-def _cached_tokenizer(client: AlephAlphaClientProtocol, name: str) -> Tokenizer:
-    return _tokenizer(client, name)
-
-
-def _tokenizer(client: AlephAlphaClientProtocol, name: str) -> Tokenizer:
-    return client.tokenizer(name)
-
-
-@lru_cache(maxsize=5)
-def _cached_tokenizer_no_whitespace_prefix(
-    client: AlephAlphaClientProtocol, name: str
-) -> Tokenizer:
-    return _tokenizer_no_whitespace_prefix(client, name)
-
-
-def _tokenizer_no_whitespace_prefix(
-    client: AlephAlphaClientProtocol, name: str
-) -> Tokenizer:
-    tokenizer = client.tokenizer(name)
-    if tokenizer.pre_tokenizer:
-        copied_tokenizer = deepcopy(tokenizer)
-        copied_tokenizer.pre_tokenizer.add_prefix_space = False
-        return copied_tokenizer
+        Args:
+            texts: The texts to tokenize.
+            whitespace_prefix: Whether a whitespace is prepended to each text, like in
+                `tokenize`.
 
-    return tokenizer
+        Returns:
+            The token ids of each text as compact array of unsigned integers.
+        """
+        return [
+            array("I", encoding.ids)
+            for encoding in self._encode_batch(texts, whitespace_prefix)
+        ]
 
+    def count_tokens_batch(
+        self, texts: Sequence[str], whitespace_prefix: bool = True
+    ) -> "array[int]":
+        """Counts the tokens of many texts at once, in parallel on all cores.
 
-@lru_cache(maxsize=10)
-def _cached_context_size(client: AlephAlphaClientProtocol, name: str) -> int:
-    return _context_size(client, name)
+        Args:
+            texts: The texts to count the tokens of.
+            whitespace_prefix: Whether a whitespace is prepended to each text, like in
+                `tokenize`.
 
+        Returns:
+            The number of tokens of each text, in the order of `texts`.
+        """
+        return array(
+            "I",
+            (
+                len(encoding)
+                for encoding in self._encode_batch(texts, whitespace_prefix)
+            ),
+        )
 
-def _context_size(client: AlephAlphaClientProtocol, name: str) -> int:
-    models_info = client.models()
-    context_size: Optional[int] = next(
-        (
-            model_info["max_context_size"]
-            for model_info in models_info
-            if model_info["name"] == name
-        ),
-        None,
-    )
-    if context_size is None:
-        raise ValueError(f"No matching model found for name {name}")
-    return context_size
+    def _encode_batch(
+        self, texts: Sequence[str], whitespace_prefix: bool
+    ) -> list[Encoding]:
+        tokenizer = (
+            self.get_tokenizer()
+            if whitespace_prefix
+            else self.get_tokenizer_no_whitespace_prefix()
+        )
+        # encode_batch_fast skips computing offsets, which are not needed here. It is
+        # only available in newer versions of tokenizers.
+        encode_batch = getattr(tokenizer, "encode_batch_fast", tokenizer.encode_batch)
+        return encode_batch(list(texts))
 
 
 class ControlModel(AlephAlphaModel, ABC):
@@ -408,14 +703,21 @@ class ControlModel(AlephAlphaModel, ABC):
     RECOMMENDED_MODELS: ClassVar[list[str]] = []
 
     def __init__(
-        self, name: str, client: AlephAlphaClientProtocol | None = None
+        self,
+        name: str,
+        client: AlephAlphaClientProtocol | None = None,
+        completion_cache: Optional[ResponseCache] = None,
+        explanation_cache: Optional[ResponseCache] = None,
+        context_overflow_policy: Optional[ContextOverflowPolicy] = None,
     ) -> None:
         if name not in self.RECOMMENDED_MODELS or name == "":
             warnings.warn(
                 "The provided model is not a recommended model for this model class. "
                 "Make sure that the model you have selected is suited to be use for the prompt template used in this model class."
             )
-        super().__init__(name, client)
+        super().__init__(
+            name, client, completion_cache, explanation_cache, context_overflow_policy
+        )
 
     @property
     @abstractmethod
@@ -508,6 +810,10 @@ class LuminousControlModel(ControlModel):
             Defaults to `luminous-base-control`
         client: Aleph Alpha client instance for running model related API calls.
             Defaults to :class:`LimitedConcurrencyClient`
+        completion_cache: Optional cache for completions that do not sample.
+        explanation_cache: Optional cache for explanations.
+        context_overflow_policy: If set, completions are checked locally to fit into
+            the context of the model, see :meth:`AlephAlphaModel.fit_to_context`.
     """
 
     INSTRUCTION_PROMPT_TEMPLATE = PromptTemplate(
@@ -534,8 +840,13 @@ class LuminousControlModel(ControlModel):
         self,
         name: str = "luminous-base-control",
         client: Optional[AlephAlphaClientProtocol] = None,
+        completion_cache: Optional[ResponseCache] = None,
+        explanation_cache: Optional[ResponseCache] = None,
+        context_overflow_policy: Optional[ContextOverflowPolicy] = None,
     ) -> None:
-        super().__init__(name, client)
+        super().__init__(
+            name, client, completion_cache, explanation_cache, context_overflow_policy
+        )
 
     @property
     def eot_token(self) -> str:
@@ -552,6 +863,10 @@ class Llama2InstructModel(ControlModel):
             Defaults to `llama-2-13b-chat`
         client: Aleph Alpha client instance for running model related API calls.
             Defaults to :class:`LimitedConcurrencyClient`
+        completion_cache: Optional cache for completions that do not sample.
+        explanation_cache: Optional cache for explanations.
+        context_overflow_policy: If set, completions are checked locally to fit into
+            the context of the model, see :meth:`AlephAlphaModel.fit_to_context`.
     """
 
     INSTRUCTION_PROMPT_TEMPLATE = PromptTemplate("""<s>[INST] <<SYS>>
@@ -572,8 +887,13 @@ class Llama2InstructModel(ControlModel):
         self,
         name: str = "llama-2-13b-chat",
         client: Optional[AlephAlphaClientProtocol] = None,
+        completion_cache: Optional[ResponseCache] = None,
+        explanation_cache: Optional[ResponseCache] = None,
+        context_overflow_policy: Optional[ContextOverflowPolicy] = None,
     ) -> None:
-        super().__init__(name, client)
+        super().__init__(
+            name, client, completion_cache, explanation_cache, context_overflow_policy
+        )
         warnings.warn(
             "The llama-2 models are not longer supported. This class will be removed in future versions. Please use `Llama3InstructModel` instead.",
             category=DeprecationWarning,
@@ -592,6 +912,10 @@ class Llama3InstructModel(ControlModel):
             Defaults to `llama-3.1-8b-instruct`
         client: Aleph Alpha client instance for running model related API calls.
             Defaults to :class:`LimitedConcurrencyClient`
+        completion_cache: Optional cache for completions that do not sample.
+        explanation_cache: Optional cache for explanations.
+        context_overflow_policy: If set, completions are checked locally to fit into
+            the context of the model, see :meth:`AlephAlphaModel.fit_to_context`.
     """
 
     INSTRUCTION_PROMPT_TEMPLATE = PromptTemplate(
@@ -613,8 +937,13 @@ class Llama3InstructModel(ControlModel):
         self,
         name: str = "llama-3.1-8b-instruct",
         client: Optional[AlephAlphaClientProtocol] = None,
+        completion_cache: Optional[ResponseCache] = None,
+        explanation_cache: Optional[ResponseCache] = None,
+        context_overflow_policy: Optional[ContextOverflowPolicy] = None,
     ) -> None:
-        super().__init__(name, client)
+        super().__init__(
+            name, client, completion_cache, explanation_cache, context_overflow_policy
+        )
 
     @property
     def eot_token(self) -> str:
@@ -785,6 +1114,10 @@ class Pharia1ChatModel(AlephAlphaChatModel):
             Defaults to `pharia-1-llm-7b-control`
         client: Aleph Alpha client instance for running model related API calls.
             Defaults to :class:`LimitedConcurrencyClient`
+        completion_cache: Optional cache for completions that do not sample.
+        explanation_cache: Optional cache for explanations.
+        context_overflow_policy: If set, completions are checked locally to fit into
+            the context of the model, see :meth:`AlephAlphaModel.fit_to_context`.
     """
 
     CHAT_PROMPT_TEMPLATE = LLAMA_3_CHAT_PROMPT_TEMPLATE
@@ -798,8 +1131,13 @@ class Pharia1ChatModel(AlephAlphaChatModel):
         self,
         name: str = "pharia-1-llm-7b-control",
         client: Optional[AlephAlphaClientProtocol] = None,
+        completion_cache: Optional[ResponseCache] = None,
+        explanation_cache: Optional[ResponseCache] = None,
+        context_overflow_policy: Optional[ContextOverflowPolicy] = None,
     ) -> None:
-        super().__init__(name, client)
+        super().__init__(
+            name, client, completion_cache, explanation_cache, context_overflow_policy
+        )
 
     # default behavior ("disable_optimizations"=False) will incorrectly strip newlines from end of prompt
     @staticmethod
@@ -830,6 +1168,10 @@ class Llama3ChatModel(AlephAlphaChatModel):
             Defaults to `llama-3-8b-instruct`
         client: Aleph Alpha client instance for running model related API calls.
             Defaults to :class:`LimitedConcurrencyClient`
+        completion_cache: Optional cache for completions that do not sample.
+        explanation_cache: Optional cache for explanations.
+        context_overflow_policy: If set, completions are checked locally to fit into
+            the context of the model, see :meth:`AlephAlphaModel.fit_to_context`.
     """
 
     CHAT_PROMPT_TEMPLATE = LLAMA_3_CHAT_PROMPT_TEMPLATE
@@ -845,8 +1187,13 @@ class Llama3ChatModel(AlephAlphaChatModel):
         self,
         name: str = "llama-3.1-8b-instruct",
         client: Optional[AlephAlphaClientProtocol] = None,
+        completion_cache: Optional[ResponseCache] = None,
+        explanation_cache: Optional[ResponseCache] = None,
+        context_overflow_policy: Optional[ContextOverflowPolicy] = None,
     ) -> None:
-        super().__init__(name, client)
+        super().__init__(
+            name, client, completion_cache, explanation_cache, context_overflow_policy
+        )
 
     @property
     def eot_token(self) -> str:
@@ -0,0 +1,144 @@
+import time
+import weakref
+from collections.abc import Mapping, Sequence
+from concurrent.futures import Future
+from threading import RLock, Thread
+from typing import Any, Optional
+
+from pharia_inference_sdk.connectors.limited_concurrency_client import (
+    AlephAlphaClientProtocol,
+)
+
+ModelInfo = Mapping[str, Any]
+
+
+class ModelCatalogue:
+    """Keeps the models offered by an API in memory, so they are fetched only once.
+
+    The models are looked up by the identity of the client. Once they are older than
+    `ttl` the stale models are still returned, while they are refreshed in the background.
+    Like the :class:`TokenizerRegistry`, the catalogue only holds weak references to the
+    clients. Clients that cannot be weakly referenced are kept alive until their models
+    expire.
+
+    Args:
+        ttl: Time in seconds after which the models of a client are refreshed.
+            Defaults to 5 minutes.
+    """
+
+    def __init__(self, ttl: float = 300) -> None:
+        # reentrant as the finalizers of clients may run in a garbage collection
+        # triggered while the lock is held
+        self._lock = RLock()
+        self._ttl = ttl
+        self._models: dict[int, tuple[float, Sequence[ModelInfo]]] = {}
+        self._fetches: dict[int, Future[Sequence[ModelInfo]]] = {}
+        # clients that cannot be weakly referenced are kept alive by the catalogue, so
+        # their ids cannot be reused by other clients, until their models expire
+        self._strong_clients: dict[int, AlephAlphaClientProtocol] = {}
+        self._tracked_clients: set[int] = set()
+
+    def configure(self, ttl: float) -> None:
+        """Changes the time after which models are refreshed."""
+        with self._lock:
+            self._ttl = ttl
+
+    def models(self, client: AlephAlphaClientProtocol) -> Sequence[ModelInfo]:
+        """Returns the models offered by the API of `client`."""
+        with self._lock:
+            entry = self._models.get(id(client))
+        if entry is None:
+            return self._fetch(client).result()
+        fetched_at, models = entry
+        if time.monotonic() - fetched_at > self._ttl:
+            self._refresh_in_background(client)
+        return models
+
+    def model_info(
+        self, client: AlephAlphaClientProtocol, name: str
+    ) -> Optional[ModelInfo]:
+        """Returns the information the API has on the model `name` or `None`."""
+        return next(
+            (model for model in self.models(client) if model["name"] == name), None
+        )
+
+    def context_size(self, client: AlephAlphaClientProtocol, name: str) -> int:
+        """Returns the context size of the model `name`.
+
+        Raises:
+            ValueError: If the API does not offer the model.
+        """
+        model_info = self.model_info(client, name)
+        if model_info is None:
+            raise ValueError(f"No matching model found for name {name}")
+        context_size: int = model_info["max_context_size"]
+        return context_size
+
+    def refresh(self, client: AlephAlphaClientProtocol) -> Sequence[ModelInfo]:
+        """Fetches the models of `client` again and waits for the result."""
+        return self._fetch(client).result()
+
+    def clear(self) -> None:
+        """Forgets all models, they are fetched again on the next lookup."""
+        with self._lock:
+            self._models.clear()
+            self._strong_clients.clear()
+
+    def _refresh_in_background(self, client: AlephAlphaClientProtocol) -> None:
+        with self._lock:
+            if id(client) in self._fetches:
+                return
+        Thread(target=self._fetch, args=(client,), daemon=True).start()
+
+    def _fetch(self, client: AlephAlphaClientProtocol) -> Future[Sequence[ModelInfo]]:
+        client_id = id(client)
+        with self._lock:
+            fetch = self._fetches.get(client_id)
+            if fetch is not None:
+                return fetch
+            fetch = self._fetches[client_id] = Future()
+
+        try:
+            models = client.models()
+        except BaseException as e:
+            # stale models, if any, are kept and refreshing is tried again next time
+            fetch.set_exception(e)
+        else:
+            with self._lock:
+                fetched_at = time.monotonic()
+                self._models[client_id] = (fetched_at, models)
+                self._track(client)
+                self._evict_expired(fetched_at)
+            fetch.set_result(models)
+        finally:
+            with self._lock:
+                del self._fetches[client_id]
+        return fetch
+
+    def _track(self, client: AlephAlphaClientProtocol) -> None:
+        client_id = id(client)
+        if client_id in self._tracked_clients or client_id in self._strong_clients:
+            return
+        try:
+            weakref.finalize(client, self._forget_client, client_id)
+            self._tracked_clients.add(client_id)
+        except TypeError:
+            self._strong_clients[client_id] = client
+
+    def _evict_expired(self, now: float) -> None:
+        expired = [
+            client_id
+            for client_id in self._strong_clients
+            if now - self._models[client_id][0] > self._ttl
+        ]
+        for client_id in expired:
+            del self._strong_clients[client_id]
+            del self._models[client_id]
+
+    def _forget_client(self, client_id: int) -> None:
+        with self._lock:
+            self._tracked_clients.discard(client_id)
+            self._models.pop(client_id, None)
+
+
+global_model_catalogue = ModelCatalogue()
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from aleph_alpha_client import CompletionRequest, ExplanationRequest
+from pydantic import BaseModel
+
+
+class ResponseCacheStats(BaseModel, frozen=True):
+    """Hit and miss counts of a :class:`ResponseCache`."""
+
+    hits: int
+    misses: int
+
+
+class ResponseCache(ABC):
+    """Stores serialized API responses under a key derived from the request.
+
+    Implementations only have to provide storage and eviction, counting hits and misses is
+    done by this base class.
+    """
+
+    def __init__(self) -> None:
+        self._stats_lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[str]: ...
+
+    @abstractmethod
+    def _put(self, key: str, value: str) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Removes all entries from the cache."""
+        ...
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the value stored for `key` or `None` if there is no (valid) entry."""
+        value = self._get(key)
+        with self._stats_lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        """Stores `value` under `key`, possibly evicting other entries."""
+        self._put(key, value)
+
+    def stats(self) -> ResponseCacheStats:
+        with self._stats_lock:
+            return ResponseCacheStats(hits=self._hits, misses=self._misses)
+
+
+class InMemoryResponseCache(ResponseCache):
+    """A :class:`ResponseCache` that keeps the least recently used entries in memory.
+
+    Args:
+        max_size: The maximal number of entries. Defaults to 1024.
+        ttl: Optional time in seconds after which an entry expires.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None) -> None:
+        super().__init__()
+        self._max_size = max_size
+        self._ttl = ttl
+        self._lock = Lock()
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created, value = entry
+            if self._ttl is not None and time.monotonic() - created > self._ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _put(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SqliteResponseCache(ResponseCache):
+    """A :class:`ResponseCache` that persists its entries in a sqlite database.
+
+    The cache survives restarts of the process and can be shared by multiple processes,
+    e.g. by subsequent runs of an evaluation.
+
+    Args:
+        path: The file of the database. Is created if it does not exist.
+        max_size: Optional maximal number of entries. The least recently used ones are evicted.
+        ttl: Optional time in seconds after which an entry expires.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        super().__init__()
+        self._max_size = max_size
+        self._ttl = ttl
+        self._lock = Lock()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+        )
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self._ttl is not None and now - created > self._ttl:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._connection.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+            return str(value)
+
+    def _put(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if self._max_size is not None:
+                self._connection.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self._max_size,),
+                )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def completion_cache_key(request: CompletionRequest, model: str) -> str:
+    """Computes a canonical key for a completion request against a model."""
+    return _cache_key("complete", model, request.to_json())
+
+
+def explanation_cache_key(request: ExplanationRequest, model: str) -> str:
+    """Computes a canonical key for an explanation request against a model."""
+    return _cache_key("explain", model, request.to_json())
+
+
+def is_deterministic(request: CompletionRequest) -> bool:
+    """Whether the completion for `request` does not involve sampling and may be cached."""
+    return (
+        request.temperature == 0
+        and (request.top_k or 0) <= 1
+        and (request.top_p or 0) == 0
+    )
+
+
+def _cache_key(kind: str, model: str, request: object) -> str:
+    serialized = json.dumps(
+        {"kind": kind, "model": model, "request": request},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
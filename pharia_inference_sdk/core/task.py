@@ -1,11 +1,16 @@
+import asyncio
 from abc import ABC, abstractmethod
-from collections.abc import Iterable, Sequence
-from concurrent.futures import ThreadPoolExecutor
-from typing import Generic, TypeVar, final
+from collections.abc import Callable, Generator, Iterable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import closing
+from dataclasses import dataclass
+from threading import Lock, local
+from typing import Generic, Optional, TypeVar, final
 
 from pydantic import BaseModel
 
 from pharia_inference_sdk.core.tracer.tracer import (
+    ErrorValue,
     PydanticSerializable,
     TaskSpan,
     Tracer,
@@ -31,8 +36,232 @@ Output = TypeVar("Output", bound=PydanticSerializable)
 """Interface of the output returned by the task."""
 
 
+@dataclass(frozen=True)
+class TaskResult(Generic[Output]):
+    """The result of running a task on a single input, see `Task.run_concurrently_isolated`.
+
+    Attributes:
+        output: The output of the task. `None` if the task failed.
+        error: The error of the last attempt if the task failed, `None` if it succeeded.
+        attempts: The number of times the task was run for the input.
+    """
+
+    output: Optional[Output] = None
+    error: Optional[ErrorValue] = None
+    attempts: int = 1
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None
+
+
 MAX_CONCURRENCY = 20
-global_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class ConcurrencyBudgetMetrics(BaseModel, frozen=True):
+    """A snapshot of the usage of a :class:`ConcurrencyBudget`.
+
+    Attributes:
+        max_concurrency: The number of slots of the budget.
+        active: The number of slots that currently execute work.
+        queued: The number of submitted work items that wait for a free slot.
+        inline: The number of work items that are currently executed by waiting callers
+            instead of a slot.
+    """
+
+    max_concurrency: int
+    active: int
+    queued: int
+    inline: int
+
+    @property
+    def utilisation(self) -> float:
+        """The fraction of slots that are currently busy."""
+        return self.active / self.max_concurrency
+
+
+class ConcurrencyBudget:
+    """A budget of concurrency slots that is shared by all tasks of a process.
+
+    Work is executed by a fixed pool of `max_concurrency` threads, no matter how many
+    (nested or parallel) calls submit work to the budget. A nested call (e.g. a task that
+    calls `run_concurrently` on a sub-task from within `run_concurrently`) is made from a
+    slot, so while it waits for its work it takes back the work that is still queued and
+    executes it in its own slot. Thereby nested calls always make progress instead of
+    deadlocking on a busy pool, without exceeding `max_concurrency`.
+
+    Callers outside of the budget just wait for their work. Only if no slot finished any
+    work for `stall_timeout` seconds, i.e. all slots are blocked (e.g. by waiting for a
+    thread that in turn waits for the budget), such a caller executes its queued work
+    itself.
+
+    Args:
+        max_concurrency: The number of slots, i.e. the number of threads executing work.
+        stall_timeout: The number of seconds without finished work after which callers
+            outside of the budget execute their queued work themselves.
+    """
+
+    def __init__(self, max_concurrency: int, stall_timeout: float = 1.0) -> None:
+        self._max_concurrency = max_concurrency
+        self._stall_timeout = stall_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="task-concurrency-slot"
+        )
+        self._slot = local()
+        self._lock = Lock()
+        self._active = 0
+        self._queued = 0
+        self._inline = 0
+        self._finished = 0
+
+    @property
+    def max_concurrency(self) -> int:
+        return self._max_concurrency
+
+    def metrics(self) -> ConcurrencyBudgetMetrics:
+        """Returns the current queue depth and slot utilisation of the budget."""
+        with self._lock:
+            return ConcurrencyBudgetMetrics(
+                max_concurrency=self._max_concurrency,
+                active=self._active,
+                queued=self._queued,
+                inline=self._inline,
+            )
+
+    def map_unordered(
+        self,
+        function: Callable[[T], R],
+        items: Iterable[T],
+        concurrency_limit: int,
+    ) -> Generator[tuple[int, "Future[R]"], None, None]:
+        """Applies `function` to all `items` using the slots of this budget.
+
+        Items are consumed lazily, at most `concurrency_limit` of them are in flight at
+        any time. The futures are yielded as soon as they are done, so exceptions raised
+        by `function` are only raised when calling `Future.result`.
+
+        Closing the returned iterator early cancels all queued work and waits for the
+        work that is already running.
+
+        Args:
+            function: The function to apply to each item.
+            items: The items to process.
+            concurrency_limit: The maximal number of items of this call that are processed
+                concurrently. Is capped by the number of slots of the budget.
+
+        Yields:
+            Tuples of the index of the item and the completed future of its result.
+        """
+        limit = max(1, min(concurrency_limit, self._max_concurrency))
+        remaining = enumerate(items)
+        pending: dict[Future[R], tuple[int, T]] = {}
+        try:
+            while True:
+                while len(pending) < limit:
+                    next_item = next(remaining, None)
+                    if next_item is None:
+                        break
+                    index, item = next_item
+                    pending[self._submit(function, item)] = (index, item)
+                if not pending:
+                    return
+                done = [future for future in pending if future.done()]
+                if not done and getattr(self._slot, "active", False):
+                    done = self._run_queued_inline(function, pending)
+                if not done:
+                    done = self._wait(function, pending)
+                for future in done:
+                    index, _ = pending.pop(future)
+                    yield index, future
+        finally:
+            for future in pending:
+                future.cancel()
+            wait(pending)
+
+    async def run_async(self, function: Callable[[T], R], item: T) -> R:
+        """Awaits `function` applied to `item` in a slot of this budget.
+
+        Args:
+            function: The function to apply to the item.
+            item: The item to process.
+
+        Returns:
+            The result of `function`.
+        """
+        return await asyncio.wrap_future(self._submit(function, item))
+
+    def _submit(self, function: Callable[[T], R], item: T) -> "Future[R]":
+        def run_in_slot() -> R:
+            self._slot.active = True
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+            try:
+                return function(item)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._finished += 1
+
+        def on_done(future: "Future[R]") -> None:
+            if future.cancelled():
+                with self._lock:
+                    self._queued -= 1
+
+        with self._lock:
+            self._queued += 1
+        future = self._executor.submit(run_in_slot)
+        future.add_done_callback(on_done)
+        return future
+
+    def _wait(
+        self,
+        function: Callable[[T], R],
+        pending: dict["Future[R]", tuple[int, T]],
+    ) -> list["Future[R]"]:
+        while True:
+            with self._lock:
+                finished = self._finished
+            done = wait(
+                pending, timeout=self._stall_timeout, return_when=FIRST_COMPLETED
+            ).done
+            if done:
+                return list(done)
+            with self._lock:
+                stalled = self._finished == finished
+            if stalled and (done_inline := self._run_queued_inline(function, pending)):
+                return done_inline
+
+    def _run_queued_inline(
+        self,
+        function: Callable[[T], R],
+        pending: dict["Future[R]", tuple[int, T]],
+    ) -> list["Future[R]"]:
+        # the most recently submitted work is the last one a slot would pick up
+        for queued in reversed(list(pending)):
+            if queued.cancel():
+                index, item = pending.pop(queued)
+                future: Future[R] = Future()
+                future.set_running_or_notify_cancel()
+                with self._lock:
+                    self._inline += 1
+                try:
+                    future.set_result(function(item))
+                except Exception as e:
+                    future.set_exception(e)
+                finally:
+                    with self._lock:
+                        self._inline -= 1
+                pending[future] = (index, item)
+                return [future]
+        return []
+
+
+global_concurrency_budget = ConcurrencyBudget(MAX_CONCURRENCY)
+"""The process-wide :class:`ConcurrencyBudget` used by `Task.run_concurrently`."""
 
 
 class Task(ABC, Generic[Input, Output]):
@@ -63,6 +292,24 @@ class Task(ABC, Generic[Input, Output]):
         """
         ...
 
+    async def do_run_async(self, input: Input, task_span: TaskSpan) -> Output:
+        """The asynchronous implementation for this use case.
+
+        Override this in tasks that can await their work natively (e.g. by using an
+        :class:`AsyncLimitedConcurrencyClient`). By default, `do_run` is executed in a
+        slot of the :data:`global_concurrency_budget` so that every task can be awaited.
+
+        Args:
+            input: Generic input defined by the task implementation
+            task_span: The `Span` used for tracing.
+
+        Returns:
+            Generic output defined by the task implementation.
+        """
+        return await global_concurrency_budget.run_async(
+            lambda input: self.do_run(input, task_span), input
+        )
+
     @final
     def run(self, input: Input, tracer: Tracer) -> Output:
         """Executes the implementation of `do_run` for this use case.
@@ -83,6 +330,25 @@ class Task(ABC, Generic[Input, Output]):
             task_span.record_output(output)
             return output
 
+    @final
+    async def run_async(self, input: Input, tracer: Tracer) -> Output:
+        """Executes the implementation of `do_run_async` for this use case.
+
+        The asynchronous counterpart of `run`. The task span is opened and closed in the
+        same way, so traces of awaited tasks look exactly like traces of `run`.
+
+        Args:
+            input: Generic input defined by the task implementation
+            tracer: The `Tracer` used for tracing.
+
+        Returns:
+            Generic output defined by the task implementation.
+        """
+        with tracer.task_span(type(self).__name__, input) as task_span:
+            output = await self.do_run_async(input, task_span)
+            task_span.record_output(output)
+            return output
+
     @final
     def run_concurrently(
         self,
@@ -93,7 +359,9 @@ class Task(ABC, Generic[Input, Output]):
         """Executes multiple processes of this task concurrently.
 
         Each provided input is potentially executed concurrently to the others. There is a global limit
-        on the number of concurrently executed tasks that is shared by all tasks of all types.
+        on the number of concurrently executed tasks that is shared by all tasks of all types, see
+        :data:`global_concurrency_budget`. Nested calls share the same budget: a call whose inputs
+        cannot get a slot executes them in the calling thread.
 
         Args:
             inputs: The inputs that are potentially processed concurrently.
@@ -108,8 +376,142 @@ class Task(ABC, Generic[Input, Output]):
         """
         with (
             tracer.span(f"Concurrent {type(self).__name__} tasks") as span,
-            ThreadPoolExecutor(
-                max_workers=min(concurrency_limit, MAX_CONCURRENCY)
-            ) as executor,
+            closing(
+                global_concurrency_budget.map_unordered(
+                    lambda input: self.run(input, span), inputs, concurrency_limit
+                )
+            ) as results,
         ):
-            return list(executor.map(lambda input: self.run(input, span), inputs))
+            outputs: dict[int, Output] = {}
+            for index, future in results:
+                outputs[index] = future.result()
+            return [outputs[index] for index in range(len(outputs))]
+
+    @final
+    def run_concurrently_iter(
+        self,
+        inputs: Iterable[Input],
+        tracer: Tracer,
+        concurrency_limit: int = MAX_CONCURRENCY,
+    ) -> Generator[tuple[int, Output | Exception], None, None]:
+        """Executes multiple processes of this task concurrently and yields results as they complete.
+
+        In contrast to `run_concurrently` the inputs are consumed lazily: only up to
+        `concurrency_limit` inputs are taken from `inputs` ahead of the results that have
+        been yielded. This allows processing arbitrarily large (e.g. streamed) datasets with
+        constant memory. A failing input does not stop the processing of the others.
+
+        Args:
+            inputs: The inputs that are potentially processed concurrently.
+            tracer: The tracer passed on the `run` method when executing a task.
+            concurrency_limit: An optional additional limit for the number of concurrently executed task for
+                this method call. Also bounds the number of inputs that are read ahead.
+
+        Yields:
+            Tuples of the index of an input and either its Output or the exception raised
+            while processing it, in the order in which they complete. Closing the
+            generator early ends the span and cancels the inputs not yet started.
+        """
+        with (
+            tracer.span(f"Concurrent {type(self).__name__} tasks") as span,
+            closing(
+                global_concurrency_budget.map_unordered(
+                    lambda input: self.run(input, span), inputs, concurrency_limit
+                )
+            ) as results,
+        ):
+            try:
+                for index, future in results:
+                    exception = future.exception()
+                    if exception is None:
+                        yield index, future.result()
+                    elif isinstance(exception, Exception):
+                        yield index, exception
+                    else:
+                        raise exception
+            except GeneratorExit:
+                # stopping the iteration early is not an error of the span
+                return
+
+    @final
+    def run_concurrently_isolated(
+        self,
+        inputs: Iterable[Input],
+        tracer: Tracer,
+        concurrency_limit: int = MAX_CONCURRENCY,
+        max_retries: int = 0,
+    ) -> Sequence[TaskResult[Output]]:
+        """Executes multiple processes of this task concurrently, isolating failures per input.
+
+        Unlike `run_concurrently`, an exception raised for one input does not abort the
+        processing of the others. Instead, it is captured as an :class:`ErrorValue` in the
+        :class:`TaskResult` of that input. Failed inputs are retried up to `max_retries`
+        times; every attempt is traced as its own task span.
+
+        Args:
+            inputs: The inputs that are potentially processed concurrently.
+            tracer: The tracer passed on the `run` method when executing a task.
+            concurrency_limit: An optional additional limit for the number of concurrently executed task for
+                this method call.
+            max_retries: The maximal number of additional attempts for an input that failed.
+
+        Returns:
+            A `TaskResult` for each given Input holding either its Output or its error.
+            The order of the results corresponds to the order of the Inputs.
+        """
+
+        def run_with_retries(input: Input, span: Tracer) -> TaskResult[Output]:
+            error: Optional[Exception] = None
+            for attempt in range(1, max_retries + 2):
+                try:
+                    return TaskResult(output=self.run(input, span), attempts=attempt)
+                except Exception as e:
+                    error = e
+            assert error is not None
+            return TaskResult(
+                error=ErrorValue.from_exception(error), attempts=max_retries + 1
+            )
+
+        with (
+            tracer.span(f"Concurrent {type(self).__name__} tasks") as span,
+            closing(
+                global_concurrency_budget.map_unordered(
+                    lambda input: run_with_retries(input, span),
+                    inputs,
+                    concurrency_limit,
+                )
+            ) as results,
+        ):
+            task_results = dict((index, future.result()) for index, future in results)
+            return [task_results[index] for index in range(len(task_results))]
+
+    @final
+    async def run_concurrently_async(
+        self,
+        inputs: Iterable[Input],
+        tracer: Tracer,
+        concurrency_limit: int = MAX_CONCURRENCY,
+    ) -> Sequence[Output]:
+        """Executes multiple processes of this task concurrently on the running event loop.
+
+        The asynchronous counterpart of `run_concurrently`. Each input is processed by
+        `run_async`, and at most `concurrency_limit` of them are awaited at the same time.
+
+        Args:
+            inputs: The inputs that are potentially processed concurrently.
+            tracer: The tracer passed on the `run_async` method when executing a task.
+            concurrency_limit: The maximal number of inputs of this method call that are
+                processed at the same time.
+
+        Returns:
+            The Outputs generated by calling `run_async` for each given Input.
+            The order of Outputs corresponds to the order of the Inputs.
+        """
+        semaphore = asyncio.Semaphore(concurrency_limit)
+
+        async def run_limited(input: Input, span: Tracer) -> Output:
+            async with semaphore:
+                return await self.run_async(input, span)
+
+        with tracer.span(f"Concurrent {type(self).__name__} tasks") as span:
+            return await asyncio.gather(*(run_limited(input, span) for input in inputs))
@@ -0,0 +1,201 @@
+import weakref
+from collections import OrderedDict
+from copy import deepcopy
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import RLock
+from typing import Any, Optional
+from urllib.parse import quote
+
+from pydantic import BaseModel
+from tokenizers import Tokenizer  # type: ignore
+
+from pharia_inference_sdk.connectors.limited_concurrency_client import (
+    AlephAlphaClientProtocol,
+)
+
+
+class TokenizerRegistryMetrics(BaseModel, frozen=True):
+    """Snapshot of the state of a :class:`TokenizerRegistry`.
+
+    Attributes:
+        max_size: The maximal number of tokenizers kept in memory.
+        size: The number of tokenizers, including derived variants, currently kept in
+            memory.
+        hits: Number of lookups served from memory.
+        disk_hits: Number of lookups served from the on-disk cache.
+        misses: Number of lookups that had to fetch the tokenizer from the API.
+    """
+
+    max_size: int
+    size: int
+    hits: int
+    disk_hits: int
+    misses: int
+
+
+class TokenizerRegistry:
+    """Keeps the tokenizers of models in memory so they are fetched only once.
+
+    Tokenizers are looked up by the identity of the client and the name of the model, so
+    clients do not have to be hashable. The variant of a tokenizer that does not add a
+    whitespace prefix is derived once and kept alongside the original. The registry only holds weak references to the
+    clients: once a client is garbage collected its tokenizers are dropped as well.
+
+    Args:
+        max_size: The maximal number of tokenizers kept in memory. The least recently used
+            ones are evicted first. Defaults to 32.
+        cache_dir: Optional directory in which the JSON of fetched tokenizers is stored.
+            Tokenizers found there are not fetched from the API again, which speeds up
+            cold starts. Tokenizers are stored by model name only, so a directory should
+            not be shared by clients of different APIs.
+    """
+
+    def __init__(
+        self, max_size: int = 32, cache_dir: Optional[Path | str] = None
+    ) -> None:
+        # reentrant as the finalizers of clients may run in a garbage collection
+        # triggered while the lock is held
+        self._lock = RLock()
+        self._max_size = max_size
+        self._cache_dir = None if cache_dir is None else Path(cache_dir)
+        self._tokenizers: OrderedDict[tuple[int, str, bool], Any] = OrderedDict()
+        # clients that cannot be weakly referenced are kept alive by the registry, so
+        # their ids cannot be reused by other clients
+        self._strong_clients: dict[int, AlephAlphaClientProtocol] = {}
+        self._tracked_clients: set[int] = set()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    def configure(
+        self, max_size: Optional[int] = None, cache_dir: Optional[Path | str] = None
+    ) -> None:
+        """Changes the size and/or the on-disk cache directory of the registry."""
+        with self._lock:
+            if max_size is not None:
+                self._max_size = max_size
+                self._evict()
+            if cache_dir is not None:
+                self._cache_dir = Path(cache_dir)
+
+    def get(
+        self,
+        client: AlephAlphaClientProtocol,
+        name: str,
+        whitespace_prefix: bool = True,
+    ) -> Tokenizer:
+        """Returns the tokenizer of the model `name` served by `client`.
+
+        Args:
+            client: The client serving the model.
+            name: The name of the model.
+            whitespace_prefix: If `False` the returned tokenizer does not prepend a
+                whitespace to the texts it encodes.
+
+        Returns:
+            The tokenizer, the same instance for as long as it is kept in memory.
+        """
+        key = (id(client), name, whitespace_prefix)
+        with self._lock:
+            tokenizer = self._tokenizers.get(key)
+            if tokenizer is not None:
+                self._tokenizers.move_to_end(key)
+                self._hits += 1
+                return tokenizer
+
+        from_disk = False
+        if not whitespace_prefix:
+            tokenizer = _without_whitespace_prefix(self.get(client, name))
+        else:
+            tokenizer = self._load_from_disk(name)
+            from_disk = tokenizer is not None
+            if tokenizer is None:
+                tokenizer = client.tokenizer(name)
+                self._store_on_disk(name, tokenizer)
+
+        with self._lock:
+            if from_disk:
+                self._disk_hits += 1
+            elif whitespace_prefix:
+                self._misses += 1
+            # another thread may have loaded the tokenizer meanwhile
+            tokenizer = self._tokenizers.setdefault(key, tokenizer)
+            self._tokenizers.move_to_end(key)
+            self._track(client)
+            self._evict()
+            return tokenizer
+
+    def metrics(self) -> TokenizerRegistryMetrics:
+        with self._lock:
+            return TokenizerRegistryMetrics(
+                max_size=self._max_size,
+                size=len(self._tokenizers),
+                hits=self._hits,
+                disk_hits=self._disk_hits,
+                misses=self._misses,
+            )
+
+    def clear(self) -> None:
+        """Drops all tokenizers kept in memory. The on-disk cache is left untouched."""
+        with self._lock:
+            self._tokenizers.clear()
+            self._strong_clients.clear()
+
+    def _track(self, client: AlephAlphaClientProtocol) -> None:
+        client_id = id(client)
+        if client_id in self._tracked_clients or client_id in self._strong_clients:
+            return
+        try:
+            weakref.finalize(client, self._forget_client, client_id)
+            self._tracked_clients.add(client_id)
+        except TypeError:
+            self._strong_clients[client_id] = client
+
+    def _forget_client(self, client_id: int) -> None:
+        with self._lock:
+            self._tracked_clients.discard(client_id)
+            for key in [key for key in self._tokenizers if key[0] == client_id]:
+                del self._tokenizers[key]
+
+    def _evict(self) -> None:
+        while len(self._tokenizers) > self._max_size:
+            (client_id, _, _), _ = self._tokenizers.popitem(last=False)
+            if client_id in self._strong_clients and not any(
+                key[0] == client_id for key in self._tokenizers
+            ):
+                del self._strong_clients[client_id]
+
+    def _cache_file(self, name: str) -> Optional[Path]:
+        if self._cache_dir is None:
+            return None
+        return self._cache_dir / f"{quote(name, safe='')}.json"
+
+    def _load_from_disk(self, name: str) -> Optional[Tokenizer]:
+        cache_file = self._cache_file(name)
+        if cache_file is None or not cache_file.is_file():
+            return None
+        return Tokenizer.from_file(str(cache_file))
+
+    def _store_on_disk(self, name: str, tokenizer: Any) -> None:
+        cache_file = self._cache_file(name)
+        if cache_file is None or not isinstance(tokenizer, Tokenizer):
+            return
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(
+            "w", dir=cache_file.parent, suffix=".tmp", delete=False, encoding="utf-8"
+        ) as file:
+            file.write(tokenizer.to_str())
+        Path(file.name).replace(cache_file)
+
+
+def _without_whitespace_prefix(tokenizer: Tokenizer) -> Tokenizer:
+    if tokenizer.pre_tokenizer:
+        copied_tokenizer = deepcopy(tokenizer)
+        copied_tokenizer.pre_tokenizer.add_prefix_space = False
+        return copied_tokenizer
+
+    return tokenizer
+
+
+global_tokenizer_registry = TokenizerRegistry()
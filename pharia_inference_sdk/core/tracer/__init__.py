@@ -1,72 +1,102 @@
-from .composite_tracer import CompositeTracer
-from .file_tracer import FileSpan, FileTaskSpan, FileTracer
-from .in_memory_tracer import InMemorySpan, InMemoryTaskSpan, InMemoryTracer, LogEntry
-from .open_telemetry_tracer import OpenTelemetryTracer
-from .persistent_tracer import (
-    EndSpan,
-    EndTask,
-    LogLine,
-    PersistentSpan,
-    PersistentTaskSpan,
-    PersistentTracer,
-    PlainEntry,
-    StartSpan,
-    StartTask,
-    TracerLogEntryFailed,
-)
-from .tracer import (
-    Context,
-    ErrorValue,
-    Event,
-    ExportedSpan,
-    ExportedSpanList,
-    JsonSerializer,
-    NoOpTracer,
-    PydanticSerializable,
-    Span,
-    SpanAttributes,
-    SpanStatus,
-    SpanType,
-    TaskSpan,
-    TaskSpanAttributes,
-    Tracer,
-    utc_now,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-__all__ = [
-    "CompositeTracer",
-    "Context",
-    "EndSpan",
-    "EndTask",
-    "ErrorValue",
-    "Event",
-    "ExportedSpan",
-    "ExportedSpanList",
-    "FileSpan",
-    "FileTaskSpan",
-    "FileTracer",
-    "InMemorySpan",
-    "InMemoryTaskSpan",
-    "InMemoryTracer",
-    "JsonSerializer",
-    "LogEntry",
-    "LogLine",
-    "NoOpTracer",
-    "OpenTelemetryTracer",
-    "PersistentSpan",
-    "PersistentTaskSpan",
-    "PersistentTracer",
-    "PlainEntry",
-    "PydanticSerializable",
-    "Span",
-    "SpanAttributes",
-    "SpanStatus",
-    "SpanType",
-    "StartSpan",
-    "StartTask",
-    "TaskSpan",
-    "TaskSpanAttributes",
-    "Tracer",
-    "TracerLogEntryFailed",
-    "utc_now",
-]
+if TYPE_CHECKING:
+    from .composite_tracer import CompositeTracer as CompositeTracer
+    from .file_tracer import FileSpan as FileSpan
+    from .file_tracer import FileTaskSpan as FileTaskSpan
+    from .file_tracer import FileTracer as FileTracer
+    from .file_tracer import LogFileRotation as LogFileRotation
+    from .in_memory_tracer import InMemorySpan as InMemorySpan
+    from .in_memory_tracer import InMemoryTaskSpan as InMemoryTaskSpan
+    from .in_memory_tracer import InMemoryTracer as InMemoryTracer
+    from .in_memory_tracer import LogEntry as LogEntry
+    from .open_telemetry_tracer import OpenTelemetryTracer as OpenTelemetryTracer
+    from .persistent_tracer import EndSpan as EndSpan
+    from .persistent_tracer import EndTask as EndTask
+    from .persistent_tracer import LogLine as LogLine
+    from .persistent_tracer import PersistentSpan as PersistentSpan
+    from .persistent_tracer import PersistentTaskSpan as PersistentTaskSpan
+    from .persistent_tracer import PersistentTracer as PersistentTracer
+    from .persistent_tracer import PlainEntry as PlainEntry
+    from .persistent_tracer import StartSpan as StartSpan
+    from .persistent_tracer import StartTask as StartTask
+    from .persistent_tracer import TracerLogEntryFailed as TracerLogEntryFailed
+    from .trace_reader import SpanRecord as SpanRecord
+    from .trace_reader import TaskSpanRecord as TaskSpanRecord
+    from .trace_reader import TraceFileReader as TraceFileReader
+    from .trace_reader import TraceRecord as TraceRecord
+    from .tracer import Context as Context
+    from .tracer import ErrorValue as ErrorValue
+    from .tracer import Event as Event
+    from .tracer import ExportedSpan as ExportedSpan
+    from .tracer import ExportedSpanList as ExportedSpanList
+    from .tracer import JsonSerializer as JsonSerializer
+    from .tracer import NoOpTracer as NoOpTracer
+    from .tracer import PydanticSerializable as PydanticSerializable
+    from .tracer import Span as Span
+    from .tracer import SpanAttributes as SpanAttributes
+    from .tracer import SpanStatus as SpanStatus
+    from .tracer import SpanType as SpanType
+    from .tracer import TaskSpan as TaskSpan
+    from .tracer import TaskSpanAttributes as TaskSpanAttributes
+    from .tracer import Tracer as Tracer
+    from .tracer import utc_now as utc_now
+
+_LAZY_MEMBERS: dict[str, str] = {
+    "CompositeTracer": ".composite_tracer",
+    "FileSpan": ".file_tracer",
+    "FileTaskSpan": ".file_tracer",
+    "FileTracer": ".file_tracer",
+    "LogFileRotation": ".file_tracer",
+    "InMemorySpan": ".in_memory_tracer",
+    "InMemoryTaskSpan": ".in_memory_tracer",
+    "InMemoryTracer": ".in_memory_tracer",
+    "LogEntry": ".in_memory_tracer",
+    "OpenTelemetryTracer": ".open_telemetry_tracer",
+    "EndSpan": ".persistent_tracer",
+    "EndTask": ".persistent_tracer",
+    "LogLine": ".persistent_tracer",
+    "PersistentSpan": ".persistent_tracer",
+    "PersistentTaskSpan": ".persistent_tracer",
+    "PersistentTracer": ".persistent_tracer",
+    "PlainEntry": ".persistent_tracer",
+    "StartSpan": ".persistent_tracer",
+    "StartTask": ".persistent_tracer",
+    "TracerLogEntryFailed": ".persistent_tracer",
+    "SpanRecord": ".trace_reader",
+    "TaskSpanRecord": ".trace_reader",
+    "TraceFileReader": ".trace_reader",
+    "TraceRecord": ".trace_reader",
+    "Context": ".tracer",
+    "ErrorValue": ".tracer",
+    "Event": ".tracer",
+    "ExportedSpan": ".tracer",
+    "ExportedSpanList": ".tracer",
+    "JsonSerializer": ".tracer",
+    "NoOpTracer": ".tracer",
+    "PydanticSerializable": ".tracer",
+    "Span": ".tracer",
+    "SpanAttributes": ".tracer",
+    "SpanStatus": ".tracer",
+    "SpanType": ".tracer",
+    "TaskSpan": ".tracer",
+    "TaskSpanAttributes": ".tracer",
+    "Tracer": ".tracer",
+    "utc_now": ".tracer",
+}
+
+__all__ = sorted(_LAZY_MEMBERS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_MEMBERS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -1,7 +1,16 @@
+import atexit
+import gzip
+import shutil
+import time
+import weakref
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
 from datetime import datetime
+from io import BufferedIOBase
 from json import loads
 from pathlib import Path
-from typing import Optional
+from threading import Event, Lock, Thread
+from typing import IO, Literal, Optional
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -16,6 +25,346 @@ from pharia_inference_sdk.core.tracer.persistent_tracer import (
 from pharia_inference_sdk.core.tracer.tracer import Context, PydanticSerializable
 
 
+class LogFileRotation(BaseModel, frozen=True):
+    """When and how a :class:`FileTracer` rotates its log file.
+
+    On rotation the log file is renamed to a segment with the next free number, e.g.
+    `trace.jsonl.1`, `trace.jsonl.2`, ..., and logging continues in a new file. The
+    traces of a :class:`FileTracer` are read from all segments in order.
+
+    Attributes:
+        max_bytes: Size in bytes after which the log file is rotated.
+        interval: Time in seconds after which the log file is rotated.
+        compression: Optional compression of the rotated segments. With `"gzip"` the
+            segments are stored as `trace.jsonl.1.gz`, ...
+    """
+
+    max_bytes: Optional[int] = None
+    interval: Optional[float] = None
+    compression: Optional[Literal["gzip"]] = None
+
+
+class _LogFileWriter:
+    """Appends lines to a log file, shared by a :class:`FileTracer` and all its spans.
+
+    Unbuffered, every line is written to the file right away. Buffered, the lines are kept
+    in memory and written through a single long-lived file handle once `max_buffer_size`
+    characters are buffered or at the latest every `flush_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        buffered: bool = False,
+        flush_interval: float = 1.0,
+        max_buffer_size: int = 1 << 20,
+        rotation: Optional[LogFileRotation] = None,
+    ) -> None:
+        self._path = path
+        self._buffered = buffered
+        self._max_buffer_size = max_buffer_size
+        self._rotation = rotation
+        self._segment_size: Optional[int] = None
+        self._segment_started: Optional[float] = None
+        self._lock = Lock()
+        self._buffer: list[str] = []
+        self._buffer_size = 0
+        self._file: Optional[IO[str]] = None
+        self._directory_created = False
+        self._closed = False
+        self._stop_flushing = Event()
+        if buffered:
+            _open_writers.add(self)
+            # the thread only references the writer weakly, so an abandoned writer can
+            # still be garbage collected, which flushes it
+            Thread(
+                target=_flush_periodically,
+                args=(weakref.ref(self), flush_interval, self._stop_flushing),
+                daemon=True,
+            ).start()
+
+    def write(self, line: str) -> None:
+        with self._lock:
+            if not self._buffered:
+                self._write([line])
+                return
+            if self._closed:
+                raise ValueError(f"Log file {self._path} is already closed")
+            self._buffer.append(line)
+            self._buffer_size += len(line)
+            if self._buffer_size >= self._max_buffer_size:
+                self._flush_buffer()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_buffer()
+
+    def close(self) -> None:
+        self._stop_flushing.set()
+        with self._lock:
+            self._flush_buffer()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._closed = True
+        _open_writers.discard(self)
+
+    def __del__(self) -> None:
+        if self._buffered and not self._closed:
+            self.close()
+
+    def _flush_buffer(self) -> None:
+        if not self._buffer:
+            return
+        self._write(self._buffer)
+        self._buffer.clear()
+        self._buffer_size = 0
+
+    def _write(self, lines: Sequence[str]) -> None:
+        if self._rotation is None:
+            self._append("".join(lines))
+            return
+        # rotation is decided line by line, so a flushed buffer is split between
+        # segments instead of overfilling one
+        batch: list[str] = []
+        for line in lines:
+            if self._rotation_due(len(line.encode("utf-8"))):
+                self._append("".join(batch))
+                batch.clear()
+                self._rotate()
+            batch.append(line)
+        self._append("".join(batch))
+
+    def _append(self, text: str) -> None:
+        if not text:
+            return
+        if not self._buffered:
+            with self._open("a") as file:
+                file.write(text)
+            return
+        if self._file is None:
+            self._file = self._open("a")
+        self._file.write(text)
+        self._file.flush()
+
+    def _rotation_due(self, size: int) -> bool:
+        """Accounts a line of `size` bytes, returns whether it starts a new segment."""
+        assert self._rotation is not None
+        now = time.monotonic()
+        if self._segment_size is None or self._segment_started is None:
+            self._segment_size = self._path.stat().st_size if self._path.exists() else 0
+            self._segment_started = now
+        due = self._segment_size > 0 and (
+            (
+                self._rotation.max_bytes is not None
+                and self._segment_size + size > self._rotation.max_bytes
+            )
+            or (
+                self._rotation.interval is not None
+                and now - self._segment_started >= self._rotation.interval
+            )
+        )
+        if due:
+            self._segment_size = 0
+            self._segment_started = now
+        self._segment_size += size
+        return due
+
+    def _rotate(self) -> None:
+        assert self._rotation is not None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        numbers = [number for number, _ in _rotated_segments(self._path)]
+        segment = self._path.with_name(
+            f"{self._path.name}.{max(numbers, default=0) + 1}"
+        )
+        self._path.replace(segment)
+        index_path = _index_path(self._path)
+        indexed = index_path.exists()
+        if indexed:
+            # byte offsets refer to the uncompressed lines, so the index of a segment is
+            # completed before it is compressed and stays valid afterwards
+            index_path.replace(_index_path(segment))
+            _SegmentIndex(segment).update()
+        if self._rotation.compression == "gzip":
+            compressed = segment.with_name(f"{segment.name}.gz")
+            partial = segment.with_name(f"{segment.name}.gz.tmp")
+            with segment.open("rb") as source, gzip.open(partial, "wb") as target:
+                shutil.copyfileobj(source, target)
+            partial.replace(compressed)
+            if indexed:
+                _index_path(segment).replace(_index_path(compressed))
+            segment.unlink()
+
+    def _open(self, mode: str) -> IO[str]:
+        if not self._directory_created:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._directory_created = True
+        return self._path.open(mode=mode, encoding="utf-8")
+
+
+def _rotated_segments(path: Path) -> list[tuple[int, Path]]:
+    segments = []
+    for candidate in path.parent.glob(f"{path.name}.*"):
+        number, _, extension = candidate.name[len(path.name) + 1 :].partition(".")
+        if number.isdigit() and extension in ("", "gz"):
+            segments.append((int(number), candidate))
+    return sorted(segments)
+
+
+def _log_file_segments(path: Path) -> Sequence[Path]:
+    """The rotated segments of a log file followed by the file itself, oldest first."""
+    segments = [segment for _, segment in _rotated_segments(path)]
+    # without any segments a missing log file is still opened to report the error
+    if path.exists() or not segments:
+        segments.append(path)
+    return segments
+
+
+def _read_lines(segment: Path) -> Iterator[str]:
+    if segment.suffix == ".gz":
+        with gzip.open(segment, "rt", encoding="utf-8") as compressed:
+            yield from compressed
+    else:
+        with segment.open("r", encoding="utf-8") as file:
+            yield from file
+
+
+def _open_binary(segment: Path) -> BufferedIOBase:
+    if segment.suffix == ".gz":
+        return gzip.open(segment, "rb")
+    return segment.open("rb")
+
+
+class _LogLineHeader(BaseModel):
+    """The fields of a :class:`LogLine` needed to decide whether to validate it fully."""
+
+    trace_id: UUID
+    entry_type: str
+
+
+# `LogLine.model_dump_json` writes the trace id first
+_TRACE_ID_PREFIX = '{"trace_id":"'
+_TRACE_ID_END = len(_TRACE_ID_PREFIX) + 36
+
+
+def _trace_id_of(line: str | bytes) -> str:
+    """Extracts the trace id of a log line without validating the whole line."""
+    text = line.decode() if isinstance(line, bytes) else line
+    if (
+        text.startswith(_TRACE_ID_PREFIX)
+        and text[_TRACE_ID_END : _TRACE_ID_END + 1] == '"'
+    ):
+        return text[len(_TRACE_ID_PREFIX) : _TRACE_ID_END]
+    # lines written otherwise, e.g. with a different order of the fields
+    return str(_LogLineHeader.model_validate_json(text).trace_id)
+
+
+def _index_path(segment: Path) -> Path:
+    return segment.with_name(f"{segment.name}.idx")
+
+
+class _SegmentIndex:
+    """The byte ranges of the lines of a log file segment by their trace id.
+
+    The index is stored next to the segment as `<segment>.idx` with one line
+    `<trace id> <offset> <length>` per log line. Offsets refer to the uncompressed
+    segment. Lines appended to the segment after it was indexed are added to the index on
+    the next :meth:`update`.
+    """
+
+    def __init__(self, segment: Path) -> None:
+        self._segment = segment
+        self._index_path = _index_path(segment)
+        self._ranges: defaultdict[str, set[tuple[int, int]]] = defaultdict(set)
+        self._indexed_size = 0
+        self._index_size = 0
+        self._index_ends_with_newline = True
+
+    def update(self) -> None:
+        index_size = self._index_path.stat().st_size if self._index_path.exists() else 0
+        if index_size != self._index_size:
+            # the index was extended by another process, or moved away together with
+            # the segment on rotation
+            self._ranges.clear()
+            self._indexed_size = 0
+            self._load()
+        if self._segment.suffix == ".gz":
+            # compressed segments are not appended to anymore
+            if self._indexed_size == 0:
+                self._index_from(0)
+        elif self._segment.stat().st_size > self._indexed_size:
+            self._index_from(self._indexed_size)
+
+    def ranges(self, trace_id: str) -> Sequence[tuple[int, int]]:
+        return sorted(self._ranges.get(trace_id, ()))
+
+    def _load(self) -> None:
+        self._index_size = 0
+        self._index_ends_with_newline = True
+        if not self._index_path.exists():
+            return
+        with self._index_path.open("rb") as index:
+            for line in index:
+                self._index_size += len(line)
+                self._index_ends_with_newline = line.endswith(b"\n")
+                parts = line.split()
+                # skips a line that was only partially written
+                if len(parts) != 3 or not self._index_ends_with_newline:
+                    continue
+                self._add(parts[0].decode(), int(parts[1]), int(parts[2]))
+
+    def _index_from(self, offset: int) -> None:
+        entries = []
+        with _open_binary(self._segment) as segment:
+            segment.seek(offset)
+            for line in segment:
+                # a line that is still being written is indexed later
+                if not line.endswith(b"\n"):
+                    break
+                if line.strip():
+                    entries.append((_trace_id_of(line), offset, len(line)))
+                offset += len(line)
+        if not entries:
+            return
+        index_lines = "".join(
+            f"{trace_id} {start} {length}\n" for trace_id, start, length in entries
+        ).encode()
+        if not self._index_ends_with_newline:
+            index_lines = b"\n" + index_lines
+            self._index_ends_with_newline = True
+        with self._index_path.open("ab") as index:
+            index.write(index_lines)
+        self._index_size += len(index_lines)
+        for entry in entries:
+            self._add(*entry)
+
+    def _add(self, trace_id: str, offset: int, length: int) -> None:
+        self._ranges[trace_id].add((offset, length))
+        self._indexed_size = max(self._indexed_size, offset + length)
+
+
+_open_writers: "weakref.WeakSet[_LogFileWriter]" = weakref.WeakSet()
+
+
+def _flush_periodically(
+    writer_ref: "weakref.ref[_LogFileWriter]", interval: float, stop: Event
+) -> None:
+    while not stop.wait(interval):
+        writer = writer_ref()
+        if writer is None:
+            return
+        writer.flush()
+        del writer
+
+
+@atexit.register
+def _close_open_writers() -> None:
+    for writer in list(_open_writers):
+        writer.close()
+
+
 class FileTracer(PersistentTracer):
     """A `Tracer` that logs to a file.
 
@@ -24,34 +373,76 @@ class FileTracer(PersistentTracer):
     _pointer_ to its parent element in form of a parent attribute containing
     the uuid of the parent.
 
+    Optionally the log file is rotated, see :class:`LogFileRotation`. The traces are then
+    read from all rotated segments and the current log file.
+
+    By default every entry is written to the file right away. With `buffered=True` the
+    tracer and all its spans share a single file handle and entries are written in batches
+    from memory. Buffered entries are written at the latest after `flush_interval` seconds,
+    on :meth:`flush` and :meth:`close` and when the interpreter exits.
+
     Args:
         log_file_path: Denotes the file to log to.
+        buffered: Whether to buffer the entries in memory. Defaults to `False`.
+        flush_interval: Time in seconds after which buffered entries are written.
+            Defaults to 1 second.
+        max_buffer_size: Number of buffered characters after which the entries are
+            written. Defaults to 1 MiB.
+        rotation: Optional rotation of the log file. Only one tracer, including its
+            spans, should rotate a given log file.
+        indexed: Whether :meth:`traces` looks up the lines of a single trace in an index
+            instead of reading the whole log file. The index is stored next to each
+            segment of the log file as `<segment>.idx`. It is built on the first lookup
+            and extended by the lines appended since on every further lookup.
 
     Attributes:
         uuid: a uuid for the tracer. If multiple :class:`FileTracer` instances log to the same file
             the child-elements for a tracer can be identified by referring to this id as parent.
     """
 
-    def __init__(self, log_file_path: Path | str) -> None:
+    def __init__(
+        self,
+        log_file_path: Path | str,
+        buffered: bool = False,
+        flush_interval: float = 1.0,
+        max_buffer_size: int = 1 << 20,
+        rotation: Optional[LogFileRotation] = None,
+        indexed: bool = False,
+    ) -> None:
         super().__init__()
         self._log_file_path = Path(log_file_path)
+        self._indexed = indexed
+        self._indexes: dict[Path, _SegmentIndex] = {}
+        self._indexes_lock = Lock()
+        self._writer = _LogFileWriter(
+            self._log_file_path, buffered, flush_interval, max_buffer_size, rotation
+        )
 
     def _log_entry(self, id: UUID, entry: BaseModel) -> None:
-        self._log_file_path.parent.mkdir(parents=True, exist_ok=True)
-        with self._log_file_path.open(mode="a", encoding="utf-8") as f:
-            f.write(
-                LogLine(
-                    trace_id=id, entry_type=type(entry).__name__, entry=entry
-                ).model_dump_json()
-                + "\n"
-            )
+        self._writer.write(
+            LogLine(
+                trace_id=id, entry_type=type(entry).__name__, entry=entry
+            ).model_dump_json()
+            + "\n"
+        )
+
+    def flush(self) -> None:
+        """Writes all buffered entries to the file."""
+        self._writer.flush()
+
+    def close(self) -> None:
+        """Writes all buffered entries and closes the file.
+
+        The tracer and its spans must not log any further entries afterwards.
+        """
+        self._writer.close()
 
     def span(
         self,
         name: str,
         timestamp: Optional[datetime] = None,
     ) -> "FileSpan":
-        span = FileSpan(self._log_file_path, context=self.context)
+        span = FileSpan(self._log_file_path, context=self.context, tracer=self)
         self._log_span(span, name, timestamp)
         return span
 
@@ -61,22 +452,59 @@ class FileTracer(PersistentTracer):
         input: PydanticSerializable,
         timestamp: Optional[datetime] = None,
     ) -> "FileTaskSpan":
-        task = FileTaskSpan(
-            self._log_file_path,
-            context=self.context,
-        )
+        task = FileTaskSpan(self._log_file_path, context=self.context, tracer=self)
         self._log_task(task, task_name, input, timestamp)
         return task
 
     def traces(self, trace_id: Optional[str] = None) -> InMemoryTracer:
-        with self._log_file_path.open("r", encoding="utf-8") as f:
-            traces = (LogLine.model_validate(loads(line)) for line in f)
-            filtered_traces = (
-                (line for line in traces if line.trace_id == trace_id)
-                if trace_id is not None
-                else traces
+        self.flush()
+        if trace_id is None:
+            lines: Iterable[str] = self._lines()
+        else:
+            trace_id = str(UUID(str(trace_id)))
+            lines = (
+                self._indexed_lines(trace_id)
+                if self._indexed
+                else (line for line in self._lines() if _trace_id_of(line) == trace_id)
             )
-            return self._parse_log(filtered_traces)
+        # only the lines of the requested trace are validated fully
+        return self._parse_log(LogLine.model_validate(loads(line)) for line in lines)
+
+    def rebuild_index(self) -> None:
+        """Indexes all segments of the log file from scratch.
+
+        Needed for log files that were modified other than by appending to them, e.g.
+        when lines were removed. Log files that were written without an index are indexed
+        on the first lookup anyway.
+        """
+        self.flush()
+        with self._indexes_lock:
+            self._indexes.clear()
+        for segment in _log_file_segments(self._log_file_path):
+            _index_path(segment).unlink(missing_ok=True)
+            self._segment_index(segment)
+
+    def _lines(self) -> Iterator[str]:
+        for segment in _log_file_segments(self._log_file_path):
+            yield from _read_lines(segment)
+
+    def _indexed_lines(self, trace_id: str) -> Iterator[str]:
+        for segment in _log_file_segments(self._log_file_path):
+            ranges = self._segment_index(segment).ranges(trace_id)
+            if not ranges:
+                continue
+            with _open_binary(segment) as file:
+                for offset, length in ranges:
+                    file.seek(offset)
+                    yield file.read(length).decode("utf-8")
+
+    def _segment_index(self, segment: Path) -> _SegmentIndex:
+        with self._indexes_lock:
+            index = self._indexes.get(segment)
+            if index is None:
+                index = self._indexes[segment] = _SegmentIndex(segment)
+            index.update()
+            return index
 
     def convert_file_for_viewing(self, file_path: Path | str) -> None:
         in_memory_tracer = self.traces()
@@ -88,11 +516,28 @@ class FileTracer(PersistentTracer):
 
 
 class FileSpan(PersistentSpan, FileTracer):
-    """A `Span` created by `FileTracer.span`."""
+    """A `Span` created by `FileTracer.span`.
 
-    def __init__(self, log_file_path: Path, context: Optional[Context] = None) -> None:
+    Shares the writer and the indexes of the log file with `tracer`, the tracer that
+    created it.
+    """
+
+    def __init__(
+        self,
+        log_file_path: Path,
+        context: Optional[Context] = None,
+        tracer: Optional[FileTracer] = None,
+    ) -> None:
         PersistentSpan.__init__(self, context=context)
-        FileTracer.__init__(self, log_file_path=log_file_path)
+        if tracer is None:
+            FileTracer.__init__(self, log_file_path=log_file_path)
+            return
+        PersistentTracer.__init__(self)
+        self._log_file_path = Path(log_file_path)
+        self._indexed = tracer._indexed
+        self._indexes = tracer._indexes
+        self._indexes_lock = tracer._indexes_lock
+        self._writer = tracer._writer
 
 
 class FileTaskSpan(PersistentTaskSpan, FileSpan):
@@ -1,12 +1,9 @@
 from collections.abc import Sequence
 from datetime import datetime
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 from uuid import UUID
 
 from pydantic import BaseModel, Field, SerializeAsAny
-from rich.panel import Panel
-from rich.syntax import Syntax
-from rich.tree import Tree
 
 from pharia_inference_sdk.core.tracer.tracer import (
     Context,
@@ -22,6 +19,11 @@ from pharia_inference_sdk.core.tracer.tracer import (
     utc_now,
 )
 
+if TYPE_CHECKING:
+    # rich is only needed to render traces, it is imported on first use
+    from rich.panel import Panel
+    from rich.tree import Tree
+
 
 class InMemoryTracer(Tracer):
     """Collects log entries in a nested structure, and keeps them in memory.
@@ -62,8 +64,10 @@ class InMemoryTracer(Tracer):
         self.entries.append(child)
         return child
 
-    def _rich_render_(self) -> Tree:
+    def _rich_render_(self) -> "Tree":
         """Renders the trace via classes in the `rich` package."""
+        from rich.tree import Tree
+
         tree = Tree(label="Trace")
 
         for log in self.entries:
@@ -137,8 +141,10 @@ class InMemorySpan(InMemoryTracer, Span):
             self.end_timestamp = timestamp or utc_now()
         super().end(timestamp)
 
-    def _rich_render_(self) -> Tree:
+    def _rich_render_(self) -> "Tree":
         """Renders the trace via classes in the `rich` package."""
+        from rich.tree import Tree
+
         tree = Tree(label=self.name)
 
         for log in self.entries:
@@ -225,8 +231,10 @@ class InMemoryTaskSpan(InMemorySpan, TaskSpan):
     def _span_attributes(self) -> SpanAttributes | TaskSpanAttributes:
         return TaskSpanAttributes(input=self.input, output=self.output)
 
-    def _rich_render_(self) -> Tree:
+    def _rich_render_(self) -> "Tree":
         """Renders the trace via classes in the `rich` package."""
+        from rich.tree import Tree
+
         tree = Tree(label=self.name)
 
         tree.add(_render_log_value(self.input, "Input"))
@@ -256,7 +264,7 @@ class LogEntry(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     trace_id: UUID
 
-    def _rich_render_(self) -> Panel:
+    def _rich_render_(self) -> "Panel":
         """Renders the trace via classes in the `rich` package."""
         return _render_log_value(self.value, self.message)
 
@@ -267,7 +275,10 @@ class LogEntry(BaseModel):
         print(self._rich_render_())
 
 
-def _render_log_value(value: PydanticSerializable, title: str) -> Panel:
+def _render_log_value(value: PydanticSerializable, title: str) -> "Panel":
+    from rich.panel import Panel
+    from rich.syntax import Syntax
+
     value = value if isinstance(value, BaseModel) else JsonSerializer(root=value)
     return Panel(
         Syntax(
@@ -0,0 +1,189 @@
+import gzip
+import mmap
+from collections.abc import Iterator
+from datetime import datetime
+from json import loads
+from pathlib import Path
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, SerializeAsAny
+
+from pharia_inference_sdk.core.tracer.file_tracer import (
+    _log_file_segments,
+    _trace_id_of,
+)
+from pharia_inference_sdk.core.tracer.persistent_tracer import (
+    EndSpan,
+    EndTask,
+    PlainEntry,
+    StartSpan,
+    StartTask,
+)
+from pharia_inference_sdk.core.tracer.tracer import PydanticSerializable, SpanStatus
+
+
+class SpanRecord(BaseModel):
+    """A `Span` read by a :class:`TraceFileReader`, without its children.
+
+    Attributes:
+        uuid: The unique id of the span.
+        parent: The unique id of the parent element. For top-level spans this is the
+            trace id.
+        trace_id: The ID of the trace this span belongs to.
+        name: The name of the span.
+        start: The timestamp when the span was started.
+        end: The timestamp when the span ended or `None` if the log file has no end for
+            it, e.g. because the process was killed.
+        status_code: The status of the span once it ended.
+    """
+
+    uuid: UUID
+    parent: UUID
+    trace_id: UUID
+    name: str
+    start: datetime
+    end: Optional[datetime] = None
+    status_code: Optional[SpanStatus] = None
+
+
+class TaskSpanRecord(SpanRecord):
+    """A `TaskSpan` read by a :class:`TraceFileReader`, without its children.
+
+    Attributes:
+        input: The input the task was started with.
+        output: The output of the task or `None` if it did not end.
+    """
+
+    input: SerializeAsAny[PydanticSerializable]
+    output: SerializeAsAny[PydanticSerializable] = None
+
+
+TraceRecord = SpanRecord | TaskSpanRecord | PlainEntry
+
+
+class TraceFileReader:
+    """Reads the entries of the log file of a :class:`FileTracer` one by one.
+
+    In contrast to `FileTracer.traces` no tree of the traces is built. Plain entries are
+    yielded as they are read, spans and task spans once they end. All of them refer to
+    their parent by its id. Only the spans that have started but not yet ended are kept in
+    memory, so arbitrarily large log files can be scanned, e.g. to compute aggregates.
+
+    Rotated segments of the log file are read in order. Uncompressed segments are memory
+    mapped, compressed ones are decompressed while reading.
+
+    Args:
+        log_file_path: The log file of the :class:`FileTracer`.
+
+    Example:
+        >>> from collections import Counter
+        >>> from pharia_inference_sdk.core import TaskSpanRecord, TraceFileReader
+
+        >>> reader = TraceFileReader("traces.jsonl")
+        >>> task_counts = Counter(
+        ...     record.name
+        ...     for record in reader.records()
+        ...     if isinstance(record, TaskSpanRecord)
+        ... )
+    """
+
+    def __init__(self, log_file_path: Path | str) -> None:
+        self._log_file_path = Path(log_file_path)
+
+    def records(self, trace_id: Optional[str] = None) -> Iterator[TraceRecord]:
+        """Yields the entries of all traces or of the trace `trace_id`.
+
+        Children end before their parents, so a span is yielded after all its children.
+        Spans that never ended are yielded last with an `end` of `None`. Ends of spans
+        whose start is not in the log file (e.g. because the oldest rotated segment was
+        deleted) are skipped.
+        """
+        if trace_id is not None:
+            trace_id = str(UUID(str(trace_id)))
+        open_spans: dict[UUID, SpanRecord] = {}
+        for line in self._lines():
+            # only the lines of the requested trace are validated
+            if trace_id is not None and _trace_id_of(line) != trace_id:
+                continue
+            log_line = loads(line)
+            entry_type, entry = log_line["entry_type"], log_line["entry"]
+            if entry_type == StartTask.__name__:
+                start_task = StartTask.model_validate(entry)
+                open_spans[start_task.uuid] = TaskSpanRecord(
+                    uuid=start_task.uuid,
+                    parent=start_task.parent,
+                    trace_id=start_task.trace_id,
+                    name=start_task.name,
+                    start=start_task.start,
+                    input=start_task.input,
+                )
+            elif entry_type == StartSpan.__name__:
+                start_span = StartSpan.model_validate(entry)
+                open_spans[start_span.uuid] = SpanRecord(
+                    uuid=start_span.uuid,
+                    parent=start_span.parent,
+                    trace_id=start_span.trace_id,
+                    name=start_span.name,
+                    start=start_span.start,
+                )
+            elif entry_type == EndTask.__name__:
+                end_task = EndTask.model_validate(entry)
+                task_span = open_spans.pop(end_task.uuid, None)
+                if task_span is None:
+                    continue
+                assert isinstance(task_span, TaskSpanRecord)
+                task_span.end = end_task.end
+                task_span.status_code = end_task.status_code
+                task_span.output = end_task.output
+                yield task_span
+            elif entry_type == EndSpan.__name__:
+                end_span = EndSpan.model_validate(entry)
+                span = open_spans.pop(end_span.uuid, None)
+                if span is None:
+                    continue
+                span.end = end_span.end
+                span.status_code = end_span.status_code
+                yield span
+            elif entry_type == PlainEntry.__name__:
+                yield PlainEntry.model_validate(entry)
+            else:
+                raise RuntimeError(f"Unexpected entry_type in {line}")
+        yield from open_spans.values()
+
+    def _lines(self) -> Iterator[str]:
+        for segment in _log_file_segments(self._log_file_path):
+            for line in _mapped_lines(segment):
+                # a line that is still being written is skipped
+                if not line.endswith(b"\n"):
+                    break
+                yield line.decode("utf-8")
+
+
+# a multiple of the allocation granularity of all platforms
+_MAPPED_WINDOW_SIZE = 64 << 20
+
+
+def _mapped_lines(segment: Path) -> Iterator[bytes]:
+    if segment.suffix == ".gz":
+        with gzip.open(segment, "rb") as compressed:
+            yield from compressed
+        return
+    with segment.open("rb") as file:
+        size = segment.stat().st_size
+        rest = b""
+        # the file is mapped window by window, so the mapped pages of a large file do
+        # not add up in memory
+        for offset in range(0, size, _MAPPED_WINDOW_SIZE):
+            length = min(_MAPPED_WINDOW_SIZE, size - offset)
+            with mmap.mmap(
+                file.fileno(), length, access=mmap.ACCESS_READ, offset=offset
+            ) as mapped:
+                start = 0
+                while (end := mapped.find(b"\n", start)) != -1:
+                    yield rest + mapped[start : end + 1]
+                    rest = b""
+                    start = end + 1
+                rest += mapped[start:]
+        if rest:
+            yield rest
@@ -178,6 +178,14 @@ class ErrorValue(BaseModel):
     message: str
     stack_trace: str
 
+    @staticmethod
+    def from_exception(exception: BaseException) -> "ErrorValue":
+        return ErrorValue(
+            error_type=str(type(exception).__qualname__),
+            message=str(exception),
+            stack_trace="".join(traceback.format_exception(exception)),
+        )
+
 
 class Span(Tracer, AbstractContextManager["Span"]):
     """Captures a logical step within the overall workflow.
@@ -256,11 +264,7 @@ class Span(Tracer, AbstractContextManager["Span"]):
         _traceback: Optional[TracebackType],
     ) -> None:
         if exc_type is not None and exc_value is not None and _traceback is not None:
-            error_value = ErrorValue(
-                error_type=str(exc_type.__qualname__),
-                message=str(exc_value),
-                stack_trace=str(traceback.format_exc()),
-            )
+            error_value = ErrorValue.from_exception(exc_value)
             self.log(error_value.message, error_value)
             self.status_code = SpanStatus.ERROR
         self.end()
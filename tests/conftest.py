@@ -6,6 +6,7 @@ from typing import cast
 from aleph_alpha_client import Client, Image
 from dotenv import load_dotenv
 from pytest import fixture
+from tokenizers import Tokenizer, models, pre_tokenizers  # type: ignore
 
 from pharia_inference_sdk.connectors.limited_concurrency_client import (
     AlephAlphaClientProtocol,
@@ -21,6 +22,16 @@ from pharia_inference_sdk.core import (
 load_dotenv()
 
 
+def word_level_tokenizer(*words: str) -> Tokenizer:
+    """A local tokenizer with a token per word, "hello" and "world" by default."""
+    vocabulary = {word: id for id, word in enumerate(words or ("hello", "world"))}
+    tokenizer = Tokenizer(
+        models.WordLevel({**vocabulary, "[UNK]": len(vocabulary)}, unk_token="[UNK]")
+    )
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    return tokenizer
+
+
 @fixture(scope="session")
 def token() -> str:
     token = getenv("AA_TOKEN")
@@ -1,16 +1,31 @@
+import asyncio
 import time
 from concurrent.futures import ThreadPoolExecutor
 from threading import Lock
 from time import sleep
 from typing import cast
 
+import aiohttp
 import pytest
+import requests
 from aleph_alpha_client import BusyError, CompletionRequest, CompletionResponse, Prompt
 from pytest import fixture
 
 from pharia_inference_sdk.connectors.limited_concurrency_client import (
+    TRANSIENT_ERRORS,
     AlephAlphaClientProtocol,
+    AsyncAlephAlphaClientProtocol,
+    AsyncLimitedConcurrencyClient,
     LimitedConcurrencyClient,
+    RetryPolicy,
+)
+
+EMPTY_COMPLETION = CompletionResponse(
+    model_version="model-version",
+    completions=[],
+    optimized_prompt=None,
+    num_tokens_generated=0,
+    num_tokens_prompt_total=0,
 )
 
 
@@ -30,13 +45,7 @@ class ConcurrencyCountingClient:
         sleep(0.01)
         with self.lock:
             self.concurrency_counter -= 1
-        return CompletionResponse(
-            model_version="model-version",
-            completions=[],
-            optimized_prompt=None,
-            num_tokens_generated=0,
-            num_tokens_prompt_total=0,
-        )
+        return EMPTY_COMPLETION
 
 
 class BusyClient:
@@ -60,6 +69,54 @@ class BusyClient:
                 return self.return_value
 
 
+class FailingOnceClient:
+    def __init__(self, exception: Exception, return_value: CompletionResponse) -> None:
+        self.number_of_calls = 0
+        self.exception = exception
+        self.return_value = return_value
+
+    def complete(self, request: CompletionRequest, model: str) -> CompletionResponse:
+        self.number_of_calls += 1
+        if self.number_of_calls < 2:
+            raise self.exception
+        return self.return_value
+
+
+class AsyncConcurrencyCountingClient:
+    max_concurrency_counter: int = 0
+    concurrency_counter: int = 0
+
+    async def complete(
+        self, request: CompletionRequest, model: str
+    ) -> CompletionResponse:
+        self.concurrency_counter += 1
+        self.max_concurrency_counter = max(
+            self.max_concurrency_counter, self.concurrency_counter
+        )
+        await asyncio.sleep(0.01)
+        self.concurrency_counter -= 1
+        return EMPTY_COMPLETION
+
+    async def close(self) -> None:
+        pass
+
+
+class AsyncBusyClient:
+    def __init__(self, return_value: CompletionResponse | Exception) -> None:
+        self.number_of_retries: int = 0
+        self.return_value = return_value
+
+    async def complete(
+        self, request: CompletionRequest, model: str
+    ) -> CompletionResponse:
+        self.number_of_retries += 1
+        if self.number_of_retries < 2:
+            raise BusyError(503)
+        if isinstance(self.return_value, Exception):
+            raise self.return_value
+        return self.return_value
+
+
 TEST_MAX_CONCURRENCY = 3
 
 
@@ -92,13 +149,7 @@ def test_methods_concurrency_is_limited(
 
 
 def test_limited_concurrency_client_retries() -> None:
-    expected_completion = CompletionResponse(
-        model_version="model-version",
-        completions=[],
-        optimized_prompt=None,
-        num_tokens_generated=0,
-        num_tokens_prompt_total=0,
-    )
+    expected_completion = EMPTY_COMPLETION
     busy_client = BusyClient(return_value=expected_completion)
     limited_concurrency_client = LimitedConcurrencyClient(
         cast(AlephAlphaClientProtocol, busy_client)
@@ -110,13 +161,7 @@ def test_limited_concurrency_client_retries() -> None:
 
 
 def test_limited_concurrency_client_stops_retrying_after_max_retry() -> None:
-    expected_completion = CompletionResponse(
-        model_version="model-version",
-        completions=[],
-        optimized_prompt=None,
-        num_tokens_generated=0,
-        num_tokens_prompt_total=0,
-    )
+    expected_completion = EMPTY_COMPLETION
     busy_client = BusyClient(return_value=expected_completion)
     limited_concurrency_client = LimitedConcurrencyClient(
         cast(AlephAlphaClientProtocol, busy_client), max_retry_time=1
@@ -128,13 +173,7 @@ def test_limited_concurrency_client_stops_retrying_after_max_retry() -> None:
 
 
 def test_limited_concurrency_client_handles_long_running_functions_properly() -> None:
-    expected_completion = CompletionResponse(
-        model_version="model-version",
-        completions=[],
-        optimized_prompt=None,
-        num_tokens_generated=0,
-        num_tokens_prompt_total=0,
-    )
+    expected_completion = EMPTY_COMPLETION
     busy_client = BusyClient(return_value=expected_completion, wait_time=1)
     limited_concurrency_client = LimitedConcurrencyClient(
         cast(AlephAlphaClientProtocol, busy_client), max_retry_time=1
@@ -156,3 +195,197 @@ def test_limited_concurrency_client_throws_exception() -> None:
             CompletionRequest(prompt=Prompt("")), "model"
         )
     assert exception_info.value == expected_exception
+
+
+async def test_async_methods_concurrency_is_limited() -> None:
+    counting_client = AsyncConcurrencyCountingClient()
+    async_client = AsyncLimitedConcurrencyClient(
+        cast(AsyncAlephAlphaClientProtocol, counting_client), TEST_MAX_CONCURRENCY
+    )
+
+    await asyncio.gather(
+        *(
+            async_client.complete(CompletionRequest(prompt=Prompt("")), "model")
+            for _ in range(TEST_MAX_CONCURRENCY * 10)
+        )
+    )
+
+    assert counting_client.max_concurrency_counter == TEST_MAX_CONCURRENCY
+
+
+async def test_async_limited_concurrency_client_retries() -> None:
+    expected_completion = EMPTY_COMPLETION
+    busy_client = AsyncBusyClient(return_value=expected_completion)
+    async_client = AsyncLimitedConcurrencyClient(
+        cast(AsyncAlephAlphaClientProtocol, busy_client)
+    )
+
+    completion = await async_client.complete(
+        CompletionRequest(prompt=Prompt("")), "model"
+    )
+
+    assert completion == expected_completion
+    assert busy_client.number_of_retries == 2
+
+
+async def test_async_limited_concurrency_client_stops_retrying_after_max_retry() -> (
+    None
+):
+    busy_client = AsyncBusyClient(return_value=BusyError(503))
+    async_client = AsyncLimitedConcurrencyClient(
+        cast(AsyncAlephAlphaClientProtocol, busy_client), max_retry_time=1
+    )
+
+    with pytest.raises(BusyError):
+        await async_client.complete(CompletionRequest(prompt=Prompt("")), "model")
+
+
+async def test_async_limited_concurrency_client_closes_wrapped_client() -> None:
+    counting_client = AsyncConcurrencyCountingClient()
+    closed = False
+
+    async def close() -> None:
+        nonlocal closed
+        closed = True
+
+    counting_client.close = close  # type: ignore[method-assign]
+
+    async with AsyncLimitedConcurrencyClient(
+        cast(AsyncAlephAlphaClientProtocol, counting_client)
+    ):
+        pass
+
+    assert closed
+
+
+def test_limited_concurrency_client_keeps_fixed_window_by_default() -> None:
+    expected_completion = EMPTY_COMPLETION
+    busy_client = BusyClient(return_value=expected_completion)
+    limited_concurrency_client = LimitedConcurrencyClient(
+        cast(AlephAlphaClientProtocol, busy_client), max_concurrency=10
+    )
+
+    limited_concurrency_client.complete(CompletionRequest(prompt=Prompt("")), "model")
+
+    assert limited_concurrency_client.concurrency_window == 10
+
+
+def test_adaptive_concurrency_decreases_on_busy_error_and_recovers() -> None:
+    expected_completion = EMPTY_COMPLETION
+    busy_client = BusyClient(return_value=expected_completion)
+    limited_concurrency_client = LimitedConcurrencyClient(
+        cast(AlephAlphaClientProtocol, busy_client),
+        max_concurrency=10,
+        adaptive_concurrency=True,
+    )
+
+    limited_concurrency_client.complete(CompletionRequest(prompt=Prompt("")), "model")
+    assert limited_concurrency_client.concurrency_window == 5
+
+    for _ in range(50):
+        limited_concurrency_client.complete(
+            CompletionRequest(prompt=Prompt("")), "model"
+        )
+    assert limited_concurrency_client.concurrency_window == 10
+
+
+def test_adaptive_concurrency_decreases_on_slow_responses(
+    concurrency_counting_client: ConcurrencyCountingClient,
+) -> None:
+    limited_concurrency_client = LimitedConcurrencyClient(
+        cast(AlephAlphaClientProtocol, concurrency_counting_client),
+        max_concurrency=8,
+        adaptive_concurrency=True,
+        min_concurrency=2,
+        latency_threshold=0.001,
+    )
+
+    for _ in range(3):
+        limited_concurrency_client.complete(
+            CompletionRequest(prompt=Prompt("")), "model"
+        )
+
+    assert limited_concurrency_client.concurrency_window == 2
+
+
+def test_retry_policy_without_jitter_backs_off_exponentially() -> None:
+    policy = RetryPolicy(base_delay=0.5, max_delay=3)
+
+    assert [policy.delay(retries, 0) for retries in range(5)] == [0.5, 1, 2, 3, 3]
+
+
+def test_retry_policy_jitter_stays_within_bounds() -> None:
+    full_jitter = RetryPolicy(base_delay=1, max_delay=10, jitter="full")
+    decorrelated_jitter = RetryPolicy(base_delay=1, max_delay=10, jitter="decorrelated")
+
+    for retries in range(10):
+        assert 0 <= full_jitter.delay(retries, 0) <= min(10, 2**retries)
+
+    delay = 0.0
+    for retries in range(10):
+        next_delay = decorrelated_jitter.delay(retries, delay)
+        assert 1 <= next_delay <= min(10, max(1, delay * 3))
+        delay = next_delay
+
+
+def test_retry_policy_decides_which_errors_are_retried() -> None:
+    default_policy = RetryPolicy()
+    transient_policy = RetryPolicy(
+        retryable_exceptions=TRANSIENT_ERRORS, retry_server_errors=True
+    )
+
+    assert default_policy.is_retryable(BusyError(503))
+    assert not default_policy.is_retryable(TimeoutError(408))
+    assert not default_policy.is_retryable(RuntimeError(500, "error"))
+    assert transient_policy.is_retryable(TimeoutError(408))
+    assert transient_policy.is_retryable(ConnectionResetError())
+    assert transient_policy.is_retryable(requests.exceptions.ConnectionError())
+    assert transient_policy.is_retryable(requests.exceptions.ReadTimeout())
+    assert transient_policy.is_retryable(aiohttp.ServerDisconnectedError())
+    assert transient_policy.is_retryable(RuntimeError(502, "bad gateway"))
+    assert not transient_policy.is_retryable(RuntimeError(404, "not found"))
+    assert not transient_policy.is_retryable(ValueError(400, "bad request"))
+
+
+def test_limited_concurrency_client_retries_configured_errors() -> None:
+    expected_completion = EMPTY_COMPLETION
+    failing_client = FailingOnceClient(
+        requests.exceptions.ConnectionError("Connection refused"), expected_completion
+    )
+    limited_concurrency_client = LimitedConcurrencyClient(
+        cast(AlephAlphaClientProtocol, failing_client),
+        retry_policy=RetryPolicy(
+            retryable_exceptions=TRANSIENT_ERRORS, base_delay=0.01
+        ),
+    )
+
+    completion = limited_concurrency_client.complete(
+        CompletionRequest(prompt=Prompt("")), "model"
+    )
+
+    assert completion == expected_completion
+
+
+def test_limited_concurrency_client_releases_slot_during_back_off() -> None:
+    expected_completion = EMPTY_COMPLETION
+    busy_client = BusyClient(return_value=expected_completion)
+    limited_concurrency_client = LimitedConcurrencyClient(
+        cast(AlephAlphaClientProtocol, busy_client),
+        max_concurrency=1,
+        retry_policy=RetryPolicy(base_delay=1),
+    )
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        backing_off = executor.submit(
+            limited_concurrency_client.complete,
+            CompletionRequest(prompt=Prompt("")),
+            "model",
+        )
+        sleep(0.1)
+        start = time.monotonic()
+        limited_concurrency_client.complete(
+            CompletionRequest(prompt=Prompt("")), "model"
+        )
+        # the second request does not wait for the back-off of the first one
+        assert time.monotonic() - start < 0.5
+        assert backing_off.result() == expected_completion
@@ -1,12 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import cast
+
 import pytest
 from lingua import Language as LinguaLanguage
 
 from pharia_inference_sdk.core import (
     DetectLanguage,
+    DetectLanguageBatch,
+    DetectLanguageBatchInput,
     DetectLanguageInput,
+    InMemoryTracer,
     Language,
     NoOpTracer,
 )
+from pharia_inference_sdk.core.detect_language import (
+    AnnotatedLanguage,
+    _language_detectors_lock,
+)
 
 
 @pytest.mark.parametrize(
@@ -78,3 +88,71 @@ def test_conversion_to_lingua_works() -> None:
     converted_language = language.to_lingua_language()
 
     assert converted_language == expected_language
+
+
+def test_detect_language_instances_share_detector() -> None:
+    task = DetectLanguage()
+
+    assert task._detector() is DetectLanguage()._detector()
+    assert task._detector() is not DetectLanguage(low_accuracy=True)._detector()
+
+
+def test_built_detectors_are_returned_while_another_detector_is_built() -> None:
+    task = DetectLanguage()
+    detector = task._detector()
+
+    # cache hits must not wait for the lock, which guards the builds of detectors
+    with _language_detectors_lock, ThreadPoolExecutor(1) as executor:
+        assert executor.submit(task._detector).result(timeout=5) is detector
+
+
+def test_detect_language_works_in_low_accuracy_mode() -> None:
+    task = DetectLanguage(low_accuracy=True)
+    input = DetectLanguageInput(
+        text="Hallo, mein Name ist Niklas. Ich arbeite mit Pit an diesem Stück zur Spracherkennung.",
+        possible_languages=[Language(lang) for lang in ["en", "de"]],
+    )
+
+    assert task.run(input, NoOpTracer()).best_fit == Language("de")
+
+
+def test_detect_language_batch_detects_languages_of_all_texts_in_one_span() -> None:
+    texts = [
+        "Hello, my name is Niklas. I am working with Pit on this language detection piece.",
+        "Hallo, mein Name ist Niklas. Ich arbeite mit Pit an diesem Stück zur Spracherkennung.",
+        "Bonjour, je m'appelle Niklas. Je travaille avec Pit sur cette pièce de détection de langue.",
+        "",
+    ]
+    tracer = InMemoryTracer()
+
+    output = DetectLanguageBatch().run(
+        DetectLanguageBatchInput(
+            texts=texts, possible_languages=[Language("en"), Language("de")]
+        ),
+        tracer,
+    )
+
+    assert output.best_fits == [Language("en"), Language("de"), None, None]
+    assert len(tracer.entries) == 1
+
+
+def test_detect_language_restricted_to_possible_languages_only_scores_those() -> None:
+    text = "Je m’appelle Jessica. Je suis une fille, je suis française et j’ai treize ans."  # codespell:ignore
+    possible_languages = [Language(lang) for lang in ["en", "de"]]
+    task = DetectLanguage(restrict_to_possible_languages=True)
+    tracer = InMemoryTracer()
+
+    output = task.run(
+        DetectLanguageInput(text=text, possible_languages=possible_languages), tracer
+    )
+
+    assert output.best_fit in possible_languages
+    assert task._detector(possible_languages) is task._detector(
+        list(reversed(possible_languages))
+    )
+    assert task._detector(possible_languages) is not task._detector()
+    logged_languages = cast(
+        list[AnnotatedLanguage],
+        tracer.entries[0].entries[0].value,  # type: ignore
+    )
+    assert {language.lang for language in logged_languages} == set(possible_languages)
@@ -1,15 +1,33 @@
-from collections.abc import Sequence
-from typing import Literal
+import time
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Literal, Optional, cast
 
 import tokenizers  # type: ignore
-from aleph_alpha_client import CompletionResponse, Prompt, Text, Tokens
+from aleph_alpha_client import (
+    CompletionRequest,
+    CompletionResponse,
+    Prompt,
+    Text,
+    Tokens,
+)
 from aleph_alpha_client.completion import CompletionResult
 from pytest import fixture
 
 from pharia_inference_sdk.connectors.limited_concurrency_client import (
     AlephAlphaClientProtocol,
 )
-from pharia_inference_sdk.core import MAX_CONCURRENCY, NoOpTracer, Task, TaskSpan, Token
+from pharia_inference_sdk.core import (
+    MAX_CONCURRENCY,
+    InMemoryTaskSpan,
+    InMemoryTracer,
+    LogEntry,
+    NoOpTracer,
+    Task,
+    TaskSpan,
+    Token,
+)
 from pharia_inference_sdk.core.echo import Echo, EchoInput, TokenWithLogProb
 from pharia_inference_sdk.core.model import (
     AlephAlphaModel,
@@ -18,6 +36,7 @@ from pharia_inference_sdk.core.model import (
     ControlModel,
     LuminousControlModel,
 )
+from tests.conftest import word_level_tokenizer
 
 
 @fixture
@@ -152,3 +171,117 @@ def test_run_concurrently_produces_proper_completion_prompts(
     echo_task = Echo(FakeCompleteTaskModel("luminous-base-control", client))
     # if this test fails in CI you may need to increase the 50 to 1000 to reproduce this locally
     echo_task.run_concurrently([echo_input] * MAX_CONCURRENCY * 50, NoOpTracer())
+
+
+def byte_level_tokenizer() -> tokenizers.Tokenizer:
+    tokenizer = tokenizers.Tokenizer(tokenizers.models.BPE())
+    tokenizer.pre_tokenizer = tokenizers.pre_tokenizers.ByteLevel(add_prefix_space=True)
+    tokenizer.decoder = tokenizers.decoders.ByteLevel()
+    tokenizer.train_from_iterator(
+        ["The weather is good. Gastronomie für Babys."] * 10,
+        tokenizers.trainers.BpeTrainer(
+            vocab_size=300,
+            initial_alphabet=tokenizers.pre_tokenizers.ByteLevel.alphabet(),
+        ),
+    )
+    return tokenizer
+
+
+class SlowEchoClient:
+    def __init__(self, tokenizer: Optional[tokenizers.Tokenizer] = None) -> None:
+        self.number_of_completions = 0
+        self._lock = Lock()
+        self._tokenizer = tokenizer or word_level_tokenizer("good", "bad")
+
+    def models(self) -> Sequence[Mapping[str, Any]]:
+        return [{"name": "model", "max_context_size": 2048}]
+
+    def tokenizer(self, model: str) -> tokenizers.Tokenizer:
+        return self._tokenizer
+
+    def complete(self, request: CompletionRequest, model: str) -> CompletionResponse:
+        with self._lock:
+            self.number_of_completions += 1
+        time.sleep(0.2)
+        token_ids = cast(Tokens, request.prompt.items[1]).tokens
+        return CompletionResponse(
+            "version",
+            completions=[
+                CompletionResult(
+                    log_probs=[
+                        {self._tokenizer.decode([token_id]): -0.5}
+                        for token_id in token_ids
+                    ]
+                )
+            ],
+            num_tokens_generated=0,
+            num_tokens_prompt_total=0,
+        )
+
+
+def test_concurrent_identical_echos_share_one_request() -> None:
+    client = SlowEchoClient()
+    echo_task = Echo(AlephAlphaModel("model", cast(AlephAlphaClientProtocol, client)))
+    inputs = [
+        EchoInput(
+            prompt=Prompt.from_text("The weather is"), expected_completion=candidate
+        )
+        for candidate in ["good", "bad"] * 5
+    ]
+
+    outputs = echo_task.run_concurrently(inputs, NoOpTracer())
+
+    assert client.number_of_completions == 2
+    assert [
+        [token.token.token for token in output.tokens_with_log_probs]
+        for output in outputs
+    ] == [["good"], ["bad"]] * 5
+
+
+def test_coalesced_echos_are_traced_for_every_caller() -> None:
+    client = SlowEchoClient()
+    model = AlephAlphaModel("model", cast(AlephAlphaClientProtocol, client))
+    tracers = [InMemoryTracer() for _ in range(4)]
+
+    with ThreadPoolExecutor(max_workers=len(tracers)) as executor:
+        list(
+            executor.map(
+                lambda tracer: model.echo("The weather is", "good", tracer), tracers
+            )
+        )
+
+    assert client.number_of_completions == 1
+    task_spans = [tracer.entries for tracer in tracers]
+    assert all(
+        len(entries) == 1
+        and isinstance(entries[0], InMemoryTaskSpan)
+        and entries[0].name == "_Complete"
+        for entries in task_spans
+    )
+    coalesced = [
+        any(
+            isinstance(entry, LogEntry) and entry.message == "Coalesced request"
+            for entry in cast(InMemoryTaskSpan, entries[0]).entries
+        )
+        for entries in task_spans
+    ]
+    assert sorted(coalesced) == [False, True, True, True]
+
+
+def test_echo_decodes_each_token_like_the_tokenizer() -> None:
+    tokenizer = byte_level_tokenizer()
+    model = AlephAlphaModel(
+        "model", cast(AlephAlphaClientProtocol, SlowEchoClient(tokenizer))
+    )
+    expected_completion = " good. Gastronomie für Babys ✓"
+
+    echo_output = model.echo("The weather is", expected_completion, NoOpTracer())
+
+    encoding = model.get_tokenizer_no_whitespace_prefix().encode(expected_completion)
+    assert [token for token, _ in echo_output] == [
+        Token(
+            token=tokenizer.decode([token_id], skip_special_tokens=False),
+            token_id=token_id,
+        )
+        for token_id in encoding.ids
+    ]
@@ -0,0 +1,56 @@
+import subprocess
+import sys
+
+import pytest
+
+import pharia_inference_sdk.core
+import pharia_inference_sdk.core.tracer
+
+HEAVY_MODULES = [
+    "lingua",
+    "semantic_text_splitter",
+    "rich",
+    "opentelemetry",
+    "pycountry",
+]
+
+
+def modules_loaded_by(statement: str) -> set[str]:
+    """Runs `statement` in a fresh interpreter, as imports are cached per process."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys\n{statement}\nprint(' '.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {module.split(".")[0] for module in result.stdout.split()}
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import pharia_inference_sdk.core",
+        "from pharia_inference_sdk.core import AlephAlphaModel, CompleteInput, NoOpTracer",
+        "from pharia_inference_sdk.core.tracer import FileTracer",
+    ],
+)
+def test_importing_core_does_not_load_heavy_dependencies(statement: str) -> None:
+    assert modules_loaded_by(statement).isdisjoint(HEAVY_MODULES)
+
+
+def test_importing_the_core_package_does_not_load_the_client() -> None:
+    assert "aleph_alpha_client" not in modules_loaded_by(
+        "import pharia_inference_sdk.core"
+    )
+
+
+@pytest.mark.parametrize(
+    "package", [pharia_inference_sdk.core, pharia_inference_sdk.core.tracer]
+)
+def test_all_lazy_members_can_be_imported(package: object) -> None:
+    for name in package.__all__:  # type: ignore[attr-defined]
+        assert getattr(package, name) is not None
@@ -0,0 +1,115 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, cast
+
+import pytest
+from aleph_alpha_client import CompletionRequest, CompletionResponse, Prompt
+from aleph_alpha_client.completion import CompletionResult
+from pytest import fixture
+from tokenizers import Tokenizer  # type: ignore
+
+from pharia_inference_sdk.connectors.limited_concurrency_client import (
+    AlephAlphaClientProtocol,
+)
+from pharia_inference_sdk.core import (
+    AlephAlphaModel,
+    CompleteInput,
+    ContextOverflowPolicy,
+    ContextWindowExceededError,
+    Instruct,
+    InstructInput,
+    Llama3InstructModel,
+    NoOpTracer,
+    global_model_catalogue,
+)
+from tests.conftest import word_level_tokenizer
+
+
+class ContextSizeClient:
+    def __init__(self, context_size: int) -> None:
+        self.context_size = context_size
+        self.requests: list[CompletionRequest] = []
+
+    def models(self) -> Sequence[Mapping[str, Any]]:
+        return [
+            {"name": name, "max_context_size": self.context_size}
+            for name in ["model", "llama-3.1-8b-instruct"]
+        ]
+
+    def tokenizer(self, model: str) -> Tokenizer:
+        return word_level_tokenizer()
+
+    def complete(self, request: CompletionRequest, model: str) -> CompletionResponse:
+        self.requests.append(request)
+        return CompletionResponse(
+            model_version="model-version",
+            completions=[CompletionResult(completion="completion")],
+            num_tokens_generated=1,
+            num_tokens_prompt_total=1,
+        )
+
+
+@fixture
+def client() -> ContextSizeClient:
+    return ContextSizeClient(context_size=8)
+
+
+def model(client: ContextSizeClient, policy: ContextOverflowPolicy) -> AlephAlphaModel:
+    return AlephAlphaModel(
+        "model",
+        cast(AlephAlphaClientProtocol, client),
+        context_overflow_policy=policy,
+    )
+
+
+def test_complete_raises_before_calling_the_api_if_context_is_exceeded(
+    client: ContextSizeClient,
+) -> None:
+    input = CompleteInput(
+        prompt=Prompt.from_text("hello world hello"), maximum_tokens=6
+    )
+
+    with pytest.raises(ContextWindowExceededError):
+        model(client, ContextOverflowPolicy.RAISE).complete(input, NoOpTracer())
+
+    assert client.requests == []
+
+
+def test_complete_shrinks_maximum_tokens_to_fit_context(
+    client: ContextSizeClient,
+) -> None:
+    input = CompleteInput(
+        prompt=Prompt.from_text("hello world hello"), maximum_tokens=6
+    )
+
+    model(client, ContextOverflowPolicy.SHRINK_MAXIMUM_TOKENS).complete(
+        input, NoOpTracer()
+    )
+
+    assert client.requests[0].maximum_tokens == 5
+
+
+@pytest.mark.parametrize(
+    ("policy", "expected_input"),
+    [
+        (ContextOverflowPolicy.TRUNCATE_INPUT_LEFT, "world world"),
+        (ContextOverflowPolicy.TRUNCATE_INPUT_RIGHT, "hello hello"),
+    ],
+)
+def test_instruct_truncates_input_to_fit_context(
+    policy: ContextOverflowPolicy, expected_input: str
+) -> None:
+    client = ContextSizeClient(context_size=0)
+    instruct_model = Llama3InstructModel(client=cast(AlephAlphaClientProtocol, client))
+    fitting_prompt = instruct_model.to_instruct_prompt("Say hello", "hello world")
+    client.context_size = instruct_model.count_prompt_tokens(fitting_prompt) + 4
+    global_model_catalogue.refresh(cast(AlephAlphaClientProtocol, client))
+
+    Instruct(instruct_model, policy).run(
+        InstructInput(
+            instruction="Say hello", input="hello hello world world", maximum_tokens=4
+        ),
+        NoOpTracer(),
+    )
+
+    expected_prompt = instruct_model.to_instruct_prompt("Say hello", expected_input)
+    assert client.requests[0].prompt.items == expected_prompt.items
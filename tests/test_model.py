@@ -11,6 +11,7 @@ from aleph_alpha_client import (
     TextControl,
 )
 from pytest import fixture
+from tokenizers import Tokenizer  # type: ignore
 
 from pharia_inference_sdk.connectors.limited_concurrency_client import (
     AlephAlphaClientProtocol,
@@ -26,9 +27,11 @@ from pharia_inference_sdk.core import (
     Message,
     NoOpTracer,
     Pharia1ChatModel,
+    global_model_catalogue,
+    global_tokenizer_registry,
 )
-from pharia_inference_sdk.core.model import _cached_context_size, _cached_tokenizer
 from pharia_inference_sdk.core.prompt_template import PromptRange, PromptTemplate
+from tests.conftest import word_level_tokenizer
 
 INSTRUCTION = "Who likes pizza?"
 INPUT = "Marc and Jessica had pizza together. However, Marc hated it. He only agreed to the date because Jessica likes pizza so much."
@@ -318,7 +321,7 @@ def test_tokenizer_caching_works() -> None:
     yet_same_tokenizer = another_model_instance.get_tokenizer()
     assert tokenizer is yet_same_tokenizer
 
-    _cached_tokenizer.cache_clear()
+    global_tokenizer_registry.clear()
     different_tokenizer = another_model_instance.get_tokenizer()
     assert tokenizer is not different_tokenizer
 
@@ -334,11 +337,30 @@ def test_context_size_caching_works() -> None:
     yet_same_result = another_model_instance.context_size
     assert context_size is yet_same_result
 
-    _cached_context_size.cache_clear()
+    global_model_catalogue.clear()
     different_result = another_model_instance.context_size
     assert context_size is not different_result
 
 
+class LocalTokenizerClient(DummyModelClient):
+    def tokenizer(self, model: str) -> Tokenizer:  # type: ignore
+        return word_level_tokenizer()
+
+
+def test_batch_tokenization_matches_tokenize() -> None:
+    model = AlephAlphaModel("model", client=LocalTokenizerClient())  # type: ignore
+    texts = ["hello world", "", "hello unknown world hello"]
+
+    token_ids = model.tokenize_batch(texts)
+    token_counts = model.count_tokens_batch(texts)
+
+    assert [list(ids) for ids in token_ids] == [
+        model.tokenize(text).ids for text in texts
+    ]
+    assert list(token_counts) == [2, 0, 4]
+    assert all(ids.typecode == "I" for ids in token_ids)
+
+
 def test_chat_model_can_produce_chat_prompt() -> None:
     client = DummyModelClient()  # type: ignore
     model = Llama3ChatModel("llama-3.1-8b-instruct", client)
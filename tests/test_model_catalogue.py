@@ -0,0 +1,91 @@
+import time
+from collections.abc import Mapping, Sequence
+from threading import Event
+from typing import Any, cast
+
+import pytest
+
+from pharia_inference_sdk.connectors.limited_concurrency_client import (
+    AlephAlphaClientProtocol,
+)
+from pharia_inference_sdk.core import AlephAlphaModel, ModelCatalogue
+
+
+class ModelsClient:
+    """Unhashable client that counts how often the models are fetched."""
+
+    __hash__ = None  # type: ignore
+
+    def __init__(self) -> None:
+        self.number_of_fetches = 0
+        self.fetched = Event()
+
+    def models(self) -> Sequence[Mapping[str, Any]]:
+        self.number_of_fetches += 1
+        self.fetched.set()
+        return [{"name": "model", "max_context_size": 1000 * self.number_of_fetches}]
+
+
+class UnreferenceableModelsClient:
+    """Client that cannot be weakly referenced."""
+
+    __slots__ = ()
+
+    def models(self) -> Sequence[Mapping[str, Any]]:
+        return [{"name": "model", "max_context_size": 1000}]
+
+
+def test_model_catalogue_fetches_models_once() -> None:
+    catalogue = ModelCatalogue()
+    client = cast(AlephAlphaClientProtocol, ModelsClient())
+
+    assert catalogue.context_size(client, "model") == 1000
+    assert catalogue.model_info(client, "model") is not None
+    assert catalogue.model_info(client, "other-model") is None
+    assert cast(ModelsClient, client).number_of_fetches == 1
+
+
+def test_model_catalogue_refreshes_stale_models_in_background() -> None:
+    catalogue = ModelCatalogue(ttl=0.01)
+    models_client = ModelsClient()
+    client = cast(AlephAlphaClientProtocol, models_client)
+    catalogue.models(client)
+    models_client.fetched.clear()
+    time.sleep(0.02)
+
+    assert catalogue.context_size(client, "model") == 1000
+    assert models_client.fetched.wait(timeout=5)
+    deadline = time.monotonic() + 5
+    while catalogue.context_size(client, "model") != 2000:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_model_catalogue_drops_unreferenceable_clients_once_models_expired() -> None:
+    catalogue = ModelCatalogue(ttl=0.01)
+    for _ in range(10):
+        catalogue.models(cast(AlephAlphaClientProtocol, UnreferenceableModelsClient()))
+    time.sleep(0.02)
+
+    client = cast(AlephAlphaClientProtocol, UnreferenceableModelsClient())
+    catalogue.models(client)
+
+    assert list(catalogue._strong_clients.values()) == [client]
+    assert list(catalogue._models) == [id(client)]
+
+
+def test_model_catalogue_raises_for_unknown_model() -> None:
+    with pytest.raises(ValueError):
+        ModelCatalogue().context_size(
+            cast(AlephAlphaClientProtocol, ModelsClient()), "other-model"
+        )
+
+
+def test_constructing_models_does_not_fetch_models_again() -> None:
+    models_client = ModelsClient()
+    client = cast(AlephAlphaClientProtocol, models_client)
+
+    for _ in range(3):
+        assert AlephAlphaModel("model", client).context_size == 1000
+
+    assert models_client.number_of_fetches == 1
@@ -0,0 +1,239 @@
+import time
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, cast
+
+from aleph_alpha_client import (
+    CompletionRequest,
+    CompletionResponse,
+    ExplanationRequest,
+    ExplanationResponse,
+    Prompt,
+)
+from aleph_alpha_client.completion import CompletionResult
+from pytest import fixture
+
+from pharia_inference_sdk.connectors.limited_concurrency_client import (
+    AlephAlphaClientProtocol,
+)
+from pharia_inference_sdk.core import (
+    AlephAlphaModel,
+    CompleteInput,
+    ExplainInput,
+    InMemoryResponseCache,
+    InMemoryTracer,
+    LogEntry,
+    NoOpTracer,
+    SqliteResponseCache,
+    TaskSpan,
+)
+from pharia_inference_sdk.core.model import _explanation_response_to_json
+from pharia_inference_sdk.core.response_cache import (
+    completion_cache_key,
+    explanation_cache_key,
+    is_deterministic,
+)
+
+EXPLANATION_RESPONSE_JSON = {
+    "model_version": "model-version",
+    "explanations": [
+        {
+            "target": " pizza",
+            "items": [
+                {"type": "text", "scores": [{"start": 0, "length": 7, "score": 0.5}]},
+                {
+                    "type": "image",
+                    "scores": [
+                        {
+                            "rect": {
+                                "left": 0.0,
+                                "top": 0.0,
+                                "width": 0.5,
+                                "height": 1.0,
+                            },
+                            "score": 0.25,
+                        }
+                    ],
+                },
+                {"type": "token_ids", "scores": [0.1, 0.2]},
+                {"type": "target", "scores": [{"start": 0, "length": 1, "score": 0.0}]},
+            ],
+        }
+    ],
+}
+
+
+class CompletionCountingClient:
+    def __init__(self) -> None:
+        self.number_of_completions = 0
+        self.number_of_explanations = 0
+
+    def models(self) -> Sequence[Mapping[str, Any]]:
+        return [{"name": "model", "max_context_size": 2048}]
+
+    def complete(self, request: CompletionRequest, model: str) -> CompletionResponse:
+        self.number_of_completions += 1
+        return CompletionResponse(
+            model_version="model-version",
+            completions=[
+                CompletionResult(completion=f"completion {self.number_of_completions}")
+            ],
+            num_tokens_generated=2,
+            num_tokens_prompt_total=1,
+        )
+
+    def explain(self, request: ExplanationRequest, model: str) -> ExplanationResponse:
+        self.number_of_explanations += 1
+        return ExplanationResponse.from_json(EXPLANATION_RESPONSE_JSON)
+
+
+@fixture
+def counting_client() -> CompletionCountingClient:
+    return CompletionCountingClient()
+
+
+def test_in_memory_response_cache_evicts_least_recently_used() -> None:
+    cache = InMemoryResponseCache(max_size=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+
+    cache.put("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.stats().hits == 3
+    assert cache.stats().misses == 1
+
+
+def test_in_memory_response_cache_expires_entries() -> None:
+    cache = InMemoryResponseCache(ttl=0.01)
+    cache.put("a", "1")
+
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+
+
+def test_sqlite_response_cache_persists_entries(tmp_path: Path) -> None:
+    cache = SqliteResponseCache(tmp_path / "cache.sqlite")
+    cache.put("a", "1")
+    cache.close()
+
+    assert SqliteResponseCache(tmp_path / "cache.sqlite").get("a") == "1"
+
+
+def test_sqlite_response_cache_evicts_and_expires_entries(tmp_path: Path) -> None:
+    cache = SqliteResponseCache(tmp_path / "cache.sqlite", max_size=2, ttl=60)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.put("c", "3")
+
+    assert cache.get("a") is None
+    assert cache.get("c") == "3"
+
+    expiring_cache = SqliteResponseCache(tmp_path / "expiring.sqlite", ttl=0.01)
+    expiring_cache.put("a", "1")
+    time.sleep(0.02)
+    assert expiring_cache.get("a") is None
+
+
+def test_completion_cache_key_depends_on_request_and_model() -> None:
+    request = CompletionRequest(prompt=Prompt.from_text("Hello"), maximum_tokens=5)
+
+    assert completion_cache_key(request, "model") == completion_cache_key(
+        CompletionRequest(prompt=Prompt.from_text("Hello"), maximum_tokens=5), "model"
+    )
+    assert completion_cache_key(request, "model") != completion_cache_key(
+        request, "other-model"
+    )
+    assert completion_cache_key(request, "model") != completion_cache_key(
+        CompletionRequest(prompt=Prompt.from_text("Hello"), maximum_tokens=6), "model"
+    )
+
+
+def test_only_requests_without_sampling_are_deterministic() -> None:
+    prompt = Prompt.from_text("Hello")
+
+    assert is_deterministic(CompletionRequest(prompt=prompt))
+    assert not is_deterministic(CompletionRequest(prompt=prompt, temperature=0.7))
+    assert not is_deterministic(CompletionRequest(prompt=prompt, top_p=0.9))
+
+
+def test_model_serves_repeated_completions_from_cache(
+    counting_client: CompletionCountingClient,
+) -> None:
+    model = AlephAlphaModel(
+        "model",
+        cast(AlephAlphaClientProtocol, counting_client),
+        completion_cache=InMemoryResponseCache(),
+    )
+    input = CompleteInput(prompt=Prompt.from_text("Hello"))
+    tracer = InMemoryTracer()
+
+    first_output = model.complete(input, NoOpTracer())
+    second_output = model.complete(input, tracer)
+
+    assert counting_client.number_of_completions == 1
+    assert first_output == second_output
+    task_span = tracer.entries[0]
+    assert isinstance(task_span, TaskSpan)
+    cache_logs = [
+        entry
+        for entry in task_span.entries
+        if isinstance(entry, LogEntry) and entry.message == "Completion cache"
+    ]
+    assert cache_logs[0].value == {"hit": True, "hits": 1, "misses": 1}
+
+
+def test_model_does_not_cache_sampled_completions(
+    counting_client: CompletionCountingClient,
+) -> None:
+    model = AlephAlphaModel(
+        "model",
+        cast(AlephAlphaClientProtocol, counting_client),
+        completion_cache=InMemoryResponseCache(),
+    )
+    input = CompleteInput(prompt=Prompt.from_text("Hello"), temperature=0.5)
+
+    model.complete(input, NoOpTracer())
+    model.complete(input, NoOpTracer())
+
+    assert counting_client.number_of_completions == 2
+
+
+def test_explanation_response_serialization_round_trips() -> None:
+    response = ExplanationResponse.from_json(EXPLANATION_RESPONSE_JSON)
+
+    assert _explanation_response_to_json(response) == EXPLANATION_RESPONSE_JSON
+
+
+def test_explanation_cache_key_differs_from_completion_cache_key() -> None:
+    prompt = Prompt.from_text("Hello")
+
+    assert explanation_cache_key(
+        ExplanationRequest(prompt=prompt, target=" world"), "model"
+    ) != explanation_cache_key(
+        ExplanationRequest(prompt=prompt, target=" there"), "model"
+    )
+    assert explanation_cache_key(
+        ExplanationRequest(prompt=prompt, target=""), "model"
+    ) != completion_cache_key(CompletionRequest(prompt=prompt), "model")
+
+
+def test_model_serves_repeated_explanations_from_cache(
+    counting_client: CompletionCountingClient,
+) -> None:
+    model = AlephAlphaModel(
+        "model",
+        cast(AlephAlphaClientProtocol, counting_client),
+        explanation_cache=InMemoryResponseCache(),
+    )
+    input = ExplainInput(prompt=Prompt.from_text("I like"), target=" pizza")
+
+    first_output = model.explain(input, NoOpTracer())
+    second_output = model.explain(input, NoOpTracer())
+
+    assert counting_client.number_of_explanations == 1
+    assert first_output == second_output
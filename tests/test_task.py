@@ -1,11 +1,13 @@
-from collections.abc import Callable
+import asyncio
+from collections.abc import Callable, Iterator
 from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
-from threading import Lock
+from threading import Lock, get_ident
 from time import sleep
 
 from pharia_inference_sdk.core import (
     MAX_CONCURRENCY,
+    ConcurrencyBudget,
     InMemoryTracer,
     NoOpTracer,
     Task,
@@ -32,6 +34,22 @@ class ConcurrencyCounter(Task[None, None]):
             self.concurrency_counter -= 1
 
 
+class AsyncConcurrencyCounter(Task[None, None]):
+    max_concurrency_counter: int = 0
+    concurrency_counter: int = 0
+
+    def do_run(self, input: None, task_span: TaskSpan) -> None:
+        raise AssertionError("do_run_async should be used")
+
+    async def do_run_async(self, input: None, task_span: TaskSpan) -> None:
+        self.concurrency_counter += 1
+        self.max_concurrency_counter = max(
+            self.max_concurrency_counter, self.concurrency_counter
+        )
+        await asyncio.sleep(0.01)
+        self.concurrency_counter -= 1
+
+
 class DeadlockDetector(Task[None, None]):
     def __init__(self) -> None:
         super().__init__()
@@ -60,6 +78,25 @@ class InnerTask(Task[None, None]):
         pass
 
 
+class ThreadRecorder(Task[None, None]):
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.thread_ids: set[int] = set()
+
+    def do_run(self, input: None, task_span: TaskSpan) -> None:
+        with self.lock:
+            self.thread_ids.add(get_ident())
+        sleep(0.001)
+
+
+class NestedConcurrentTask(Task[None, None]):
+    def __init__(self, inner_task: Task[None, None]) -> None:
+        self.inner_task = inner_task
+
+    def do_run(self, input: None, task_span: TaskSpan) -> None:
+        self.inner_task.run_concurrently([None] * MAX_CONCURRENCY, task_span)
+
+
 def dummy_decorator(
     f: Callable[["BaseTask", None, TaskSpan], None],
 ) -> Callable[["BaseTask", None, TaskSpan], None]:
@@ -107,6 +144,139 @@ def test_run_concurrently_does_not_deadlock_if_nested() -> None:
     task.run_concurrently([None] * MAX_CONCURRENCY, NoOpTracer())
 
 
+def test_run_concurrently_shares_threads_if_nested() -> None:
+    inner_task = ThreadRecorder()
+    task = NestedConcurrentTask(inner_task)
+
+    task.run_concurrently([None] * MAX_CONCURRENCY, NoOpTracer())
+
+    # only the slots of the global budget, the calling thread just waits
+    assert len(inner_task.thread_ids) <= MAX_CONCURRENCY
+    assert get_ident() not in inner_task.thread_ids
+
+
+def test_run_concurrently_shares_budget_between_calling_threads() -> None:
+    task = ConcurrencyCounter()
+
+    with ThreadPoolExecutor(max_workers=30) as executor:
+        for _ in executor.map(
+            lambda _: task.run_concurrently([None] * 40, NoOpTracer()), range(30)
+        ):
+            pass
+
+    assert task.max_concurrency_counter <= MAX_CONCURRENCY
+
+
+def test_run_concurrently_preserves_order_of_outputs() -> None:
+    class Identity(Task[int, int]):
+        def do_run(self, input: int, task_span: TaskSpan) -> int:
+            sleep(0.001 * (input % 3))
+            return input
+
+    inputs = list(range(MAX_CONCURRENCY * 3))
+
+    assert Identity().run_concurrently(inputs, NoOpTracer()) == inputs
+
+
+class FailOnOdd(Task[int, int]):
+    def do_run(self, input: int, task_span: TaskSpan) -> int:
+        if input % 2:
+            raise ValueError(f"odd input {input}")
+        return input
+
+
+def test_run_concurrently_iter_yields_outputs_and_exceptions() -> None:
+    results = dict(
+        FailOnOdd().run_concurrently_iter(range(MAX_CONCURRENCY * 2), NoOpTracer())
+    )
+
+    assert sorted(results) == list(range(MAX_CONCURRENCY * 2))
+    for index, result in results.items():
+        if index % 2:
+            assert isinstance(result, ValueError)
+        else:
+            assert result == index
+
+
+def test_run_concurrently_iter_reads_inputs_lazily() -> None:
+    consumed = 0
+
+    def inputs() -> Iterator[int]:
+        nonlocal consumed
+        for input in range(1000):
+            consumed += 1
+            yield input * 2
+
+    limit = 4
+    results = FailOnOdd().run_concurrently_iter(inputs(), NoOpTracer(), limit)
+    first_index, first_output = next(results)
+    results.close()
+
+    assert first_output == first_index * 2
+    assert consumed <= limit + 1
+
+
+def test_run_concurrently_isolated_captures_errors_per_input() -> None:
+    results = FailOnOdd().run_concurrently_isolated(range(10), NoOpTracer())
+
+    assert [result.output for result in results if not result.failed] == [
+        0,
+        2,
+        4,
+        6,
+        8,
+    ]
+    failed = [result for result in results if result.failed]
+    assert len(failed) == 5
+    assert failed[0].error
+    assert failed[0].error.error_type == "ValueError"
+    assert failed[0].error.message == "odd input 1"
+
+
+def test_run_concurrently_isolated_retries_failed_inputs() -> None:
+    class FailsOnce(Task[int, int]):
+        def __init__(self) -> None:
+            self.lock = Lock()
+            self.failed_inputs: set[int] = set()
+
+        def do_run(self, input: int, task_span: TaskSpan) -> int:
+            with self.lock:
+                if input not in self.failed_inputs:
+                    self.failed_inputs.add(input)
+                    raise RuntimeError("transient")
+            return input
+
+    results = FailsOnce().run_concurrently_isolated(
+        range(5), NoOpTracer(), max_retries=1
+    )
+
+    assert [result.output for result in results] == list(range(5))
+    assert all(result.attempts == 2 for result in results)
+    assert not any(result.failed for result in results)
+
+
+def test_concurrency_budget_reports_metrics() -> None:
+    budget = ConcurrencyBudget(2)
+    observed_active: list[int] = []
+
+    def observe(input: int) -> int:
+        observed_active.append(budget.metrics().active)
+        sleep(0.01)
+        return input
+
+    results = dict(
+        (index, future.result())
+        for index, future in budget.map_unordered(observe, range(10), 5)
+    )
+
+    assert results == {index: index for index in range(10)}
+    assert max(observed_active) <= 2
+    metrics = budget.metrics()
+    assert metrics.max_concurrency == 2
+    assert metrics.active == metrics.queued == metrics.inline == 0
+    assert metrics.utilisation == 0
+
+
 def test_sub_tasks_do_not_introduce_multiple_task_spans() -> None:
     tracer = InMemoryTracer()
 
@@ -116,3 +286,50 @@ def test_sub_tasks_do_not_introduce_multiple_task_spans() -> None:
     assert isinstance(tracer.entries[0], TaskSpan)
     assert tracer.entries[0].entries
     assert not isinstance(tracer.entries[0].entries[0], TaskSpan)
+
+
+async def test_run_async_uses_do_run_async() -> None:
+    task = AsyncConcurrencyCounter()
+
+    await task.run_async(None, NoOpTracer())
+
+    assert task.max_concurrency_counter == 1
+
+
+async def test_run_async_falls_back_to_do_run() -> None:
+    tracer = InMemoryTracer()
+
+    await SubTask().run_async(None, tracer)
+
+    assert isinstance(tracer.entries[0], TaskSpan)
+    assert tracer.entries[0].entries
+
+
+async def test_run_concurrently_async_is_limited() -> None:
+    task = AsyncConcurrencyCounter()
+    limit_concurrency = MAX_CONCURRENCY // 2
+
+    outputs = await task.run_concurrently_async(
+        [None] * MAX_CONCURRENCY * 3, NoOpTracer(), limit_concurrency
+    )
+
+    assert len(outputs) == MAX_CONCURRENCY * 3
+    assert task.max_concurrency_counter == limit_concurrency
+
+
+async def test_run_concurrently_async_falls_back_to_threads() -> None:
+    task = ConcurrencyCounter()
+
+    await task.run_concurrently_async([None] * MAX_CONCURRENCY, NoOpTracer(), 5)
+
+    assert task.max_concurrency_counter == 5
+
+
+async def test_run_concurrently_async_falls_back_to_global_budget() -> None:
+    task = ConcurrencyCounter()
+
+    await task.run_concurrently_async(
+        [None] * MAX_CONCURRENCY * 3, NoOpTracer(), MAX_CONCURRENCY * 3
+    )
+
+    assert task.max_concurrency_counter == MAX_CONCURRENCY
@@ -0,0 +1,82 @@
+import gc
+from pathlib import Path
+
+from tokenizers import Tokenizer  # type: ignore
+
+from pharia_inference_sdk.core import TokenizerRegistry
+from tests.conftest import word_level_tokenizer
+
+
+class TokenizerClient:
+    """Unhashable client that counts how often tokenizers are fetched."""
+
+    __hash__ = None  # type: ignore
+
+    def __init__(self) -> None:
+        self.fetched: list[str] = []
+
+    def tokenizer(self, model: str) -> Tokenizer:
+        self.fetched.append(model)
+        return word_level_tokenizer()
+
+
+def test_tokenizer_registry_fetches_tokenizer_once_per_client_and_model() -> None:
+    registry = TokenizerRegistry()
+    client = TokenizerClient()
+    other_client = TokenizerClient()
+
+    tokenizer = registry.get(client, "model")  # type: ignore
+
+    assert registry.get(client, "model") is tokenizer  # type: ignore
+    assert registry.get(other_client, "model") is not tokenizer  # type: ignore
+    assert registry.get(client, "other-model") is not tokenizer  # type: ignore
+    assert client.fetched == ["model", "other-model"]
+    metrics = registry.metrics()
+    assert (metrics.hits, metrics.misses, metrics.size) == (1, 3, 3)
+
+
+def test_tokenizer_registry_derives_variant_without_whitespace_prefix_once() -> None:
+    registry = TokenizerRegistry()
+    client = TokenizerClient()
+
+    tokenizer = registry.get(client, "model")  # type: ignore
+    variant = registry.get(client, "model", whitespace_prefix=False)  # type: ignore
+
+    assert variant is not tokenizer
+    assert registry.get(client, "model", whitespace_prefix=False) is variant  # type: ignore
+    assert client.fetched == ["model"]
+
+
+def test_tokenizer_registry_evicts_least_recently_used_tokenizers() -> None:
+    registry = TokenizerRegistry(max_size=2)
+    client = TokenizerClient()
+
+    registry.get(client, "a")  # type: ignore
+    registry.get(client, "b")  # type: ignore
+    registry.get(client, "a")  # type: ignore
+    registry.get(client, "c")  # type: ignore
+    registry.get(client, "a")  # type: ignore
+    registry.get(client, "b")  # type: ignore
+
+    assert client.fetched == ["a", "b", "c", "b"]
+    assert registry.metrics().size == 2
+
+
+def test_tokenizer_registry_drops_tokenizers_of_collected_clients() -> None:
+    registry = TokenizerRegistry()
+    registry.get(TokenizerClient(), "model")  # type: ignore
+    gc.collect()
+
+    assert registry.metrics().size == 0
+
+
+def test_tokenizer_registry_loads_tokenizers_from_disk(tmp_path: Path) -> None:
+    client = TokenizerClient()
+    TokenizerRegistry(cache_dir=tmp_path).get(client, "org/model")  # type: ignore
+
+    registry = TokenizerRegistry(cache_dir=tmp_path)
+    tokenizer = registry.get(TokenizerClient(), "org/model")  # type: ignore
+
+    assert client.fetched == ["org/model"]
+    assert tokenizer.encode("hello world").ids == [0, 1]
+    assert registry.metrics().disk_hits == 1
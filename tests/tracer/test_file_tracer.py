@@ -1,5 +1,8 @@
+import json
+import time
 from pathlib import Path
 from unittest.mock import Mock
+from uuid import uuid4
 
 import pytest
 from pytest import fixture
@@ -8,6 +11,7 @@ from pharia_inference_sdk.core.task import Task
 from pharia_inference_sdk.core.tracer import (
     FileTracer,
     InMemoryTaskSpan,
+    LogFileRotation,
     TracerLogEntryFailed,
 )
 from tests.tracer.conftest import SpecificTestException
@@ -18,6 +22,12 @@ def file_tracer(tmp_path: Path) -> FileTracer:
     return FileTracer(tmp_path / "log.log")
 
 
+def trace_id_of_entry(file_tracer: FileTracer, index: int) -> str:
+    task_span = file_tracer.traces().entries[index]
+    assert isinstance(task_span, InMemoryTaskSpan)
+    return str(task_span.context.trace_id)
+
+
 def test_file_tracer_retrieves_all_file_traces(
     file_tracer: FileTracer, tracer_test_task: Task[str, str]
 ) -> None:
@@ -68,3 +78,292 @@ def test_file_tracer_is_backwards_compatible() -> None:
     assert task_span.input == "input"
     assert task_span.start_timestamp and task_span.end_timestamp
     assert task_span.start_timestamp < task_span.end_timestamp
+
+
+def test_buffered_file_tracer_writes_entries_on_flush(
+    tmp_path: Path, tracer_test_task: Task[str, str]
+) -> None:
+    log_file_path = tmp_path / "log.log"
+    file_tracer = FileTracer(log_file_path, buffered=True, flush_interval=60)
+
+    tracer_test_task.run("input", file_tracer)
+
+    assert not log_file_path.exists()
+    file_tracer.flush()
+    assert len(file_tracer.traces().entries) == 1
+    file_tracer.close()
+
+
+def test_buffered_file_tracer_traces_include_buffered_entries(
+    tmp_path: Path, tracer_test_task: Task[str, str]
+) -> None:
+    unbuffered_file_path = tmp_path / "unbuffered.log"
+    log_file_path = tmp_path / "log.log"
+    file_tracer = FileTracer(log_file_path, buffered=True, flush_interval=60)
+
+    tracer_test_task.run_concurrently(["input"] * 10, FileTracer(unbuffered_file_path))
+    tracer_test_task.run_concurrently(["input"] * 10, file_tracer)
+
+    assert len(file_tracer.traces().entries) == 1
+    assert len(log_file_path.read_text().splitlines()) == len(
+        unbuffered_file_path.read_text().splitlines()
+    )
+    file_tracer.close()
+
+
+def test_buffered_file_tracer_flushes_when_buffer_is_full(
+    tmp_path: Path, tracer_test_task: Task[str, str]
+) -> None:
+    unbuffered_file_path = tmp_path / "unbuffered.log"
+    log_file_path = tmp_path / "log.log"
+    file_tracer = FileTracer(
+        log_file_path, buffered=True, flush_interval=60, max_buffer_size=1
+    )
+
+    tracer_test_task.run("input", FileTracer(unbuffered_file_path))
+    tracer_test_task.run("input", file_tracer)
+
+    assert len(log_file_path.read_text().splitlines()) == len(
+        unbuffered_file_path.read_text().splitlines()
+    )
+    file_tracer.close()
+
+
+def test_buffered_file_tracer_flushes_periodically(
+    tmp_path: Path, tracer_test_task: Task[str, str]
+) -> None:
+    log_file_path = tmp_path / "log.log"
+    file_tracer = FileTracer(log_file_path, buffered=True, flush_interval=0.01)
+
+    tracer_test_task.run("input", file_tracer)
+
+    for _ in range(100):
+        if log_file_path.exists():
+            break
+        time.sleep(0.01)
+    assert len(FileTracer(log_file_path).traces().entries) == 1
+    file_tracer.close()
+
+
+def test_buffered_file_tracer_flushes_on_close(
+    tmp_path: Path, tracer_test_task: Task[str, str]
+) -> None:
+    log_file_path = tmp_path / "log.log"
+    file_tracer = FileTracer(log_file_path, buffered=True, flush_interval=60)
+
+    tracer_test_task.run("input", file_tracer)
+    file_tracer.close()
+
+    assert len(FileTracer(log_file_path).traces().entries) == 1
+    with pytest.raises(ValueError):
+        tracer_test_task.run("input", file_tracer)
+
+
+def test_file_tracer_rotates_log_file_by_size(
+    tmp_path: Path, tracer_test_task: Task[str, str]
+) -> None:
+    log_file_path = tmp_path / "log.log"
+    file_tracer = FileTracer(log_file_path, rotation=LogFileRotation(max_bytes=1000))
+
+    tracer_test_task.run("input", file_tracer)
+    tracer_test_task.run("input", file_tracer)
+
+    segments = sorted(tmp_path.glob("log.log.*"))
+    assert segments
+    assert all(segment.stat().st_size <= 1000 for segment in segments)
+    traces = file_tracer.traces()
+    assert len(traces.entries) == 2
+    assert all(isinstance(entry, InMemoryTaskSpan) for entry in traces.entries)
+
+
+def test_file_tracer_rotates_log_file_by_time(
+    tmp_path: Path, tracer_test_task: Task[str, str]
+) -> None:
+    log_file_path = tmp_path / "log.log"
+    file_tracer = FileTracer(log_file_path, rotation=LogFileRotation(interval=0))
+
+    tracer_test_task.run("input", file_tracer)
+
+    segments = [*tmp_path.glob("log.log.*"), log_file_path]
+    assert len(segments) > 1
+    assert all(len(segment.read_text().splitlines()) == 1 for segment in segments)
+    assert len(file_tracer.traces().entries) == 1
+
+
+def test_file_tracer_compresses_rotated_segments(
+    tmp_path: Path, tracer_test_task: Task[str, str]
+) -> None:
+    log_file_path = tmp_path / "log.log"
+    file_tracer = FileTracer(
+        log_file_path,
+        buffered=True,
+        max_buffer_size=1,
+        rotation=LogFileRotation(max_bytes=1000, compression="gzip"),
+    )
+
+    tracer_test_task.run("input", file_tracer)
+    tracer_test_task.run("input", file_tracer)
+    file_tracer.close()
+
+    segments = list(tmp_path.glob("log.log.*"))
+    assert segments
+    assert all(segment.suffix == ".gz" for segment in segments)
+    assert len(FileTracer(log_file_path).traces().entries) == 2
+    viewing_file = tmp_path / "viewing.jsonl"
+    FileTracer(log_file_path).convert_file_for_viewing(viewing_file)
+    assert viewing_file.read_text()
+
+
+def test_file_tracer_retrieves_single_trace(
+    file_tracer: FileTracer, tracer_test_task: Task[str, str]
+) -> None:
+    tracer_test_task.run("input", file_tracer)
+    tracer_test_task.run("other input", file_tracer)
+
+    traces = file_tracer.traces(trace_id_of_entry(file_tracer, 1))
+
+    assert len(traces.entries) == 1
+    assert isinstance(traces.entries[0], InMemoryTaskSpan)
+    assert traces.entries[0].input == "other input"
+
+
+def test_indexed_file_tracer_retrieves_single_trace_from_index(
+    tmp_path: Path, tracer_test_task: Task[str, str]
+) -> None:
+    log_file_path = tmp_path / "log.log"
+    file_tracer = FileTracer(log_file_path, indexed=True)
+    tracer_test_task.run("input", file_tracer)
+    first_trace_id = trace_id_of_entry(file_tracer, 0)
+
+    assert len(file_tracer.traces(first_trace_id).entries) == 1
+    assert (tmp_path / "log.log.idx").exists()
+
+    tracer_test_task.run("other input", file_tracer)
+    second_trace_id = trace_id_of_entry(file_tracer, 1)
+    traces = file_tracer.traces(second_trace_id)
+
+    assert len(traces.entries) == 1
+    assert isinstance(traces.entries[0], InMemoryTaskSpan)
+    assert traces.entries[0].input == "other input"
+    assert len((tmp_path / "log.log.idx").read_text().splitlines()) == len(
+        log_file_path.read_text().splitlines()
+    )
+
+
+def test_spans_of_indexed_file_tracer_retrieve_single_trace_from_index(
+    tmp_path: Path,
+) -> None:
+    log_file_path = tmp_path / "log.log"
+    file_tracer = FileTracer(log_file_path, indexed=True)
+    with (
+        file_tracer.task_span("task", "input") as task_span,
+        task_span.span("span") as span,
+    ):
+        span.log("message", "value")
+
+    traces = span.traces(str(task_span.context.trace_id))
+
+    assert span._writer is file_tracer._writer
+    assert (tmp_path / "log.log.idx").exists()
+    assert len(traces.entries) == 1
+    assert isinstance(traces.entries[0], InMemoryTaskSpan)
+    assert traces.entries[0].input == "input"
+
+
+def test_indexed_file_tracer_retrieves_single_trace_from_compressed_segments(
+    tmp_path: Path, tracer_test_task: Task[str, str]
+) -> None:
+    log_file_path = tmp_path / "log.log"
+    file_tracer = FileTracer(
+        log_file_path,
+        indexed=True,
+        rotation=LogFileRotation(max_bytes=1000, compression="gzip"),
+    )
+    tracer_test_task.run("input", file_tracer)
+    trace_id = trace_id_of_entry(file_tracer, 0)
+    file_tracer.traces(trace_id)
+    tracer_test_task.run("other input", file_tracer)
+
+    traces = file_tracer.traces(trace_id)
+
+    assert list(tmp_path.glob("log.log.*.gz.idx"))
+    assert len(traces.entries) == 1
+    assert isinstance(traces.entries[0], InMemoryTaskSpan)
+    assert traces.entries[0].input == "input"
+
+
+def test_file_tracer_rebuilds_index(
+    tmp_path: Path, tracer_test_task: Task[str, str]
+) -> None:
+    log_file_path = tmp_path / "log.log"
+    tracer_test_task.run("input", FileTracer(log_file_path))
+    tracer_test_task.run("other input", FileTracer(log_file_path))
+    (tmp_path / "log.log.idx").write_text("stale 0 1\n")
+    file_tracer = FileTracer(log_file_path, indexed=True)
+    trace_id = trace_id_of_entry(file_tracer, 1)
+
+    file_tracer.rebuild_index()
+    traces = file_tracer.traces(trace_id)
+
+    assert "stale" not in (tmp_path / "log.log.idx").read_text()
+    assert len(traces.entries) == 1
+    assert isinstance(traces.entries[0], InMemoryTaskSpan)
+    assert traces.entries[0].input == "other input"
+
+
+def test_file_tracer_does_not_validate_lines_of_other_traces(
+    file_tracer: FileTracer, tracer_test_task: Task[str, str]
+) -> None:
+    tracer_test_task.run("input", file_tracer)
+    trace_id = trace_id_of_entry(file_tracer, 0)
+    with file_tracer._log_file_path.open("a") as file:
+        file.write(
+            json.dumps(
+                {"trace_id": str(uuid4()), "entry_type": "StartTask", "entry": {}}
+            )
+            + "\n"
+        )
+
+    assert len(file_tracer.traces(trace_id).entries) == 1
+
+
+def test_file_tracer_retrieves_single_trace_with_reordered_fields(
+    file_tracer: FileTracer, tracer_test_task: Task[str, str]
+) -> None:
+    tracer_test_task.run("input", file_tracer)
+    tracer_test_task.run("other input", file_tracer)
+    trace_id = trace_id_of_entry(file_tracer, 1)
+    lines = file_tracer._log_file_path.read_text().splitlines()
+    file_tracer._log_file_path.write_text(
+        "".join(
+            json.dumps(dict(reversed(json.loads(line).items()))) + "\n"
+            for line in lines
+        )
+    )
+
+    traces = file_tracer.traces(trace_id)
+
+    assert len(traces.entries) == 1
+    assert isinstance(traces.entries[0], InMemoryTaskSpan)
+    assert traces.entries[0].input == "other input"
+
+
+def test_buffered_file_tracer_rotates_within_flushed_buffer(
+    tmp_path: Path, tracer_test_task: Task[str, str]
+) -> None:
+    log_file_path = tmp_path / "log.log"
+    file_tracer = FileTracer(
+        log_file_path,
+        buffered=True,
+        flush_interval=60,
+        rotation=LogFileRotation(max_bytes=1000),
+    )
+
+    for _ in range(20):
+        tracer_test_task.run("input", file_tracer)
+    file_tracer.close()
+
+    segments = [*tmp_path.glob("log.log.*"), log_file_path]
+    assert len(segments) > 1
+    assert all(segment.stat().st_size <= 1000 for segment in segments)
+    assert len(FileTracer(log_file_path).traces().entries) == 20
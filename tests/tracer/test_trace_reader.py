@@ -0,0 +1,133 @@
+import mmap
+from pathlib import Path
+
+from pytest import MonkeyPatch
+
+from pharia_inference_sdk.core import (
+    FileTracer,
+    LogFileRotation,
+    PlainEntry,
+    SpanRecord,
+    Task,
+    TaskSpanRecord,
+    TraceFileReader,
+)
+from pharia_inference_sdk.core.tracer import trace_reader
+
+
+def test_trace_file_reader_yields_records_with_parents(
+    tmp_path: Path, tracer_test_task: Task[str, str]
+) -> None:
+    log_file_path = tmp_path / "log.log"
+    tracer_test_task.run("input", FileTracer(log_file_path))
+
+    records = list(TraceFileReader(log_file_path).records())
+
+    task_spans = [record for record in records if isinstance(record, TaskSpanRecord)]
+    spans = [
+        record
+        for record in records
+        if isinstance(record, SpanRecord) and not isinstance(record, TaskSpanRecord)
+    ]
+    plain_entries = [record for record in records if isinstance(record, PlainEntry)]
+    assert len(task_spans) == 3
+    assert len(spans) == 1
+    assert len(plain_entries) == 3
+    root = records[-1]
+    assert isinstance(root, TaskSpanRecord)
+    assert root.input == "input"
+    assert root.output == "output"
+    assert root.parent == root.trace_id
+    (span,) = spans
+    assert span.parent == root.uuid
+    assert span.end
+    assert {entry.parent for entry in plain_entries} == {
+        span.uuid,
+        *(task_span.uuid for task_span in task_spans if task_span is not root),
+    }
+
+
+def test_trace_file_reader_filters_by_trace_id(
+    tmp_path: Path, tracer_test_task: Task[str, str]
+) -> None:
+    log_file_path = tmp_path / "log.log"
+    file_tracer = FileTracer(log_file_path)
+    tracer_test_task.run("input", file_tracer)
+    tracer_test_task.run("other input", file_tracer)
+    reader = TraceFileReader(log_file_path)
+    root = list(reader.records())[-1]
+
+    records = list(reader.records(str(root.trace_id)))
+
+    assert len(records) == 7
+    assert all(record.trace_id == root.trace_id for record in records)
+    assert records[-1] == root
+
+
+def test_trace_file_reader_yields_unfinished_spans_last(tmp_path: Path) -> None:
+    log_file_path = tmp_path / "log.log"
+    task_span = FileTracer(log_file_path).task_span("task", "input")
+    with task_span.span("span") as span:
+        span.log("message", "value")
+
+    records = list(TraceFileReader(log_file_path).records())
+
+    assert [type(record) for record in records] == [
+        PlainEntry,
+        SpanRecord,
+        TaskSpanRecord,
+    ]
+    assert isinstance(records[-1], TaskSpanRecord)
+    assert records[-1].end is None
+    assert records[-1].output is None
+
+
+def test_trace_file_reader_reads_compressed_segments(
+    tmp_path: Path, tracer_test_task: Task[str, str]
+) -> None:
+    log_file_path = tmp_path / "log.log"
+    file_tracer = FileTracer(
+        log_file_path, rotation=LogFileRotation(max_bytes=1000, compression="gzip")
+    )
+    tracer_test_task.run("input", file_tracer)
+    tracer_test_task.run("other input", file_tracer)
+
+    records = list(TraceFileReader(log_file_path).records())
+
+    assert list(tmp_path.glob("log.log.*.gz"))
+    assert [
+        record.input for record in records if isinstance(record, TaskSpanRecord)
+    ] == [None, None, "input", None, None, "other input"]
+
+
+def test_trace_file_reader_skips_ends_of_spans_without_start(
+    tmp_path: Path, tracer_test_task: Task[str, str]
+) -> None:
+    log_file_path = tmp_path / "log.log"
+    file_tracer = FileTracer(log_file_path, rotation=LogFileRotation(max_bytes=1000))
+    tracer_test_task.run("input", file_tracer)
+    tracer_test_task.run("other input", file_tracer)
+    (tmp_path / "log.log.1").unlink()
+
+    records = list(TraceFileReader(log_file_path).records())
+
+    task_spans = [record for record in records if isinstance(record, TaskSpanRecord)]
+    # the task spans of the first run that started in the deleted segment are skipped
+    assert 3 <= len(task_spans) < 6
+    assert all(task_span.end for task_span in task_spans)
+    assert task_spans[-1].input == "other input"
+
+
+def test_trace_file_reader_reads_lines_across_mapped_windows(
+    tmp_path: Path, tracer_test_task: Task[str, str], monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setattr(trace_reader, "_MAPPED_WINDOW_SIZE", mmap.ALLOCATIONGRANULARITY)
+    log_file_path = tmp_path / "log.log"
+    file_tracer = FileTracer(log_file_path)
+    for _ in range(10):
+        tracer_test_task.run("input", file_tracer)
+
+    records = list(TraceFileReader(log_file_path).records())
+
+    assert log_file_path.stat().st_size > 2 * mmap.ALLOCATIONGRANULARITY
+    assert len(records) == 10 * 7